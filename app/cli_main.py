@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
 import time
 from dataclasses import dataclass
@@ -13,20 +14,27 @@ from app.core.update_manager import UpdateManager
 from app.update.models import FileChange, UpdateProposal
 
 from app.memory.manager import MemoryManager
+from app.memory.field_index import RecordFilter
 from app.memory.models import MemoryCategory
+from app.memory.order_index import make_cursor
+from app.memory.reshard import reshard_memory
+from app.memory.sqlite_store import SqliteMemoryStore
+from app.memory.proposals import BulkResult, MemoryProposalStatus, ProposalSelector
+from app.storage.ids import new_id
 
 from app.core.runtime_status import get_runtime_status, to_human_readable as runtime_hr
 from app.core.memory_status import get_memory_status, to_human_readable as memory_hr
 from app.core.governance_status import get_governance_status, to_human_readable as governance_hr
 from app.core.capabilities_status import get_capabilities_status, to_human_readable as capabilities_hr
-from app.core.system_snapshot import (
-    get_system_snapshot,
-    to_human_readable as snapshot_hr,
-    to_json as snapshot_json,
+from app.core.system_snapshot import SnapshotEngine, to_human_readable as snapshot_hr
+from app.core.snapshot_history import (
+    SnapshotHistory,
+    history_to_human_readable,
+    history_to_json,
+    register_trend_check,
 )
-from app.core.diagnostics import run_diagnostics, diagnostics_to_json
-from app.core.readiness import evaluate_readiness
-from app.core.proposal_permissions import evaluate_proposal_permission
+from app.core.evaluation import EvaluationContext, track_file_touches
+from app.core.state_transfer import export_state, import_state
 from app.core.proposal_drafting import (
     generate_proposal_draft,
     proposal_draft_to_json,
@@ -41,12 +49,74 @@ class RuntimeState:
     repo_root: Path
     update_manager: UpdateManager
     memory_manager: MemoryManager
+    snapshots: Optional[SnapshotEngine] = None
+    history: Optional[SnapshotHistory] = None
 
 
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
+def _pop_option(args: list[str], flag: str) -> Optional[str]:
+    """
+    Remove `flag <value>` from args and return the value (None if absent).
+    """
+    if flag not in args:
+        return None
+    i = args.index(flag)
+    if i + 1 >= len(args):
+        raise ValueError(f"{flag} requires a value")
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n <= 0:
+        raise ValueError(f"Not a positive number: {value}")
+    return n
+
+
+def _pop_filters(args: list[str]) -> list[RecordFilter]:
+    """
+    Remove memory list filter flags from args and return them as
+    RecordFilters (ANDed together).
+    """
+    filters = []
+    for flag, field in (("--source", "source"), ("--approved-by", "approved_by")):
+        value = _pop_option(args, flag)
+        if value is not None:
+            filters.append(RecordFilter(field, equals=value))
+    for prefix, field in (
+        ("--approved", "approved_at"),
+        ("--created", "created_at"),
+        ("--updated", "updated_at"),
+    ):
+        since = _pop_option(args, f"{prefix}-since")
+        until = _pop_option(args, f"{prefix}-until")
+        if since is not None or until is not None:
+            filters.append(RecordFilter(field, since=since, until=until))
+    return filters
+
+
+def _pop_selector(args: list[str]) -> ProposalSelector:
+    """--all-matching [--category <c>] [--source <s>] [--reason <regex>]"""
+    args.remove("--all-matching")
+    category = _pop_option(args, "--category")
+    return ProposalSelector(
+        category=MemoryCategory(category) if category else None,
+        source=_pop_option(args, "--source"),
+        reason=_pop_option(args, "--reason"),
+    )
+
+
+def _print_bulk(verb: str, result: BulkResult) -> None:
+    print(f"{verb} {len(result.done)} proposal(s).")
+    for pid, reason in result.failed:
+        print(f"- FAILED {pid}: {reason}")
+
+
 def _print_help() -> None:
     print(
         "Kimiko CLI (approval-based learning ENABLED)\n"
@@ -54,6 +124,7 @@ def _print_help() -> None:
         "  help\n"
         "  version\n"
         "  snapshot [--json]\n"
+        "  snapshot --history [<n>] [--json]\n"
         "  diagnostics [--json]\n"
         "  readiness\n"
         "  propose-check\n"
@@ -61,20 +132,42 @@ def _print_help() -> None:
         "  status [runtime|memory|governance|capabilities]\n"
         "  quit | exit\n"
         "\n"
+        "Set KIMIKO_TRACE_FILES=1 to print the files each command touched.\n"
+        "\n"
+        "Non-interactive modes:\n"
+        "  kimiko export <file.jsonl.gz>\n"
+        "  kimiko import <file.jsonl.gz> [--restart]\n"
+        "\n"
         "Update system:\n"
         "  update propose-demo\n"
-        "  update list\n"
+        "  update list [--after <id>] [--limit <n>]\n"
         "  update show <id>\n"
         "  update approve <id>\n"
         "  update reject <id> [note]\n"
         "  update apply <id>\n"
+        "  update archive [<before-iso>]\n"
         "\n"
         "Memory system:\n"
         "  memory propose <facts|preferences> <reason> <json>\n"
-        "  memory proposals\n"
+        "  memory proposals [--status <status>] [--after <id>] [--limit <n>]\n"
         "  memory approve <id>\n"
+        "  memory approve --all-matching [--category <c>] [--source <s>] [--reason <regex>]\n"
         "  memory reject <id> [note]\n"
+        "  memory reject --all-matching [--category <c>] [--source <s>] [--reason <regex>]\n"
+        "                [--note <note>]\n"
         "  memory list <identity|facts|preferences|projects|history>\n"
+        "              [--limit <n>] [--after <cursor>] [--json-lines]\n"
+        "              [--source <s>] [--approved-by <name>]\n"
+        "              [--approved|--created|--updated-since <iso>]\n"
+        "              [--approved|--created|--updated-until <iso>]\n"
+        "  memory search <query> [--category <category>]\n"
+        "  memory recall <text> [--k <n>] [--category <category>]\n"
+        "  memory history [--since <iso>] [--until <iso>] [--limit <n>] [--json-lines]\n"
+        "  memory seal-history <before-iso>\n"
+        "  memory archive-proposals [<before-iso>]\n"
+        "  memory reindex-proposals\n"
+        "  memory reshard\n"
+        "  memory import-sqlite\n"
     )
 
 
@@ -82,34 +175,51 @@ def _cmd_version() -> None:
     print(f"Kimiko v{__version__}")
 
 
-def _cmd_snapshot(state: RuntimeState, parts: list[str]) -> None:
-    as_json = "--json" in parts
-
-    snapshot = get_system_snapshot(
+def _evaluation(state: RuntimeState) -> EvaluationContext:
+    return EvaluationContext(
         start_time=START_TIME,
         update_manager=state.update_manager,
         memory_manager=state.memory_manager,
+        snapshots=state.snapshots,
+        history=state.history,
     )
 
+
+def _cmd_snapshot(state: RuntimeState, parts: list[str]) -> None:
+    as_json = "--json" in parts
+    if "--history" in parts:
+        _cmd_snapshot_history(state, parts, as_json)
+        return
+    ctx = _evaluation(state)
+
     if as_json:
-        print(json.dumps(snapshot_json(snapshot), indent=2))
+        print(json.dumps(ctx.snapshot_json, indent=2))
     else:
-        print(snapshot_hr(snapshot))
+        print(snapshot_hr(ctx.snapshot))
 
 
-def _cmd_diagnostics(state: RuntimeState, parts: list[str]) -> None:
-    as_json = "--json" in parts
+def _cmd_snapshot_history(state: RuntimeState, parts: list[str], as_json: bool) -> None:
+    # Reads the recorded series only; takes no new snapshot.
+    args = [p for p in parts[1:] if p not in ("--history", "--json")]
+    if len(args) > 1 or (args and not (args[0].isdigit() and int(args[0]) > 0)):
+        print("Usage: snapshot --history [<n>] [--json]")
+        return
+    last = int(args[0]) if args else 20
+    points = state.history.points(last=last) if state.history is not None else []
+
+    if as_json:
+        print(json.dumps(history_to_json(points), indent=2))
+    else:
+        print(history_to_human_readable(points))
 
-    snapshot = get_system_snapshot(
-        start_time=START_TIME,
-        update_manager=state.update_manager,
-        memory_manager=state.memory_manager,
-    )
 
-    report = run_diagnostics(snapshot)
+def _cmd_diagnostics(state: RuntimeState, parts: list[str]) -> None:
+    as_json = "--json" in parts
+    ctx = _evaluation(state)
+    report = ctx.diagnostics
 
     if as_json:
-        print(json.dumps(diagnostics_to_json(report), indent=2))
+        print(json.dumps(ctx.diagnostics_json, indent=2))
         return
 
     print("System Diagnostics")
@@ -119,25 +229,20 @@ def _cmd_diagnostics(state: RuntimeState, parts: list[str]) -> None:
     print("Subsystems:")
 
     for result in report.results:
-        print(f"- {result.name}: {result.status}")
+        line = f"- {result.name}: {result.status}"
+        if result.over_budget:
+            line += f" (slow: {result.duration_ms:.1f} ms, budget {result.budget_ms:g} ms)"
+        print(line)
+    why = "a cheaper check failed" if report.skip_reason == "fail" else "run budget spent"
+    for name in report.skipped:
+        print(f"- {name}: skipped ({why})")
 
     print("")
     print(report.recommendation)
 
 
 def _cmd_readiness(state: RuntimeState) -> None:
-    snapshot = get_system_snapshot(
-        start_time=START_TIME,
-        update_manager=state.update_manager,
-        memory_manager=state.memory_manager,
-    )
-
-    diagnostics = diagnostics_to_json(run_diagnostics(snapshot))
-
-    report = evaluate_readiness(
-        snapshot=snapshot_json(snapshot),
-        diagnostics=diagnostics,
-    )
+    report = _evaluation(state).readiness
 
     print("System Readiness")
     print("================")
@@ -160,25 +265,7 @@ def _cmd_readiness(state: RuntimeState) -> None:
 
 
 def _cmd_propose_check(state: RuntimeState) -> None:
-    snapshot = get_system_snapshot(
-        start_time=START_TIME,
-        update_manager=state.update_manager,
-        memory_manager=state.memory_manager,
-    )
-
-    diagnostics = diagnostics_to_json(run_diagnostics(snapshot))
-    readiness = {
-        "status": evaluate_readiness(
-            snapshot=snapshot_json(snapshot),
-            diagnostics=diagnostics,
-        ).status
-    }
-
-    report = evaluate_proposal_permission(
-        readiness=readiness,
-        diagnostics=diagnostics,
-        snapshot=snapshot_json(snapshot),
-    )
+    report = _evaluation(state).permission
 
     print("Proposal Permission Check")
     print("=========================")
@@ -197,26 +284,8 @@ def _cmd_propose_check(state: RuntimeState) -> None:
 
 def _cmd_propose_draft(state: RuntimeState, parts: list[str]) -> None:
     as_json = "--json" in parts
-
-    snapshot_obj = get_system_snapshot(
-        start_time=START_TIME,
-        update_manager=state.update_manager,
-        memory_manager=state.memory_manager,
-    )
-    snapshot = snapshot_json(snapshot_obj)
-
-    diagnostics = diagnostics_to_json(run_diagnostics(snapshot_obj))
-
-    readiness_report = evaluate_readiness(
-        snapshot=snapshot,
-        diagnostics=diagnostics,
-    )
-
-    permission = evaluate_proposal_permission(
-        readiness={"status": readiness_report.status},
-        diagnostics=diagnostics,
-        snapshot=snapshot,
-    )
+    ctx = _evaluation(state)
+    permission = ctx.permission
 
     if not permission.allowed:
         print("Proposal Draft")
@@ -230,9 +299,9 @@ def _cmd_propose_draft(state: RuntimeState, parts: list[str]) -> None:
         return
 
     draft = generate_proposal_draft(
-        snapshot=snapshot,
-        diagnostics=diagnostics,
-        readiness={"status": readiness_report.status},
+        snapshot=ctx.snapshot_json,
+        diagnostics=ctx.diagnostics_json,
+        readiness={"status": ctx.readiness.status},
         permission={
             "status": permission.status,
             "allowed": permission.allowed,
@@ -321,67 +390,89 @@ def _handle_update(state: RuntimeState, parts: list[str]) -> None:
 
     sub = parts[1].lower()
 
-    if sub == "list":
-        items = um.list()
-        if not items:
-            print("(no proposals)")
+    try:
+        if sub == "list":
+            args = parts[2:]
+            try:
+                after = _pop_option(args, "--after")
+                limit = _pop_option(args, "--limit")
+                limit_n = _positive_int(limit) if limit is not None else None
+            except ValueError:
+                print("Usage: update list [--after <id>] [--limit <n>]")
+                return
+            items = um.list_headers(after=after, limit=limit_n)
+            if not items:
+                print("(no proposals)")
+                return
+            for p in items:
+                print(f"- {p.id} [{p.status.value}] {p.summary}")
             return
-        for p in items:
-            print(f"- {p.id} [{p.status.value}] {p.summary}")
-        return
 
-    if sub == "show":
-        if len(parts) < 3:
-            print("Usage: update show <id>")
+        if sub == "show":
+            if len(parts) < 3:
+                print("Usage: update show <id>")
+                return
+            print(um.load(parts[2]))
             return
-        print(um.load(parts[2]))
-        return
 
-    if sub == "approve":
-        if len(parts) < 3:
-            print("Usage: update approve <id>")
+        if sub == "approve":
+            if len(parts) < 3:
+                print("Usage: update approve <id>")
+                return
+            um.approve(parts[2])
+            print("Approved.")
             return
-        um.approve(parts[2])
-        print("Approved.")
-        return
 
-    if sub == "reject":
-        if len(parts) < 3:
-            print("Usage: update reject <id> [note]")
+        if sub == "reject":
+            if len(parts) < 3:
+                print("Usage: update reject <id> [note]")
+                return
+            note = " ".join(parts[3:]) if len(parts) > 3 else ""
+            um.reject(parts[2], note)
+            print("Rejected.")
             return
-        note = " ".join(parts[3:]) if len(parts) > 3 else ""
-        um.reject(parts[2], note)
-        print("Rejected.")
-        return
 
-    if sub == "apply":
-        if len(parts) < 3:
-            print("Usage: update apply <id>")
+        if sub == "apply":
+            if len(parts) < 3:
+                print("Usage: update apply <id>")
+                return
+            print(um.apply(parts[2]))
             return
-        print(um.apply(parts[2]))
-        return
 
-    if sub == "propose-demo":
-        p = UpdateProposal(
-            id=f"update-{int(time.time())}",
-            type="self-update",
-            scope=["app/version.py"],
-            summary="Demo patch bump",
-            reason="Verify update system",
-            changes=[
-                FileChange(
-                    file="app/version.py",
-                    action="modify",
-                    description="Patch bump",
-                    new_content='__version__ = "1.5.2"\n',
-                )
-            ],
-        )
-        um.propose(p)
-        print(f"Proposed {p.id}")
-        return
+        if sub == "archive":
+            archived = um.archive(parts[2] if len(parts) > 2 else None)
+            if not archived:
+                print("(nothing to archive)")
+                return
+            print(f"Archived {len(archived)} proposal(s).")
+            return
+
+        if sub == "propose-demo":
+            p = UpdateProposal(
+                id=new_id("update"),
+                type="self-update",
+                scope=["app/version.py"],
+                summary="Demo patch bump",
+                reason="Verify update system",
+                changes=[
+                    FileChange(
+                        file="app/version.py",
+                        action="modify",
+                        description="Patch bump",
+                        new_content='__version__ = "1.5.2"\n',
+                    )
+                ],
+            )
+            um.propose(p)
+            print(f"Proposed {p.id}")
+            return
 
-    print("Unknown update command")
+        print("Unknown update command")
+
+    except FileNotFoundError as e:
+        print(str(e))
+    except Exception as e:
+        print(f"Update error: {e}")
 
 
 # ---------------- Memory Commands ----------------
@@ -397,7 +488,17 @@ def _handle_memory(state: RuntimeState, parts: list[str]) -> None:
 
     try:
         if sub == "proposals":
-            items = mm.list_proposals()
+            args = parts[2:]
+            try:
+                status = _pop_option(args, "--status")
+                after = _pop_option(args, "--after")
+                limit = _pop_option(args, "--limit")
+                status = MemoryProposalStatus(status.upper()) if status else None
+                limit = _positive_int(limit) if limit is not None else None
+            except ValueError:
+                print("Usage: memory proposals [--status <status>] [--after <id>] [--limit <n>]")
+                return
+            items = mm.list_proposals(status, after=after, limit=limit)
             if not items:
                 print("(no memory proposals)")
                 return
@@ -417,6 +518,11 @@ def _handle_memory(state: RuntimeState, parts: list[str]) -> None:
             return
 
         if sub == "approve":
+            if "--all-matching" in parts:
+                args = parts[2:]
+                selector = _pop_selector(args)
+                _print_bulk("Approved", mm.approve_many(selector, approved_by="Brandon"))
+                return
             if len(parts) < 3:
                 print("Usage: memory approve <id>")
                 return
@@ -425,6 +531,12 @@ def _handle_memory(state: RuntimeState, parts: list[str]) -> None:
             return
 
         if sub == "reject":
+            if "--all-matching" in parts:
+                args = parts[2:]
+                selector = _pop_selector(args)
+                note = _pop_option(args, "--note") or ""
+                _print_bulk("Rejected", mm.reject_many(selector, note))
+                return
             if len(parts) < 3:
                 print("Usage: memory reject <id> [note]")
                 return
@@ -435,15 +547,149 @@ def _handle_memory(state: RuntimeState, parts: list[str]) -> None:
 
         if sub == "list":
             if len(parts) < 3:
-                print("Usage: memory list <category>")
+                print("Usage: memory list <category> [--limit <n>] [--after <cursor>] [--json-lines]")
                 return
+            args = parts[3:]
+            json_lines = "--json-lines" in args
+            if json_lines:
+                args.remove("--json-lines")
+            limit = _pop_option(args, "--limit")
+            after = _pop_option(args, "--after")
+            filters = _pop_filters(args)
             category = MemoryCategory(parts[2])
-            items = mm.list_memory(category)
-            if not items:
+
+            if filters:
+                records = mm.query_memory(
+                    category,
+                    filters,
+                    after=after,
+                    limit=int(limit) if limit is not None else None,
+                )
+            else:
+                records = mm.iter_memory(
+                    category,
+                    after=after,
+                    limit=int(limit) if limit is not None else None,
+                )
+
+            last = None
+            shown = 0
+            for r in records:
+                if json_lines:
+                    print(json.dumps(r.to_dict()))
+                else:
+                    print(f"- {r.id} {r.content}")
+                last = r
+                shown += 1
+
+            if json_lines:
+                return
+            if last is None:
+                print("(empty)")
+            elif limit is not None and shown == int(limit):
+                print(f"(more: --after {make_cursor(last.created_at, last.id)})")
+            return
+
+        if sub == "history":
+            args = parts[2:]
+            json_lines = "--json-lines" in args
+            if json_lines:
+                args.remove("--json-lines")
+            since = _pop_option(args, "--since")
+            until = _pop_option(args, "--until")
+            limit = _pop_option(args, "--limit")
+
+            empty = True
+            for r in mm.history_range(
+                since=since,
+                until=until,
+                limit=int(limit) if limit is not None else None,
+            ):
+                empty = False
+                if json_lines:
+                    print(json.dumps(r.to_dict()))
+                else:
+                    print(f"- {r.created_at} {r.id} {r.content}")
+            if empty and not json_lines:
                 print("(empty)")
+            return
+
+        if sub == "seal-history":
+            if len(parts) < 3:
+                print("Usage: memory seal-history <before-iso>")
+                return
+            sealed = mm.seal_history(parts[2])
+            if not sealed:
+                print("(nothing to seal)")
+                return
+            for partition in sealed:
+                print(f"- sealed history/{partition}")
+            return
+
+        if sub == "archive-proposals":
+            archived = mm.archive_proposals(parts[2] if len(parts) > 2 else None)
+            if not archived:
+                print("(nothing to archive)")
+                return
+            print(f"Archived {len(archived)} memory proposal(s).")
+            return
+
+        if sub == "reindex-proposals":
+            print(f"Indexed {mm.rebuild_proposal_index()} open memory proposal(s).")
+            return
+
+        if sub == "reshard":
+            for name, count in reshard_memory(state.repo_root).items():
+                print(f"- {name}: moved {count}")
+            return
+
+        if sub == "import-sqlite":
+            # Copies the file layout into memory.sqlite3; the session's own
+            # store when it already is the sqlite backend.
+            db = mm.store if isinstance(mm.store, SqliteMemoryStore) else None
+            if db is None:
+                db = SqliteMemoryStore(state.repo_root)
+            try:
+                inserted = db.import_json_tree()
+            finally:
+                if db is not mm.store:
+                    db.close()
+            print(f"Imported {inserted} record(s) into {db.db_path}")
+            if db is not mm.store:
+                print("Set KIMIKO_MEMORY_BACKEND=sqlite to use it.")
+            return
+
+        if sub == "search":
+            args = parts[2:]
+            category = _pop_option(args, "--category")
+            if category is not None:
+                category = MemoryCategory(category)
+            if not args:
+                print("Usage: memory search <query> [--category <category>]")
+                return
+            hits = mm.search(" ".join(args), category=category)
+            if not hits:
+                print("(no matches)")
+                return
+            for score, r in hits:
+                print(f"- {r.id} [{r.category.value}] ({score:.2f}) {r.content}")
+            return
+
+        if sub == "recall":
+            args = parts[2:]
+            k = _pop_option(args, "--k")
+            category = _pop_option(args, "--category")
+            if category is not None:
+                category = MemoryCategory(category)
+            if not args:
+                print("Usage: memory recall <text> [--k <n>] [--category <category>]")
+                return
+            hits = mm.recall(" ".join(args), k=int(k) if k else 5, category=category)
+            if not hits:
+                print("(nothing similar)")
                 return
-            for r in items:
-                print(f"- {r.id} {r.content}")
+            for score, r in hits:
+                print(f"- {r.id} [{r.category.value}] ({score:.2f}) {r.content}")
             return
 
         print("Unknown memory command")
@@ -463,6 +709,13 @@ def repl() -> None:
         update_manager=UpdateManager(repo),
         memory_manager=MemoryManager(repo),
     )
+    state.snapshots = SnapshotEngine(
+        start_time=START_TIME,
+        update_manager=state.update_manager,
+        memory_manager=state.memory_manager,
+    )
+    state.history = SnapshotHistory(repo / ".kimiko")
+    register_trend_check(state.history)
 
     print("\nKimiko CLI (approval-based learning ENABLED)")
     print("Type 'help' for commands. Ctrl+C or 'quit' to exit.\n")
@@ -483,38 +736,46 @@ def repl() -> None:
         if cmd in ("quit", "exit"):
             print("Goodbye.")
             return
-        if cmd == "help":
-            _print_help()
-            continue
-        if cmd == "version":
-            _cmd_version()
-            continue
-        if cmd == "snapshot":
-            _cmd_snapshot(state, parts)
-            continue
-        if cmd == "diagnostics":
-            _cmd_diagnostics(state, parts)
-            continue
-        if cmd == "readiness":
-            _cmd_readiness(state)
-            continue
-        if cmd == "propose-check":
-            _cmd_propose_check(state)
-            continue
-        if cmd == "propose-draft":
-            _cmd_propose_draft(state, parts)
-            continue
-        if cmd == "status":
-            _cmd_status(state, parts)
-            continue
-        if cmd == "update":
-            _handle_update(state, parts)
-            continue
-        if cmd == "memory":
-            _handle_memory(state, parts)
-            continue
 
-        print("Unknown command. Type 'help'.")
+        with track_file_touches() as touches:
+            _run_command(state, cmd, parts)
+        if os.environ.get("KIMIKO_TRACE_FILES"):
+            print(f"[{cmd}: {touches.summary()}]")
+
+
+def _run_command(state: RuntimeState, cmd: str, parts: list[str]) -> None:
+    if cmd == "help":
+        _print_help()
+        return
+    if cmd == "version":
+        _cmd_version()
+        return
+    if cmd == "snapshot":
+        _cmd_snapshot(state, parts)
+        return
+    if cmd == "diagnostics":
+        _cmd_diagnostics(state, parts)
+        return
+    if cmd == "readiness":
+        _cmd_readiness(state)
+        return
+    if cmd == "propose-check":
+        _cmd_propose_check(state)
+        return
+    if cmd == "propose-draft":
+        _cmd_propose_draft(state, parts)
+        return
+    if cmd == "status":
+        _cmd_status(state, parts)
+        return
+    if cmd == "update":
+        _handle_update(state, parts)
+        return
+    if cmd == "memory":
+        _handle_memory(state, parts)
+        return
+
+    print("Unknown command. Type 'help'.")
 
 
 def healthcheck() -> int:
@@ -524,13 +785,49 @@ def healthcheck() -> int:
     return 0
 
 
+def _run_export(rest: list[str]) -> int:
+    if len(rest) != 1:
+        print("Usage: kimiko export <file.jsonl.gz>")
+        return 2
+    repo = _repo_root()
+    counts = export_state(MemoryManager(repo), UpdateManager(repo), Path(rest[0]))
+    for kind, n in sorted(counts.items()):
+        print(f"{kind}: {n}")
+    print(f"Exported {sum(counts.values())} items to {rest[0]}")
+    return 0
+
+
+def _run_import(rest: list[str]) -> int:
+    restart = "--restart" in rest
+    rest = [a for a in rest if a != "--restart"]
+    if len(rest) != 1:
+        print("Usage: kimiko import <file.jsonl.gz> [--restart]")
+        return 2
+    repo = _repo_root()
+    result = import_state(
+        MemoryManager(repo), UpdateManager(repo), Path(rest[0]), restart=restart
+    )
+    if result.resumed_from:
+        print(f"Resumed after line {result.resumed_from}")
+    for kind, n in sorted(result.imported.items()):
+        print(f"{kind}: {n}")
+    print(f"Imported {sum(result.imported.values())}, skipped {result.skipped} already present")
+    for reason, n in sorted(result.rejected.items()):
+        print(f"Rejected {n}: {reason}")
+    return 0
+
+
 def main(argv: Optional[list[str]] = None) -> int:
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument("--health", action="store_true")
-    args, _ = parser.parse_known_args(argv)
+    args, rest = parser.parse_known_args(argv)
 
     if args.health:
         return healthcheck()
+    if rest and rest[0] == "export":
+        return _run_export(rest[1:])
+    if rest and rest[0] == "import":
+        return _run_import(rest[1:])
 
     repl()
     return 0
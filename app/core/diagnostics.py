@@ -1,17 +1,42 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Literal
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Literal, Optional
 
 
 Severity = Literal["OK", "WARN", "FAIL"]
 
+# Checks run cheapest class first; a FAIL in one class skips the rest,
+# and so does running out of the run budget.
+CostClass = Literal["cheap", "moderate", "expensive"]
+COST_ORDER = ("cheap", "moderate", "expensive")
+DEFAULT_BUDGETS_MS = {"cheap": 5.0, "moderate": 50.0, "expensive": 500.0}
+RUN_BUDGET_MS = 1000.0
+
+SkipReason = Literal["fail", "budget"]
+
 
 @dataclass(frozen=True)
 class DiagnosticResult:
     name: str
     status: Severity
     message: str
+    # Filled in by run_diagnostics
+    cost: Optional[CostClass] = None
+    duration_ms: Optional[float] = None
+    budget_ms: Optional[float] = None
+
+    @property
+    def over_budget(self) -> bool:
+        return (
+            self.duration_ms is not None
+            and self.budget_ms is not None
+            and self.duration_ms > self.budget_ms
+        )
 
 
 @dataclass(frozen=True)
@@ -19,12 +44,75 @@ class DiagnosticsReport:
     overall: Severity
     results: List[DiagnosticResult]
     recommendation: str
+    # Checks not run, because a cheaper one failed ("fail") or the run
+    # budget could not cover them ("budget")
+    skipped: List[str] = field(default_factory=list)
+    skip_reason: Optional[SkipReason] = None
+    duration_ms: Optional[float] = None
+
+
+# -----------------------------
+# Check Registry
+# -----------------------------
+
+CheckFunc = Callable[[Any], DiagnosticResult]
+
+
+@dataclass(frozen=True)
+class RegisteredCheck:
+    name: str
+    func: CheckFunc
+    cost: CostClass
+    budget_ms: float
+
+
+_checks: Dict[str, RegisteredCheck] = {}
+
+
+def register_check(
+    name: str,
+    *,
+    cost: CostClass = "cheap",
+    budget_ms: Optional[float] = None,
+) -> Callable[[CheckFunc], CheckFunc]:
+    """
+    Decorator adding a check (snapshot -> DiagnosticResult) to the ones
+    run_diagnostics() runs. Checks read the snapshot only, so any two may
+    run at once. `cost` orders them; `budget_ms` (default per cost class)
+    is the wall time the check is expected to stay within: results report
+    when it did not, and run_diagnostics() does not start a class whose
+    budgets no longer fit in what is left of its run budget. Registering
+    a name again replaces the check.
+    """
+    if cost not in COST_ORDER:
+        raise ValueError(f"Unknown cost class: {cost}")
+
+    def decorator(func: CheckFunc) -> CheckFunc:
+        _checks[name] = RegisteredCheck(
+            name=name,
+            func=func,
+            cost=cost,
+            budget_ms=DEFAULT_BUDGETS_MS[cost] if budget_ms is None else budget_ms,
+        )
+        return func
+
+    return decorator
+
+
+def unregister_check(name: str) -> None:
+    _checks.pop(name, None)
+
+
+def registered_checks() -> List[RegisteredCheck]:
+    """Registered checks, in registration order."""
+    return list(_checks.values())
 
 
 # -----------------------------
 # Individual Checks
 # -----------------------------
 
+@register_check("Runtime")
 def check_runtime(snapshot) -> DiagnosticResult:
     runtime = snapshot.runtime
 
@@ -45,10 +133,30 @@ def check_runtime(snapshot) -> DiagnosticResult:
     )
 
 
+def _overdue(section) -> str:
+    """Why a section is incomplete ("" when it is not)."""
+    collection = section.get("collection")
+    if not collection:
+        return ""
+    return (
+        f"collection exceeded its {collection['deadline_seconds']}s deadline "
+        f"({collection['state']})"
+    )
+
+
+@register_check("Memory")
 def check_memory(snapshot) -> DiagnosticResult:
     mem = snapshot.memory
     gov = snapshot.governance
 
+    overdue = _overdue(mem) or _overdue(gov)
+    if overdue:
+        return DiagnosticResult(
+            name="Memory",
+            status="WARN",
+            message=f"Memory state could not be verified: {overdue}.",
+        )
+
     pending_mem = mem.get("pending_proposals", 0)
     pending_gov = len(gov.get("pending_memory_proposals", []))
 
@@ -66,9 +174,18 @@ def check_memory(snapshot) -> DiagnosticResult:
     )
 
 
+@register_check("Governance")
 def check_governance(snapshot) -> DiagnosticResult:
     gov = snapshot.governance
 
+    overdue = _overdue(gov)
+    if overdue:
+        return DiagnosticResult(
+            name="Governance",
+            status="WARN",
+            message=f"Governance state may be out of date: {overdue}.",
+        )
+
     required = [
         "pending_update_proposals",
         "pending_memory_proposals",
@@ -92,6 +209,7 @@ def check_governance(snapshot) -> DiagnosticResult:
     )
 
 
+@register_check("Capabilities")
 def check_capabilities(snapshot) -> DiagnosticResult:
     caps = snapshot.capabilities
 
@@ -122,16 +240,82 @@ def check_capabilities(snapshot) -> DiagnosticResult:
 # Aggregation
 # -----------------------------
 
-def run_diagnostics(snapshot) -> DiagnosticsReport:
-    checks = [
-        check_runtime(snapshot),
-        check_memory(snapshot),
-        check_governance(snapshot),
-        check_capabilities(snapshot),
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_mutex = threading.Lock()
+
+
+def _run_check(check: RegisteredCheck, snapshot) -> DiagnosticResult:
+    started = time.perf_counter()
+    try:
+        result = check.func(snapshot)
+    except Exception as e:
+        result = DiagnosticResult(
+            name=check.name,
+            status="FAIL",
+            message=f"Check raised {type(e).__name__}: {e}",
+        )
+    return replace(
+        result,
+        cost=check.cost,
+        duration_ms=round((time.perf_counter() - started) * 1000, 3),
+        budget_ms=check.budget_ms,
+    )
+
+
+def _run_class(checks: List[RegisteredCheck], snapshot) -> List[DiagnosticResult]:
+    global _pool
+    if len(checks) == 1 or checks[0].cost == "cheap":
+        # Cheaper to run than to hand to a thread.
+        return [_run_check(c, snapshot) for c in checks]
+    with _pool_mutex:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="kimiko-diagnostics")
+    futures = [
+        _pool.submit(contextvars.copy_context().run, _run_check, c, snapshot)
+        for c in checks
     ]
+    return [f.result() for f in futures]
+
+
+def run_diagnostics(
+    snapshot,
+    checks: Optional[List[RegisteredCheck]] = None,
+    budget_ms: float = RUN_BUDGET_MS,
+) -> DiagnosticsReport:
+    """
+    Run `checks` (every registered one by default) one cost class at a
+    time, cheapest first; checks of a class above "cheap" run
+    concurrently. Once a class produces a FAIL, or the time already spent
+    plus the class's largest check budget would exceed `budget_ms`, the
+    class and the costlier ones are skipped. Results keep registration
+    order.
+    """
+    checks = registered_checks() if checks is None else checks
+    started = time.perf_counter()
+
+    by_name: Dict[str, DiagnosticResult] = {}
+    skipped: List[str] = []
+    skip_reason: Optional[SkipReason] = None
+    for cost in COST_ORDER:
+        group = [c for c in checks if c.cost == cost]
+        if not group:
+            continue
+        if skip_reason is None:
+            spent_ms = (time.perf_counter() - started) * 1000
+            if any(r.status == "FAIL" for r in by_name.values()):
+                skip_reason = "fail"
+            elif spent_ms + max(c.budget_ms for c in group) > budget_ms:
+                skip_reason = "budget"
+        if skip_reason is not None:
+            skipped.extend(c.name for c in group)
+            continue
+        for result in _run_class(group, snapshot):
+            by_name[result.name] = result
+
+    results = [by_name[c.name] for c in checks if c.name in by_name]
 
     overall: Severity = "OK"
-    for result in checks:
+    for result in results:
         if result.status == "FAIL":
             overall = "FAIL"
             break
@@ -147,8 +331,11 @@ def run_diagnostics(snapshot) -> DiagnosticsReport:
 
     return DiagnosticsReport(
         overall=overall,
-        results=checks,
+        results=results,
         recommendation=recommendation,
+        skipped=skipped,
+        skip_reason=skip_reason,
+        duration_ms=round((time.perf_counter() - started) * 1000, 3),
     )
 
 
@@ -164,8 +351,15 @@ def diagnostics_to_json(report: DiagnosticsReport) -> Dict:
                 "name": r.name,
                 "status": r.status,
                 "message": r.message,
+                "cost": r.cost,
+                "duration_ms": r.duration_ms,
+                "budget_ms": r.budget_ms,
+                "over_budget": r.over_budget,
             }
             for r in report.results
         ],
+        "skipped": report.skipped,
+        "skip_reason": report.skip_reason,
+        "duration_ms": report.duration_ms,
         "recommendation": report.recommendation,
     }
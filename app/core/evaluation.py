@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Dict, Iterator, Optional, Set
+
+from app.core.diagnostics import DiagnosticsReport, diagnostics_to_json, run_diagnostics
+from app.core.proposal_permissions import ProposalPermissionReport, evaluate_proposal_permission
+from app.core.readiness import ReadinessReport, evaluate_readiness
+from app.core.snapshot_history import SnapshotHistory
+from app.core.system_snapshot import (
+    SnapshotEngine,
+    SystemSnapshot,
+    get_system_snapshot,
+    to_json,
+)
+from app.core.update_manager import UpdateManager
+from app.memory.manager import MemoryManager
+
+
+# -----------------------------
+# Evaluation Context
+# -----------------------------
+
+class EvaluationContext:
+    """
+    Everything one command derives from the system state, each computed
+    at most once: the snapshot, its JSON form, diagnostics, readiness and
+    proposal permission. Commands that chain these (readiness, permission
+    check, draft) read them off one context instead of rebuilding the
+    snapshot at every step.
+
+    A context is a point-in-time view; make a new one per command. Given
+    a session's SnapshotEngine, the snapshot comes from it, so sections
+    whose stores did not change since the last command are not rebuilt.
+    Given a SnapshotHistory, the snapshot's metrics and collection time
+    are recorded there once taken.
+    """
+
+    def __init__(
+        self,
+        *,
+        start_time: float,
+        update_manager: UpdateManager,
+        memory_manager: MemoryManager,
+        snapshots: Optional[SnapshotEngine] = None,
+        history: Optional[SnapshotHistory] = None,
+    ) -> None:
+        self.start_time = start_time
+        self.update_manager = update_manager
+        self.memory_manager = memory_manager
+        self.snapshots = snapshots
+        self.history = history
+
+    @cached_property
+    def snapshot(self) -> SystemSnapshot:
+        started = time.perf_counter()
+        if self.snapshots is not None:
+            snapshot = self.snapshots.snapshot()
+        else:
+            snapshot = get_system_snapshot(
+                start_time=self.start_time,
+                update_manager=self.update_manager,
+                memory_manager=self.memory_manager,
+            )
+        if self.history is not None:
+            self.history.record(snapshot, (time.perf_counter() - started) * 1000)
+        return snapshot
+
+    @cached_property
+    def snapshot_json(self) -> Dict[str, Any]:
+        return to_json(self.snapshot)
+
+    @cached_property
+    def diagnostics(self) -> DiagnosticsReport:
+        return run_diagnostics(self.snapshot)
+
+    @cached_property
+    def diagnostics_json(self) -> Dict:
+        return diagnostics_to_json(self.diagnostics)
+
+    @cached_property
+    def readiness(self) -> ReadinessReport:
+        return evaluate_readiness(
+            snapshot=self.snapshot_json,
+            diagnostics=self.diagnostics_json,
+        )
+
+    @cached_property
+    def permission(self) -> ProposalPermissionReport:
+        return evaluate_proposal_permission(
+            readiness={"status": self.readiness.status},
+            diagnostics=self.diagnostics_json,
+            snapshot=self.snapshot_json,
+        )
+
+
+# -----------------------------
+# File Touch Accounting
+# -----------------------------
+
+@dataclass
+class FileTouches:
+    """Files opened and directories listed while tracking was active."""
+
+    opened: Set[str] = field(default_factory=set)
+    listed: Set[str] = field(default_factory=set)
+    opens: int = 0  # including repeat opens of the same file
+    # Snapshot collectors report from pool threads.
+    _mutex: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def files(self) -> int:
+        return len(self.opened)
+
+    def summary(self) -> str:
+        return (
+            f"{self.files} files ({self.opens} opens), "
+            f"{len(self.listed)} directories listed"
+        )
+
+
+_touches: ContextVar[Optional[FileTouches]] = ContextVar("kimiko_file_touches", default=None)
+_hook_installed = False
+
+
+def _audit(event: str, args: tuple) -> None:
+    # Runs for every audit event in the process; stays a ContextVar
+    # lookup unless a command is being tracked.
+    touches = _touches.get()
+    if touches is None:
+        return
+    if event == "open":
+        path = args[0]
+        if isinstance(path, int):
+            return  # os.fdopen of a descriptor already counted
+        with touches._mutex:
+            touches.opens += 1
+            touches.opened.add(os.fsdecode(path))
+    elif event in ("os.listdir", "os.scandir"):
+        path = args[0]
+        if path is None:
+            path = "."
+        if not isinstance(path, int):
+            with touches._mutex:
+                touches.listed.add(os.fsdecode(path))
+
+
+@contextmanager
+def track_file_touches() -> Iterator[FileTouches]:
+    """
+    Count the files opened and directories listed inside the block (in
+    this thread, and in threads started with a copy of its context, like
+    the snapshot collectors), through the interpreter's audit events, so
+    every store is covered without instrumenting each one.
+    """
+    global _hook_installed
+    if not _hook_installed:
+        sys.addaudithook(_audit)
+        _hook_installed = True
+    touches = FileTouches()
+    token = _touches.set(touches)
+    try:
+        yield touches
+    finally:
+        _touches.reset(token)
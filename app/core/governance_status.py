@@ -5,6 +5,15 @@ from typing import List, Optional
 
 from app.core.update_manager import UpdateManager
 from app.memory.manager import MemoryManager
+from app.memory.proposals import MemoryProposalStatus
+
+
+# Actions that always need a human approval, whatever the proposal state
+APPROVAL_REQUIRED_FOR = (
+    "self-update",
+    "self-upgrade",
+    "memory write",
+)
 
 
 @dataclass(frozen=True)
@@ -18,28 +27,26 @@ class GovernanceStatus:
 def get_governance_status(
     um: UpdateManager, mm: MemoryManager
 ) -> GovernanceStatus:
+    # Headers only: change payloads are never parsed here
+    headers = um.list_headers()
+
     # Pending update proposals
     updates = [
-        p.id for p in um.list()
+        p.id for p in headers
         if p.status.value == "PROPOSED"
     ]
 
-    # Pending memory proposals
+    # Pending memory proposals (from the status index)
     memories = [
-        p.id for p in mm.list_proposals()
-        if p.status.value == "PROPOSED"
+        p.id for p in mm.list_proposals(MemoryProposalStatus.PROPOSED)
     ]
 
-    approval_required_for = [
-        "self-update",
-        "self-upgrade",
-        "memory write",
-    ]
+    approval_required_for = list(APPROVAL_REQUIRED_FOR)
 
     # Best-effort last approved action
     last_action = None
     approved_updates = [
-        p for p in um.list()
+        p for p in headers
         if p.status.value == "APPROVED"
     ]
     if approved_updates:
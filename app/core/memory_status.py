@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Dict, Optional
 
 from app.memory.manager import MemoryManager
 from app.memory.models import MemoryCategory
+from app.memory.proposals import MemoryProposalStatus
 
 
 @dataclass(frozen=True)
@@ -12,6 +13,8 @@ class MemoryStatus:
     backend: str
     counts: Dict[str, int]
     pending_proposals: int
+    last_approved_at: Optional[str] = None
+    cache: Dict[str, int] = field(default_factory=dict)
 
 
 def get_memory_status(mm: MemoryManager) -> MemoryStatus:
@@ -22,22 +25,25 @@ def get_memory_status(mm: MemoryManager) -> MemoryStatus:
     counts: Dict[str, int] = {}
     for category in MemoryCategory:
         try:
-            items = mm.list_memory(category)
-            counts[category.value] = len(items)
+            counts[category.value] = mm.count_memory(category)
         except Exception:
             counts[category.value] = 0
 
-    # Count ONLY proposals that are truly pending (PROPOSED)
-    pending = 0
-    for proposal in mm.list_proposals():
-        status = getattr(proposal.status, "value", None)
-        if status == "PROPOSED":
-            pending += 1
+    # Count ONLY proposals that are truly pending (PROPOSED); the status
+    # index means only those are opened.
+    pending = len(mm.list_proposals(MemoryProposalStatus.PROPOSED))
+
+    try:
+        last_approved = mm.last_approved_at()
+    except Exception:
+        last_approved = None
 
     return MemoryStatus(
         backend=backend,
         counts=counts,
         pending_proposals=pending,
+        last_approved_at=last_approved,
+        cache=mm.cache_stats(),
     )
 
 
@@ -55,5 +61,18 @@ def to_human_readable(ms: MemoryStatus) -> str:
 
     lines.append("")
     lines.append(f"Pending memory proposals: {ms.pending_proposals}")
+    lines.append(f"Last approved memory: {ms.last_approved_at or '(none)'}")
+
+    if ms.cache:
+        lines.append("")
+        lines.append("Read cache (this session):")
+        lines.append(
+            f"- records: {ms.cache.get('hits', 0)} hits / "
+            f"{ms.cache.get('misses', 0)} misses ({ms.cache.get('size', 0)} cached)"
+        )
+        lines.append(
+            f"- listings: {ms.cache.get('list_hits', 0)} hits / "
+            f"{ms.cache.get('list_misses', 0)} misses"
+        )
 
     return "\n".join(lines)
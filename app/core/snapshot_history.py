@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import math
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.core.diagnostics import DiagnosticResult, register_check
+from app.core.system_snapshot import SystemSnapshot
+from app.memory.models import MemoryCategory
+from app.storage.ring import RingFile
+
+
+# -----------------------------
+# Recorded Metrics
+# -----------------------------
+
+FIELDS = [
+    "time",
+    "collection_ms",
+    "memory.pending_proposals",
+    "governance.pending_update_proposals",
+    "governance.pending_memory_proposals",
+] + [f"memory.count.{c.value}" for c in MemoryCategory]
+
+# Points kept; at 80 bytes each the ring file stays around 80 KiB.
+CAPACITY = 1024
+
+# Minimum seconds between two recorded points (KIMIKO_SNAPSHOT_HISTORY_INTERVAL);
+# 0 records every snapshot.
+DEFAULT_INTERVAL = 0.0
+
+# The trend check looks at this many of the newest points.
+TREND_WINDOW = 10
+TREND_MIN_POINTS = 3
+
+Point = Dict[str, Optional[float]]
+
+
+def _interval() -> float:
+    raw = os.environ.get("KIMIKO_SNAPSHOT_HISTORY_INTERVAL")
+    if not raw:
+        return DEFAULT_INTERVAL
+    try:
+        return float(raw)
+    except ValueError:
+        raise ValueError(f"Invalid KIMIKO_SNAPSHOT_HISTORY_INTERVAL: {raw!r}") from None
+
+
+class SnapshotHistory:
+    """
+    Bounded time series of snapshot metrics (counts, pending proposals,
+    collection latency) in a ring file:
+
+      .kimiko/metrics/snapshots.ring
+
+    One point per snapshot taken (at most one per interval), so trends
+    can be read back without rescanning any store. Sections a snapshot
+    could not collect in time are recorded as missing, not as zeros.
+    """
+
+    def __init__(self, state_dir: Path, capacity: int = CAPACITY) -> None:
+        self.ring = RingFile(state_dir / "metrics" / "snapshots.ring", FIELDS, capacity)
+
+    def record(
+        self,
+        snapshot: SystemSnapshot,
+        collection_ms: float,
+        now: Optional[float] = None,
+    ) -> bool:
+        """Append a point for `snapshot`; False when skipped by the interval."""
+        now = time.time() if now is None else now
+        interval = _interval()
+        if interval > 0:
+            last = self.ring.rows(last=1)
+            if last and now - last[0][0] < interval:
+                return False
+
+        memory = {} if snapshot.memory.get("collection") else snapshot.memory
+        governance = {} if snapshot.governance.get("collection") else snapshot.governance
+        counts = memory.get("counts", {})
+
+        def length(key: str) -> Optional[int]:
+            value = governance.get(key)
+            return None if value is None else len(value)
+
+        self.ring.append(
+            [
+                now,
+                collection_ms,
+                memory.get("pending_proposals"),
+                length("pending_update_proposals"),
+                length("pending_memory_proposals"),
+            ]
+            + [counts.get(c.value) for c in MemoryCategory]
+        )
+        return True
+
+    def points(self, last: Optional[int] = None) -> List[Point]:
+        """The newest `last` points (all when None), oldest first."""
+        return [
+            {
+                name: None if math.isnan(value) else value
+                for name, value in zip(FIELDS, row)
+            }
+            for row in self.ring.rows(last=last)
+        ]
+
+
+# -----------------------------
+# Trend Diagnostic
+# -----------------------------
+
+_GROWTH_WATCHED = {
+    "memory.pending_proposals": "Pending memory proposals",
+    "governance.pending_update_proposals": "Pending update proposals",
+}
+
+
+def _growth(points: List[Point], field: str) -> Optional[tuple]:
+    """(first, last) when `field` never fell and ended higher, else None."""
+    values = [p[field] for p in points if p[field] is not None]
+    if len(values) < TREND_MIN_POINTS:
+        return None
+    if all(a <= b for a, b in zip(values, values[1:])) and values[-1] > values[0]:
+        return values[0], values[-1]
+    return None
+
+
+def evaluate_trends(points: List[Point]) -> DiagnosticResult:
+    if len(points) < TREND_MIN_POINTS:
+        return DiagnosticResult(
+            name="Trends",
+            status="OK",
+            message=f"Not enough snapshot history yet ({len(points)} points).",
+        )
+
+    growing = []
+    for field, label in _GROWTH_WATCHED.items():
+        grew = _growth(points, field)
+        if grew is not None:
+            growing.append(f"{label} grew from {grew[0]:g} to {grew[1]:g}")
+    if growing:
+        return DiagnosticResult(
+            name="Trends",
+            status="WARN",
+            message=f"{'; '.join(growing)} over the last {len(points)} snapshots.",
+        )
+
+    history = [
+        p["memory.count.history"] for p in points if p["memory.count.history"] is not None
+    ]
+    detail = ""
+    if len(history) >= 2 and history[-1] != history[0]:
+        detail = f" History grew by {history[-1] - history[0]:g} records."
+    return DiagnosticResult(
+        name="Trends",
+        status="OK",
+        message=f"No growing backlog over the last {len(points)} snapshots.{detail}",
+    )
+
+
+def register_trend_check(history: SnapshotHistory) -> None:
+    """Add the "Trends" check, reading `history`, to the diagnostics registry."""
+    register_check("Trends", cost="moderate")(
+        lambda snapshot: evaluate_trends(history.points(last=TREND_WINDOW))
+    )
+
+
+# -----------------------------
+# Renderers
+# -----------------------------
+
+def _cell(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:g}"
+
+
+def history_to_human_readable(points: List[Point]) -> str:
+    if not points:
+        return "No snapshot history recorded yet."
+
+    lines = [
+        "Snapshot History",
+        "================",
+        "",
+        f"{'time (UTC)':<20} {'ms':>8} {'mem pend':>9} {'upd pend':>9} {'history':>8}",
+    ]
+    for p in points:
+        stamp = datetime.fromtimestamp(p["time"], timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        ms = "-" if p["collection_ms"] is None else f"{p['collection_ms']:.1f}"
+        lines.append(
+            f"{stamp:<20} {ms:>8} {_cell(p['memory.pending_proposals']):>9} "
+            f"{_cell(p['governance.pending_update_proposals']):>9} "
+            f"{_cell(p['memory.count.history']):>8}"
+        )
+    return "\n".join(lines)
+
+
+def history_to_json(points: List[Point]) -> List[Point]:
+    return [
+        dict(p, time=datetime.fromtimestamp(p["time"], timezone.utc).isoformat())
+        for p in points
+    ]
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from app.core.update_manager import UpdateManager
+from app.memory.manager import MemoryManager
+from app.memory.models import MemoryCategory, MemoryRecord
+from app.memory.proposals import MemoryProposal
+from app.memory.store import record_from_dict
+from app.storage.atomic import atomic_write_text
+from app.update.models import UpdateProposal
+
+
+EXPORT_VERSION = 1
+
+# Memory records are imported (and the checkpoint advanced) in groups of
+# this many lines, each group one group commit on the store.
+IMPORT_BATCH = 500
+
+
+@dataclass
+class ImportResult:
+    imported: Dict[str, int] = field(default_factory=dict)
+    skipped: int = 0  # already present
+    rejected: Dict[str, int] = field(default_factory=dict)  # reason -> count
+    resumed_from: int = 0  # line the import picked up at
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _line(kind: str, data: dict) -> str:
+    return json.dumps({"kind": kind, "data": data}, ensure_ascii=False) + "\n"
+
+
+# ---------- Export ----------
+
+def export_state(mm: MemoryManager, um: UpdateManager, path: Path) -> Dict[str, int]:
+    """
+    Write every memory record, memory proposal and update proposal to a
+    gzip JSONL file, one object per line after a header line.
+
+    Everything is streamed (store.iter / proposal iter), so memory use
+    does not grow with the size of the state. The file is written under
+    a temp name and renamed, so a partial export never looks complete.
+    Returns the number of lines written per kind.
+    """
+    counts: Counter = Counter()
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "kind": "header",
+                "version": EXPORT_VERSION,
+                "exported_at": _now_iso(),
+            }) + "\n")
+            for category in MemoryCategory:
+                for record in mm.iter_memory(category):
+                    f.write(_line("memory", record.to_dict()))
+                    counts[f"memory/{category.value}"] += 1
+            for proposal in mm.proposals.iter():
+                f.write(_line("memory_proposal", proposal.to_dict()))
+                counts["memory_proposal"] += 1
+            for proposal in um.store.iter():
+                f.write(_line("update_proposal", proposal.to_dict()))
+                counts["update_proposal"] += 1
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return dict(counts)
+
+
+# ---------- Import ----------
+
+def _checkpoint_path(mm: MemoryManager, path: Path) -> Path:
+    # Keyed by the export file itself, so a different file starts over.
+    st = path.stat()
+    key = f"{path.resolve()}:{st.st_size}:{st.st_mtime_ns}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return mm.repo_root / ".kimiko" / "import" / f"{digest}.progress"
+
+
+def import_state(
+    mm: MemoryManager,
+    um: UpdateManager,
+    path: Path,
+    restart: bool = False,
+) -> ImportResult:
+    """
+    Load a file written by export_state.
+
+    Memory records keep their ids and timestamps and go through the
+    store's category rules in bulk (identity is refused, facts and
+    preferences need a recorded approval). Anything already present is
+    skipped, and progress is checkpointed under .kimiko/import/ after
+    every batch, so an interrupted import resumes where it stopped.
+    """
+    result = ImportResult()
+    imported: Counter = Counter()
+    rejected: Counter = Counter()
+
+    checkpoint = _checkpoint_path(mm, path)
+    checkpoint.parent.mkdir(parents=True, exist_ok=True)
+    if restart:
+        checkpoint.unlink(missing_ok=True)
+    try:
+        done = int(checkpoint.read_text(encoding="utf-8").strip() or 0)
+    except (FileNotFoundError, ValueError):
+        done = 0
+    result.resumed_from = done
+
+    batch: List[MemoryRecord] = []
+    # Proposals are saved per batch too, so each index (status.idx,
+    # headers.idx) is rewritten once per batch rather than per proposal.
+    memory_proposals: Dict[str, MemoryProposal] = {}
+    update_proposals: Dict[str, UpdateProposal] = {}
+
+    def flush(line_no: int) -> None:
+        if memory_proposals:
+            mm.proposals.save_many(list(memory_proposals.values()))
+            memory_proposals.clear()
+        if update_proposals:
+            um.store.save_many(list(update_proposals.values()))
+            update_proposals.clear()
+        if batch:
+            written, refused = mm.import_records(batch)
+            for record in written:
+                imported[f"memory/{record.category.value}"] += 1
+            for _, reason in refused:
+                rejected[reason] += 1
+            result.skipped += len(batch) - len(written) - len(refused)
+            batch.clear()
+        atomic_write_text(checkpoint, str(line_no))
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        line_no = 0
+        for line_no, raw in enumerate(f, start=1):
+            if line_no <= done:
+                continue
+            try:
+                entry = json.loads(raw)
+                kind, data = entry["kind"], entry.get("data")
+            except (ValueError, KeyError, TypeError):
+                rejected["unreadable line"] += 1
+                continue
+
+            if kind == "header":
+                if entry.get("version") != EXPORT_VERSION:
+                    raise ValueError(f"Unsupported export version: {entry.get('version')}")
+            elif kind not in ("memory", "memory_proposal", "update_proposal"):
+                rejected[f"unknown kind: {kind}"] += 1
+            else:
+                try:
+                    if kind == "memory":
+                        batch.append(record_from_dict(data))
+                    elif kind == "memory_proposal":
+                        proposal = MemoryProposal.from_dict(data)
+                        if proposal.id in memory_proposals or mm.proposals.exists(proposal.id):
+                            result.skipped += 1
+                        else:
+                            memory_proposals[proposal.id] = proposal
+                            imported[kind] += 1
+                    else:
+                        update = UpdateProposal.from_dict(data)
+                        if update.id in update_proposals or um.store.exists(update.id):
+                            result.skipped += 1
+                        else:
+                            update_proposals[update.id] = update
+                            imported[kind] += 1
+                except (ValueError, KeyError, TypeError):
+                    rejected[f"invalid {kind}"] += 1
+
+            if line_no % IMPORT_BATCH == 0:
+                flush(line_no)
+        flush(line_no)
+
+    # Finished: the next import of this file starts from the top again
+    # (and skips everything, since it is all present).
+    checkpoint.unlink(missing_ok=True)
+    result.imported = dict(imported)
+    result.rejected = dict(rejected)
+    return result
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
 from dataclasses import dataclass
-from typing import Dict, List, Any
+from typing import Any, Callable, Dict, List, Optional
 
 from app.version import __version__
 from app.core.runtime_status import get_runtime_status
 from app.core.memory_status import get_memory_status
-from app.core.governance_status import get_governance_status
+from app.core.governance_status import APPROVAL_REQUIRED_FOR, get_governance_status
 from app.core.capabilities_status import get_capabilities_status
 from app.memory.manager import MemoryManager
 from app.core.update_manager import UpdateManager
@@ -25,50 +31,297 @@ class SystemSnapshot:
 
 
 # -----------------------------
-# Snapshot Construction
+# Snapshot Sections
 # -----------------------------
 
-def get_system_snapshot(
-    *,
-    start_time: float,
-    update_manager: UpdateManager,
-    memory_manager: MemoryManager,
-) -> SystemSnapshot:
+def _runtime_section(start_time: float) -> Dict[str, Any]:
     runtime_status = get_runtime_status(
         version=__version__,
         start_time=start_time,
     )
+    return {
+        "version": runtime_status.version,
+        "uptime_seconds": runtime_status.uptime_seconds,
+        "python": runtime_status.python_version,
+        "platform": runtime_status.platform,
+    }
 
+
+def _memory_section(memory_manager: MemoryManager) -> Dict[str, Any]:
     memory_status = get_memory_status(memory_manager)
+    return {
+        "backend": memory_status.backend,
+        "counts": memory_status.counts,
+        "pending_proposals": memory_status.pending_proposals,
+        "last_approved_at": memory_status.last_approved_at,
+    }
+
+
+def _governance_section(
+    update_manager: UpdateManager, memory_manager: MemoryManager
+) -> Dict[str, Any]:
     governance_status = get_governance_status(update_manager, memory_manager)
+    return {
+        "pending_update_proposals": governance_status.pending_update_proposals,
+        "pending_memory_proposals": governance_status.pending_memory_proposals,
+        "approval_required_for": governance_status.approval_required_for,
+        "last_approved_action": governance_status.last_approved_action,
+    }
+
+
+def _capabilities_section() -> Dict[str, Any]:
     capabilities_status = get_capabilities_status()
+    return {
+        "enabled": capabilities_status.enabled,
+        "disabled": capabilities_status.disabled,
+        "planned": capabilities_status.planned,
+    }
+
+
+def _placeholder_section(name: str, memory_manager: MemoryManager) -> Dict[str, Any]:
+    # What a section looks like when its collector has produced nothing
+    # yet: every key present, nothing claimed.
+    if name == "memory":
+        return {
+            "backend": memory_manager.store.__class__.__name__,
+            "counts": {},
+            "pending_proposals": None,
+            "last_approved_at": None,
+        }
+    return {
+        "pending_update_proposals": [],
+        "pending_memory_proposals": [],
+        "approval_required_for": list(APPROVAL_REQUIRED_FOR),
+        "last_approved_action": None,
+    }
+
+
+# -----------------------------
+# Parallel Collection
+# -----------------------------
+
+# Seconds the memory and governance collectors (the ones doing I/O) may
+# take before the snapshot stops waiting for them. KIMIKO_SNAPSHOT_DEADLINE
+# overrides both, KIMIKO_SNAPSHOT_DEADLINE_<SECTION> one; 0 waits forever.
+DEFAULT_DEADLINES = {"memory": 2.0, "governance": 2.0}
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_mutex = threading.Lock()
+
+
+def snapshot_deadlines() -> Dict[str, float]:
+    deadlines = dict(DEFAULT_DEADLINES)
+    for name in deadlines:
+        raw = os.environ.get(f"KIMIKO_SNAPSHOT_DEADLINE_{name.upper()}") or os.environ.get(
+            "KIMIKO_SNAPSHOT_DEADLINE"
+        )
+        if raw:
+            try:
+                deadlines[name] = float(raw)
+            except ValueError:
+                raise ValueError(f"Invalid snapshot deadline: {raw!r}") from None
+    return deadlines
+
+
+def _submit(build: Callable[[], Dict[str, Any]]) -> Future:
+    global _pool
+    with _pool_mutex:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="kimiko-snapshot")
+    # The copied context carries track_file_touches() into the worker.
+    return _pool.submit(contextvars.copy_context().run, build)
+
+
+def _await_section(
+    name: str,
+    future: Future,
+    *,
+    started: float,
+    deadlines: Dict[str, float],
+    previous: Optional[Dict[str, Any]],
+    memory_manager: MemoryManager,
+) -> Dict[str, Any]:
+    """
+    The collector's section if it finishes within its deadline (counted
+    from `started`). Otherwise the previous section, marked stale, or a
+    placeholder marked timeout; the collector keeps running regardless.
+    """
+    deadline = deadlines.get(name) or None
+    timeout = None if deadline is None else max(0.0, started + deadline - time.monotonic())
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        pass
+    if previous is not None:
+        section, state = dict(previous), "stale"
+    else:
+        section, state = _placeholder_section(name, memory_manager), "timeout"
+    section["collection"] = {"state": state, "deadline_seconds": deadline}
+    return section
+
+
+# -----------------------------
+# Snapshot Construction
+# -----------------------------
+
+def get_system_snapshot(
+    *,
+    start_time: float,
+    update_manager: UpdateManager,
+    memory_manager: MemoryManager,
+    deadlines: Optional[Dict[str, float]] = None,
+) -> SystemSnapshot:
+    """
+    Memory and governance are collected concurrently on a thread pool,
+    each within its deadline (see snapshot_deadlines()); a section whose
+    collector overruns carries "collection": {"state": "timeout", ...}.
+    Runtime and capabilities do no I/O and are built in this thread
+    meanwhile.
+    """
+    deadlines = snapshot_deadlines() if deadlines is None else deadlines
+    started = time.monotonic()
+    memory = _submit(lambda: _memory_section(memory_manager))
+    governance = _submit(lambda: _governance_section(update_manager, memory_manager))
+    runtime = _runtime_section(start_time)
+    capabilities = _capabilities_section()
+
+    def wait(name: str, future: Future) -> Dict[str, Any]:
+        return _await_section(
+            name, future, started=started, deadlines=deadlines,
+            previous=None, memory_manager=memory_manager,
+        )
 
     return SystemSnapshot(
-        runtime={
-            "version": runtime_status.version,
-            "uptime_seconds": runtime_status.uptime_seconds,
-            "python": runtime_status.python_version,
-            "platform": runtime_status.platform,
-        },
-        memory={
-            "backend": memory_status.backend,
-            "counts": memory_status.counts,
-            "pending_proposals": memory_status.pending_proposals,
-        },
-        governance={
-            "pending_update_proposals": governance_status.pending_update_proposals,
-            "pending_memory_proposals": governance_status.pending_memory_proposals,
-            "approval_required_for": governance_status.approval_required_for,
-            "last_approved_action": governance_status.last_approved_action,
-        },
-        capabilities={
-            "enabled": capabilities_status.enabled,
-            "disabled": capabilities_status.disabled,
-            "planned": capabilities_status.planned,
-        },
+        runtime=runtime,
+        memory=wait("memory", memory),
+        governance=wait("governance", governance),
+        capabilities=capabilities,
     )
 
 
+class SnapshotEngine:
+    """
+    Incremental get_system_snapshot() for a long-lived session.
+
+    Each section is cached together with the change generations of the
+    stores it reads (see generation() on the memory backends and the two
+    proposal stores) and rebuilt only when one of them moved:
+
+      memory        memory store + memory proposals
+      governance    update proposals + memory proposals
+      capabilities  static, built once
+      runtime       rebuilt every time (uptime; no I/O)
+
+    A store whose generation is None cannot tell, so its sections are
+    always rebuilt. Generations are read before a section is built, so a
+    write that races the build shows up as a change on the next call.
+
+    Rebuilds run on the collector pool under the same deadlines as
+    get_system_snapshot(). One that overruns leaves the last section in
+    place, marked "collection": {"state": "stale", ...}; when it finishes
+    its result is cached, and later snapshots wait on it rather than
+    starting another collection of the same generations.
+
+    Cached section dicts are shared between snapshots; treat them as
+    read-only, as every consumer of SystemSnapshot already does.
+    """
+
+    def __init__(
+        self,
+        *,
+        start_time: float,
+        update_manager: UpdateManager,
+        memory_manager: MemoryManager,
+        deadlines: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.start_time = start_time
+        self.update_manager = update_manager
+        self.memory_manager = memory_manager
+        self.deadlines = deadlines
+        # section -> (generations, section dict)
+        self._sections: Dict[str, tuple] = {}
+        # section -> (generations, future) of the collection in progress
+        self._pending: Dict[str, tuple] = {}
+        self._capabilities: Optional[Dict[str, Any]] = None
+        self._mutex = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def snapshot(self) -> SystemSnapshot:
+        um, mm = self.update_manager, self.memory_manager
+        deadlines = snapshot_deadlines() if self.deadlines is None else self.deadlines
+        started = time.monotonic()
+        memory_gen = mm.store.generation()
+        memory_proposals_gen = mm.proposals.generation()
+        update_proposals_gen = um.store.generation()
+
+        memory = self._start(
+            "memory",
+            (memory_gen, memory_proposals_gen),
+            lambda: _memory_section(mm),
+        )
+        governance = self._start(
+            "governance",
+            (update_proposals_gen, memory_proposals_gen),
+            lambda: _governance_section(um, mm),
+        )
+        runtime = _runtime_section(self.start_time)
+        if self._capabilities is None:
+            self._capabilities = _capabilities_section()
+
+        def wait(name: str, started_section: tuple) -> Dict[str, Any]:
+            section, future, previous = started_section
+            if future is None:
+                return section
+            return _await_section(
+                name, future, started=started, deadlines=deadlines,
+                previous=previous, memory_manager=mm,
+            )
+
+        return SystemSnapshot(
+            runtime=runtime,
+            memory=wait("memory", memory),
+            governance=wait("governance", governance),
+            capabilities=self._capabilities,
+        )
+
+    def invalidate(self) -> None:
+        """Drop every cached section, e.g. after swapping a manager."""
+        with self._mutex:
+            self._sections.clear()
+            self._pending.clear()
+
+    def _start(
+        self, name: str, generations: tuple, build: Callable[[], Dict[str, Any]]
+    ) -> tuple:
+        """
+        (section, None, None) on a cache hit, else (None, future, previous
+        section or None) for the collection to wait on.
+        """
+        with self._mutex:
+            cached = self._sections.get(name)
+            if cached is not None and cached[0] == generations and None not in generations:
+                self.stats["hits"] += 1
+                return cached[1], None, None
+            self.stats["misses"] += 1
+            previous = cached[1] if cached is not None else None
+            pending = self._pending.get(name)
+            if pending is not None and pending[0] == generations and None not in generations:
+                return None, pending[1], previous
+            future = _submit(build)
+            self._pending[name] = (generations, future)
+        future.add_done_callback(lambda f: self._collected(name, generations, f))
+        return None, future, previous
+
+    def _collected(self, name: str, generations: tuple, future: Future) -> None:
+        with self._mutex:
+            pending = self._pending.get(name)
+            if pending is None or pending[1] is not future:
+                return  # superseded by a later collection
+            del self._pending[name]
+            if future.exception() is None:
+                self._sections[name] = (generations, future.result())
+
+
 # -----------------------------
 # Renderers
 # -----------------------------
@@ -89,19 +342,25 @@ def to_human_readable(snapshot: SystemSnapshot) -> str:
         "",
         "Memory",
         "------",
-        f"Backend: {snapshot.memory['backend']}",
     ])
+    lines.extend(_collection_note(snapshot.memory))
+    lines.append(f"Backend: {snapshot.memory['backend']}")
 
     for k, v in snapshot.memory["counts"].items():
         lines.append(f"- {k}: {v}")
 
-    lines.append(f"Pending proposals: {snapshot.memory['pending_proposals']}")
+    pending = snapshot.memory["pending_proposals"]
+    lines.append(f"Pending proposals: {'(unknown)' if pending is None else pending}")
+    lines.append(
+        f"Last approved memory: {snapshot.memory.get('last_approved_at') or '(none)'}"
+    )
     lines.append("")
     lines.extend([
         "Governance",
         "----------",
-        "Pending update proposals:",
     ])
+    lines.extend(_collection_note(snapshot.governance))
+    lines.append("Pending update proposals:")
 
     if snapshot.governance["pending_update_proposals"]:
         for pid in snapshot.governance["pending_update_proposals"]:
@@ -151,6 +410,16 @@ def to_human_readable(snapshot: SystemSnapshot) -> str:
     return "\n".join(lines)
 
 
+def _collection_note(section: Dict[str, Any]) -> List[str]:
+    collection = section.get("collection")
+    if not collection:
+        return []
+    what = "last known values" if collection["state"] == "stale" else "not collected"
+    return [
+        f"({what}: collection exceeded its {collection['deadline_seconds']}s deadline)"
+    ]
+
+
 def to_json(snapshot: SystemSnapshot) -> Dict[str, Any]:
     """
     Pure machine-readable snapshot.
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-from app.update.engine import apply_proposal
-from app.update.models import ProposalStatus, UpdateProposal
+from app.storage.journal import Journal
+from app.update.engine import apply_proposal, backup_dir_for, restore_backup
+from app.update.models import ProposalHeader, ProposalStatus, UpdateProposal
 from app.update.store import ProposalStore
 
 
@@ -13,6 +14,10 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+# Journal kind of UpdateManager.apply.
+APPLY_TX = "update.apply"
+
+
 class UpdateManager:
     """
     v1.5 contract enforcer:
@@ -31,47 +36,101 @@ class UpdateManager:
         self.proposals_dir.mkdir(parents=True, exist_ok=True)
         self.backups_dir.mkdir(parents=True, exist_ok=True)
 
+        self.journal = Journal(self.state_dir)
+        self.journal.register(APPLY_TX, self._recover_apply)
+        # Settle an apply a crashed process left half done.
+        self.journal.recover()
+
     # --- Query operations ---
-    def list(self) -> List[UpdateProposal]:
-        return self.store.list()
+    def list(
+        self, after: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[UpdateProposal]:
+        if after is None and limit is None:
+            return self.store.list()
+        return [self.store.load(pid) for pid in self.store.list_ids(after=after, limit=limit)]
+
+    def list_headers(
+        self, after: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[ProposalHeader]:
+        """Id, status, summary etc. of every proposal, without change payloads."""
+        return self.store.list_headers(after=after, limit=limit)
+
+    def list_active(self) -> List[UpdateProposal]:
+        """Proposals not yet archived; every pending one is among them."""
+        return self.store.list_active()
 
     def load(self, proposal_id: str) -> UpdateProposal:
         return self.store.load(proposal_id)
 
+    def archive(self, before: Optional[str] = None) -> List[str]:
+        return self.store.archive(before)
+
     # --- Mutations ---
     def propose(self, proposal: UpdateProposal) -> None:
         proposal.updated_at = _now_iso()
         self.store.save(proposal)
 
     def approve(self, proposal_id: str) -> UpdateProposal:
-        p = self.load(proposal_id)
-        if p.status in (ProposalStatus.REJECTED, ProposalStatus.APPLIED):
-            raise ValueError(f"Cannot approve proposal in status: {p.status.value}")
-        p.status = ProposalStatus.APPROVED
-        p.updated_at = _now_iso()
-        self.store.save(p)
+        with self.store.lock:
+            p = self.load(proposal_id)
+            if p.status in (ProposalStatus.REJECTED, ProposalStatus.APPLIED):
+                raise ValueError(f"Cannot approve proposal in status: {p.status.value}")
+            p.status = ProposalStatus.APPROVED
+            p.updated_at = _now_iso()
+            self.store.save(p)
         return p
 
     def reject(self, proposal_id: str, notes: str = "") -> UpdateProposal:
-        p = self.load(proposal_id)
-        if p.status == ProposalStatus.APPLIED:
-            raise ValueError("Cannot reject an already applied proposal.")
-        p.status = ProposalStatus.REJECTED
-        p.notes = notes.strip()
-        p.updated_at = _now_iso()
-        self.store.save(p)
+        with self.store.lock:
+            p = self.load(proposal_id)
+            if p.status == ProposalStatus.APPLIED:
+                raise ValueError("Cannot reject an already applied proposal.")
+            p.status = ProposalStatus.REJECTED
+            p.notes = notes.strip()
+            p.updated_at = _now_iso()
+            self.store.save(p)
         return p
 
     def apply(self, proposal_id: str) -> str:
-        p = self.load(proposal_id)
-        res = apply_proposal(self.repo_root, self.backups_dir, p)
-        if res.ok:
-            p.status = ProposalStatus.APPLIED
-            p.updated_at = _now_iso()
-            self.store.save(p)
-        else:
-            p.status = ProposalStatus.FAILED
-            p.notes = (p.notes + "\n" + res.message).strip()
+        """
+        Apply an approved proposal. Journaled: if the process dies while
+        files are being changed, the next UpdateManager restores the
+        backup and marks the proposal FAILED; if it dies after the health
+        check passed, the proposal is marked APPLIED.
+        """
+        with self.store.lock:
+            p = self.load(proposal_id)
+            backup_dir = backup_dir_for(self.backups_dir, p)
+            data = {"proposal_id": p.id, "backup_dir": str(backup_dir)}
+            with self.journal.transaction(APPLY_TX, data) as tx:
+                res = apply_proposal(self.repo_root, self.backups_dir, p, backup_dir=backup_dir)
+                if res.ok:
+                    tx.step("applied")
+                    p.status = ProposalStatus.APPLIED
+                    p.updated_at = _now_iso()
+                    self.store.save(p)
+                else:
+                    p.status = ProposalStatus.FAILED
+                    p.notes = (p.notes + "\n" + res.message).strip()
+                    p.updated_at = _now_iso()
+                    self.store.save(p)
+        return res.message
+
+    def _recover_apply(self, data: dict, steps: List[str]) -> None:
+        with self.store.lock:
+            try:
+                p = self.load(data["proposal_id"])
+            except FileNotFoundError:
+                return
+            if p.status != ProposalStatus.APPROVED:
+                return  # the final status was saved; only the end record was lost
+            if "applied" in steps:
+                p.status = ProposalStatus.APPLIED
+            else:
+                backup_dir = Path(data["backup_dir"])
+                if backup_dir.is_dir():
+                    restore_backup(self.repo_root, backup_dir)
+                p.status = ProposalStatus.FAILED
+                p.notes = (p.notes + "\nApply was interrupted; rolled back.").strip()
             p.updated_at = _now_iso()
             self.store.save(p)
-        return res.message
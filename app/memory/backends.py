@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Type
+
+from app.memory.store import BaseMemoryStore, MemoryStore
+from app.memory.segment_store import SegmentMemoryStore
+from app.memory.sqlite_store import SqliteMemoryStore
+
+
+# Selected with KIMIKO_MEMORY_BACKEND; "file" is the v1.5 layout.
+MEMORY_BACKENDS: Dict[str, Type[BaseMemoryStore]] = {
+    "file": MemoryStore,
+    "segment": SegmentMemoryStore,
+    "sqlite": SqliteMemoryStore,
+}
+
+DEFAULT_BACKEND = "file"
+
+
+def open_memory_store(repo_root: Path, backend: str | None = None) -> BaseMemoryStore:
+    name = backend or os.environ.get("KIMIKO_MEMORY_BACKEND") or DEFAULT_BACKEND
+    try:
+        store_cls = MEMORY_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown memory backend: {name}")
+    return store_cls(repo_root)
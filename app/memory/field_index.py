@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import bisect
+import json
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.memory.models import MemoryCategory, MemoryRecord
+from app.storage.atomic import atomic_write_text
+from app.storage.delta_log import DeltaLog
+
+
+# Fields a RecordFilter can name, and how to read each off a record.
+INDEXED_FIELDS = {
+    "source": lambda r: r.source,
+    "approved_by": lambda r: r.approval.approved_by if r.approval else None,
+    "approved_at": lambda r: r.approval.approved_at if r.approval else None,
+    "created_at": lambda r: r.created_at,
+    "updated_at": lambda r: r.updated_at,
+}
+
+MIN_DELTA_BEFORE_SNAPSHOT = 1000
+
+
+@dataclass(frozen=True)
+class RecordFilter:
+    """
+    One condition on an indexed field: an exact value, or a range with
+    since <= value < until (ISO-8601 prefixes for the timestamp fields).
+    Records with no value for the field never match.
+    """
+
+    field: str
+    equals: Optional[str] = None
+    since: Optional[str] = None
+    until: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.field not in INDEXED_FIELDS:
+            raise ValueError(f"Not an indexed field: {self.field}")
+
+    def accepts(self, value: Optional[str]) -> bool:
+        if value is None:
+            return False
+        if self.equals is not None and value != self.equals:
+            return False
+        if self.since is not None and value < self.since:
+            return False
+        if self.until is not None and value >= self.until:
+            return False
+        return True
+
+    def matches(self, record: MemoryRecord) -> bool:
+        return self.accepts(INDEXED_FIELDS[self.field](record))
+
+
+class FieldIndex:
+    """
+    Secondary indexes over the INDEXED_FIELDS of every record, kept up
+    to date through store.indexes like SearchIndex.
+
+    Layout under .kimiko/memory/index/:
+      fields.json    doc key -> {field: value} snapshot
+      fields.delta   one JSON line per document written since the snapshot
+
+    In memory, each (category, field) keeps a sorted (value, id) list, so
+    an equality or range filter is two bisections instead of a scan.
+    """
+
+    def __init__(self, index_dir: Path) -> None:
+        self.index_dir = index_dir
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshot_path = self.index_dir / "fields.json"
+        self.delta_path = self.index_dir / "fields.delta"
+
+        self._docs: Dict[str, Dict[str, Optional[str]]] = {}
+        self._sorted: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        self._cat_counts: Counter = Counter()
+        self._log = DeltaLog(
+            self.snapshot_path,
+            self.delta_path,
+            self._load,
+            lambda entry: self._apply(entry["k"], entry["v"]),
+        )
+
+    # ---------- Maintenance ----------
+
+    def records_written(self, records: List[MemoryRecord], moved: Optional[tuple] = None) -> None:
+        self._log.append([{"k": _key(r), "v": _values(r)} for r in records], moved)
+        if self._log.entries >= max(MIN_DELTA_BEFORE_SNAPSHOT, len(self._docs) // 4):
+            self.save_snapshot()
+
+    def rebuild(
+        self, records: Iterable[MemoryRecord], generation: Optional[tuple] = None
+    ) -> None:
+        """Index records from scratch, as of store generation `generation`."""
+        self._fill((_key(r), _values(r)) for r in records)
+        self.save_snapshot(generation)
+
+    def save_snapshot(self, generation: Optional[tuple] = None) -> None:
+        atomic_write_text(self.snapshot_path, json.dumps(self._docs, separators=(",", ":")))
+        self._log.truncate(generation)
+
+    # ---------- Queries ----------
+
+    def in_sync(self, generation: Optional[tuple]) -> bool:
+        """Whether the index reflects the store as of `generation`."""
+        return self._log.covers(generation)
+
+    def count(self, category: MemoryCategory) -> int:
+        self._log.refresh()
+        return self._cat_counts[category.value]
+
+    def lookup(
+        self,
+        category: MemoryCategory,
+        filters: List[RecordFilter],
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[str]:
+        """
+        Ids of the records in category matching every filter, in
+        (created_at, id) order, only those past `after` when given.
+        """
+        self._log.refresh()
+        ids: Optional[set] = None
+        for f in filters:
+            entries = self._sorted.get((category.value, f.field), [])
+            if f.equals is not None:
+                lo, hi = (f.equals, ""), (f.equals + "\0", "")
+            else:
+                lo = (f.since or "", "")
+                hi = (f.until, "") if f.until is not None else None
+            start = bisect.bisect_left(entries, lo)
+            stop = bisect.bisect_left(entries, hi) if hi is not None else len(entries)
+            matched = {
+                record_id for value, record_id in entries[start:stop] if f.accepts(value)
+            }
+            ids = matched if ids is None else ids & matched
+            if not ids:
+                return []
+
+        if ids is None:
+            ids = {k.split("/", 1)[1] for k in self._docs if k.startswith(f"{category.value}/")}
+        prefix = f"{category.value}/"
+        keys = sorted((self._docs[prefix + i]["created_at"] or "", i) for i in ids)
+        if after is not None:
+            keys = keys[bisect.bisect_right(keys, after):]
+        return [record_id for _, record_id in keys]
+
+    # ---------- Internals ----------
+
+    def _reset(self) -> None:
+        self._docs = {}
+        self._sorted = {}
+        self._cat_counts = Counter()
+
+    def _remove(self, key: str) -> None:
+        old = self._docs.pop(key, None)
+        if old is None:
+            return
+        category, record_id = key.split("/", 1)
+        self._cat_counts[category] -= 1
+        for field, value in old.items():
+            if value is None:
+                continue
+            entries = self._sorted.get((category, field), [])
+            i = bisect.bisect_left(entries, (value, record_id))
+            if i < len(entries) and entries[i] == (value, record_id):
+                del entries[i]
+
+    def _apply(self, key: str, values: Dict[str, Optional[str]]) -> None:
+        self._remove(key)
+        category, record_id = key.split("/", 1)
+        self._docs[key] = values
+        self._cat_counts[category] += 1
+        for field, value in values.items():
+            if value is not None:
+                bisect.insort(self._sorted.setdefault((category, field), []), (value, record_id))
+
+    def _load(self, snapshot: Optional[Path]) -> None:
+        if snapshot is None:
+            self._reset()
+            return
+        self._fill(json.loads(snapshot.read_text(encoding="utf-8")).items())
+
+    def _fill(self, docs: Iterable[Tuple[str, Dict[str, Optional[str]]]]) -> None:
+        # Bulk load: append everything, then sort each list once.
+        self._reset()
+        for key, values in docs:
+            self._docs[key] = values
+            category, record_id = key.split("/", 1)
+            self._cat_counts[category] += 1
+            for field, value in values.items():
+                if value is not None:
+                    self._sorted.setdefault((category, field), []).append((value, record_id))
+        for entries in self._sorted.values():
+            entries.sort()
+
+
+def _key(record: MemoryRecord) -> str:
+    return f"{record.category.value}/{record.id}"
+
+
+def _values(record: MemoryRecord) -> Dict[str, Optional[str]]:
+    return {field: get(record) for field, get in INDEXED_FIELDS.items()}
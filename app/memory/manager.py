@@ -1,16 +1,33 @@
 from __future__ import annotations
 
 import time
+import uuid
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from app.memory.models import (
     MemoryCategory,
+    MemoryRecord,
     ApprovalInfo,
 )
-from app.memory.store import MemoryStore, MemoryViolation
-from app.memory.proposals import MemoryProposal, MemoryProposalStatus
+from app.memory.store import MemoryViolation, _now_iso
+from app.memory.backends import open_memory_store
+from app.memory.proposals import (
+    BulkResult,
+    MemoryProposal,
+    MemoryProposalStatus,
+    ProposalSelector,
+)
 from app.memory.proposal_store import MemoryProposalStore
+from app.memory.field_index import FieldIndex, RecordFilter
+from app.memory.recall_index import RecallIndex
+from app.memory.search_index import SearchIndex
+from app.storage.ids import new_id
+from app.storage.journal import Journal
+
+
+# Journal kind of an approval (single or bulk).
+APPROVE_TX = "memory.approve"
 
 
 class MemoryManager:
@@ -23,10 +40,28 @@ class MemoryManager:
       - Read-only identity
     """
 
-    def __init__(self, repo_root: Path) -> None:
+    def __init__(self, repo_root: Path, backend: str | None = None) -> None:
         self.repo_root = repo_root
-        self.store = MemoryStore(repo_root)
+        self.store = open_memory_store(repo_root, backend)
         self.proposals = MemoryProposalStore(repo_root)
+        self.journal = Journal(repo_root / ".kimiko")
+        self.journal.register(APPROVE_TX, self._recover_approval)
+
+        index_dir = repo_root / ".kimiko" / "memory" / "index"
+        self.search_index = SearchIndex(index_dir)
+        self.store.indexes.append(self.search_index)
+        self.field_index: FieldIndex | None = None
+        if not self.store.native_field_queries:
+            self.field_index = FieldIndex(index_dir)
+            self.store.indexes.append(self.field_index)
+        # Similarity recall needs numpy; without it recall() uses search().
+        self.recall_index: RecallIndex | None = None
+        if RecallIndex.available():
+            self.recall_index = RecallIndex(repo_root / ".kimiko" / "memory" / "recall")
+            self.store.indexes.append(self.recall_index)
+
+        # Finish approvals a crashed process left half done.
+        self.journal.recover()
 
     # ---------- Proposals ----------
 
@@ -46,7 +81,7 @@ class MemoryManager:
             )
 
         proposal = MemoryProposal(
-            id=f"mem-{int(time.time())}",
+            id=new_id("mem"),
             category=category,
             content=content,
             reason=reason,
@@ -55,41 +90,187 @@ class MemoryManager:
         self.proposals.save(proposal)
         return proposal
 
-    def list_proposals(self) -> List[MemoryProposal]:
-        return self.proposals.list()
+    def list_proposals(
+        self,
+        status: MemoryProposalStatus | None = None,
+        after: str | None = None,
+        limit: int | None = None,
+    ) -> List[MemoryProposal]:
+        """
+        All proposals, or only those in `status`. Open statuses (PROPOSED,
+        APPROVED, FAILED) are answered from the status index. With `after`
+        or `limit`, pages through them in creation (id) order.
+        """
+        if status is not None and status not in self.proposals.ARCHIVED_STATUSES:
+            return self.proposals.list_by_status(status, after=after, limit=limit)
+        if after is None and limit is None:
+            items = self.proposals.iter()
+            return [p for p in items if status is None or p.status == status]
 
-    def approve(self, proposal_id: str, approved_by: str) -> MemoryProposal:
-        p = self.proposals.load(proposal_id)
-        p.status = MemoryProposalStatus.APPROVED
-        p.updated_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-        self.proposals.save(p)
+        out: List[MemoryProposal] = []
+        for pid in self.proposals.list_ids(after=after):
+            if limit is not None and len(out) >= limit:
+                break
+            try:
+                p = self.proposals.load(pid)
+            except (FileNotFoundError, ValueError, KeyError):
+                continue
+            if status is None or p.status == status:
+                out.append(p)
+        return out
 
-        approval = ApprovalInfo(
-            required=True,
-            approved_by=approved_by,
-            approved_at=p.updated_at,
-        )
+    def rebuild_proposal_index(self) -> int:
+        return self.proposals.rebuild_status_index()
 
-        # Persist into memory store
-        self.store.create(
-            category=p.category,
-            content=p.content,
-            source=p.source,
-            approval=approval,
-        )
+    def archive_proposals(self, before: str | None = None) -> List[str]:
+        return self.proposals.archive(before)
 
-        p.status = MemoryProposalStatus.APPLIED
-        self.proposals.save(p)
+    def approve(self, proposal_id: str, approved_by: str) -> MemoryProposal:
+        """
+        Store the proposal's record and mark it APPLIED, as one journaled
+        transaction. If the store refuses the record the proposal is marked
+        FAILED and the MemoryViolation is raised.
+        """
+        with self.proposals.lock:
+            p = self.proposals.load(proposal_id)
+            _, failed = self._approve_journaled([p], approved_by)
+        if failed:
+            raise MemoryViolation(failed[0][1])
         return p
 
     def reject(self, proposal_id: str, notes: str = "") -> MemoryProposal:
-        p = self.proposals.load(proposal_id)
-        p.status = MemoryProposalStatus.REJECTED
-        p.notes = notes
-        p.updated_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-        self.proposals.save(p)
+        with self.proposals.lock:
+            p = self.proposals.load(proposal_id)
+            p.status = MemoryProposalStatus.REJECTED
+            p.notes = notes
+            p.updated_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            self.proposals.save(p)
         return p
 
+    # ---------- Bulk decisions ----------
+
+    def approve_many(self, selector: ProposalSelector, approved_by: str) -> BulkResult:
+        """
+        Approve every pending proposal matching selector as one journaled
+        transaction: the records go to the store in one group commit and
+        the proposals are marked APPLIED together.
+
+        Proposals the store refuses are marked FAILED with the reason in
+        their notes; they, and ids that are missing or not pending, are
+        reported in the result without stopping the rest.
+        """
+        with self.proposals.lock:
+            result = BulkResult()
+            candidates = self._select_pending(selector, result)
+            if candidates:
+                done, failed = self._approve_journaled(candidates, approved_by)
+                result.done.extend(done)
+                result.failed.extend(failed)
+        return result
+
+    def reject_many(self, selector: ProposalSelector, notes: str = "") -> BulkResult:
+        """Reject every pending proposal matching selector in one batch."""
+        with self.proposals.lock:
+            result = BulkResult()
+            candidates = self._select_pending(selector, result)
+            now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            for p in candidates:
+                p.status = MemoryProposalStatus.REJECTED
+                p.notes = notes
+                p.updated_at = now
+            self.proposals.save_many(candidates)
+            result.done.extend(candidates)
+        return result
+
+    def _select_pending(self, selector: ProposalSelector, result: BulkResult) -> List[MemoryProposal]:
+        pending = [
+            p for p in self.proposals.list_by_status(MemoryProposalStatus.PROPOSED)
+            if selector.matches(p)
+        ]
+        if selector.ids is not None:
+            # Explicitly named ids that are not pending are failures, not silence.
+            found = {p.id for p in pending}
+            for pid in sorted(selector.ids - found):
+                try:
+                    status = self.proposals.load(pid).status.value
+                    result.failed.append((pid, f"not pending (status {status})"))
+                except FileNotFoundError:
+                    result.failed.append((pid, "not found"))
+        return pending
+
+    def _approve_journaled(
+        self, proposals: List[MemoryProposal], approved_by: str
+    ) -> Tuple[List[MemoryProposal], List[Tuple[str, str]]]:
+        # Caller holds self.proposals.lock. The journal entry fixes the
+        # record id and timestamps each proposal gets, so a replay writes
+        # exactly what the first attempt would have; proposals never
+        # target history, so plain uuids as in create(). Record stamps
+        # use the store's _now_iso() format, which indexes compare as
+        # text; the approval stamp keeps the proposals' format.
+        data = {
+            "approved_by": approved_by,
+            "approved_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "written_at": _now_iso(),
+            "items": {p.id: str(uuid.uuid4()) for p in proposals},
+        }
+        with self.journal.transaction(APPROVE_TX, data):
+            return self._apply_approvals(data, proposals)
+
+    def _apply_approvals(
+        self, data: dict, proposals: List[MemoryProposal]
+    ) -> Tuple[List[MemoryProposal], List[Tuple[str, str]]]:
+        # Idempotent: records already written are skipped by import_many,
+        # and callers only pass proposals not yet APPLIED.
+        approval = ApprovalInfo(
+            required=True,
+            approved_by=data["approved_by"],
+            approved_at=data["approved_at"],
+        )
+        # Journal entries from before written_at existed used approved_at.
+        written_at = data.get("written_at", data["approved_at"])
+        records = [
+            MemoryRecord(
+                id=data["items"][p.id],
+                category=p.category,
+                content=p.content,
+                source=p.source,
+                created_at=written_at,
+                updated_at=written_at,
+                approval=approval,
+            )
+            for p in proposals
+        ]
+        _, refused = self.store.import_many(records)
+        reasons = {r.id: reason for r, reason in refused}
+
+        done: List[MemoryProposal] = []
+        failed: List[Tuple[str, str]] = []
+        for p in proposals:
+            reason = reasons.get(data["items"][p.id])
+            if reason is None:
+                p.status = MemoryProposalStatus.APPLIED
+                done.append(p)
+            else:
+                p.status = MemoryProposalStatus.FAILED
+                p.notes = reason
+                failed.append((p.id, reason))
+            p.updated_at = data["approved_at"]
+        self.proposals.save_many(proposals)
+        return done, failed
+
+    def _recover_approval(self, data: dict, steps: List[str]) -> None:
+        with self.proposals.lock:
+            proposals = []
+            for pid in data.get("items", {}):
+                try:
+                    p = self.proposals.load(pid)
+                except FileNotFoundError:
+                    continue
+                if p.status in (MemoryProposalStatus.PROPOSED, MemoryProposalStatus.APPROVED):
+                    proposals.append(p)
+            if proposals:
+                self._apply_approvals(data, proposals)
+
     # ---------- Direct memory writes ----------
 
     def write_project(self, content: dict, source: str = "kimiko"):
@@ -106,7 +287,140 @@ class MemoryManager:
             source=source,
         )
 
+    def create_many(
+        self,
+        category: MemoryCategory,
+        contents: List[dict],
+        source: str = "kimiko",
+    ) -> List[MemoryRecord]:
+        # Same rules as single writes: only direct-write categories, no approval
+        return self.store.create_many(
+            category=category,
+            contents=contents,
+            source=source,
+            approval=None,
+        )
+
+    def import_records(
+        self, records: List[MemoryRecord]
+    ) -> Tuple[List[MemoryRecord], List[Tuple[MemoryRecord, str]]]:
+        # Restores keep ids/timestamps; category rules still apply per record.
+        return self.store.import_many(records)
+
+    def append_history_many(
+        self, contents: List[dict], source: str = "system"
+    ) -> List[MemoryRecord]:
+        return self.store.append_history_many(
+            contents=contents,
+            source=source,
+        )
+
     # ---------- Reads ----------
 
     def list_memory(self, category: MemoryCategory):
         return self.store.list(category)
+
+    def iter_memory(
+        self,
+        category: MemoryCategory,
+        after: str | None = None,
+        limit: int | None = None,
+    ) -> Iterator[MemoryRecord]:
+        return self.store.iter(category, after=after, limit=limit)
+
+    def history_range(
+        self,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int | None = None,
+    ) -> Iterator[MemoryRecord]:
+        return self.store.iter_range(
+            MemoryCategory.HISTORY, since=since, until=until, limit=limit
+        )
+
+    def query_memory(
+        self,
+        category: MemoryCategory,
+        filters: List[RecordFilter],
+        after: str | None = None,
+        limit: int | None = None,
+    ) -> List[MemoryRecord]:
+        return self.store.query(category, filters, after=after, limit=limit)
+
+    def seal_history(self, before: str) -> List[str]:
+        return self.store.seal_history(before)
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self.store.cache_stats()
+
+    def count_memory(self, category: MemoryCategory) -> int:
+        return self.store.count(category)
+
+    def last_approved_at(self) -> Optional[str]:
+        return self.store.last_approved_at()
+
+    def search(
+        self,
+        query: str,
+        category: MemoryCategory | None = None,
+        limit: int = 10,
+    ) -> List[Tuple[float, MemoryRecord]]:
+        # Records written without this manager (older versions, other
+        # tools) leave the index behind the store; rebuild it then.
+        if self._index_behind(self.search_index):
+            with self.store.lock:
+                if self._index_behind(self.search_index):
+                    self.search_index.rebuild(
+                        (r for c in MemoryCategory for r in self.store.iter(c)),
+                        self.store.generation(),
+                    )
+
+        hits = []
+        for score, cat, record_id in self.search_index.search(query, category, limit):
+            try:
+                hits.append((score, self.store.get(cat, record_id)))
+            except FileNotFoundError:
+                continue
+        return hits
+
+    def recall(
+        self,
+        text: str,
+        k: int = 5,
+        category: MemoryCategory | None = None,
+    ) -> List[Tuple[float, MemoryRecord]]:
+        """
+        The k records whose content is most similar to text (hashed
+        TF-IDF cosine), best first. Falls back to search() when numpy
+        is not installed.
+        """
+        if self.recall_index is None:
+            return self.search(text, category, k)
+
+        if self._index_behind(self.recall_index):
+            with self.store.lock:
+                if self._index_behind(self.recall_index):
+                    self.recall_index.rebuild(
+                        (r for c in MemoryCategory for r in self.store.iter(c)),
+                        self.store.generation(),
+                    )
+
+        hits = []
+        for score, cat, record_id in self.recall_index.search(text, k, category):
+            try:
+                hits.append((score, self.store.get(cat, record_id)))
+            except FileNotFoundError:
+                continue
+        return hits
+
+    def _index_behind(self, index) -> bool:
+        # Checked again under store.lock before rebuilding: a rebuild
+        # truncates the index's delta log, which must not race a writer.
+        # Every write through the store logs the generation it moved the
+        # store to, so any other generation means an unindexed write
+        # (in-place updates included). Backends without one fall back
+        # to comparing counts.
+        generation = self.store.generation()
+        if generation is None:
+            return any(index.count(c) != self.store.count(c) for c in MemoryCategory)
+        return not index.in_sync(generation)
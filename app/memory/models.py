@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+import json
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Dict, Optional
@@ -31,29 +32,112 @@ DIRECT_WRITE_ALLOWED = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class ApprovalInfo:
     required: bool
     approved_by: Optional[str] = None
     approved_at: Optional[str] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "required": self.required,
+            "approved_by": self.approved_by,
+            "approved_at": self.approved_at,
+        }
+
+
+class RawJSON:
+    """
+    Undecoded JSON text for a record's content, as read from storage.
+    Held until the content is first accessed, so paths that never look
+    at the payload (listing ids, counting, re-writing) never parse it.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str | bytes) -> None:
+        self.text = text
+
+    def decode(self) -> Any:
+        return json.loads(self.text)
+
+
+_FIELDS = ("id", "category", "content", "source", "created_at", "updated_at", "approval")
+
 
-@dataclass
 class MemoryRecord:
-    id: str
-    category: MemoryCategory
-    content: Dict[str, Any]
-    source: str  # "user" | "kimiko" | "system"
-    created_at: str = field(default_factory=_now_iso)
-    updated_at: str = field(default_factory=_now_iso)
-    approval: Optional[ApprovalInfo] = None
+    """
+    One stored memory. Slot-based (no per-instance __dict__); content may
+    be given as RawJSON and is decoded on first access.
+    """
+
+    __slots__ = ("id", "category", "_content", "source", "created_at", "updated_at", "approval")
+
+    def __init__(
+        self,
+        id: str,
+        category: MemoryCategory,
+        content: Dict[str, Any] | RawJSON,
+        source: str,  # "user" | "kimiko" | "system"
+        created_at: Optional[str] = None,
+        updated_at: Optional[str] = None,
+        approval: Optional[ApprovalInfo] = None,
+    ) -> None:
+        self.id = id
+        self.category = category
+        self._content = content
+        self.source = source
+        self.created_at = created_at or _now_iso()
+        self.updated_at = updated_at or _now_iso()
+        self.approval = approval
+
+    @property
+    def content(self) -> Dict[str, Any]:
+        content = self._content
+        if isinstance(content, RawJSON):
+            content = self._content = content.decode()
+        return content
+
+    @content.setter
+    def content(self, value: Dict[str, Any]) -> None:
+        self._content = value
+
+    def content_json(self) -> str:
+        """Content as JSON text, without a decode/encode round trip when still raw."""
+        content = self._content
+        if isinstance(content, RawJSON):
+            text = content.text
+            return text.decode("utf-8") if isinstance(text, bytes) else text
+        return json.dumps(content)
+
+    def copy(self) -> "MemoryRecord":
+        """Shallow copy (content is shared, as with dataclasses.replace)."""
+        return MemoryRecord(
+            self.id, self.category, self._content, self.source,
+            self.created_at, self.updated_at, self.approval,
+        )
 
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
-        d["category"] = self.category.value
-        if self.approval:
-            d["approval"] = asdict(self.approval)
-        return d
+        return {
+            "id": self.id,
+            "category": self.category.value,
+            "content": self.content,
+            "source": self.source,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "approval": self.approval.to_dict() if self.approval else None,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MemoryRecord):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in _FIELDS)
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{f}={getattr(self, f)!r}" for f in _FIELDS)
+        return f"MemoryRecord({fields})"
 
     @staticmethod
     def requires_approval(category: MemoryCategory) -> bool:
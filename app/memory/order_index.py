@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+STAMP_WIDTH = 32
+ID_WIDTH = 46
+# "<created_at padded> <id padded>\n"
+LINE_WIDTH = STAMP_WIDTH + 1 + ID_WIDTH + 1
+
+# (created_at, record id)
+OrderKey = Tuple[str, str]
+
+
+def make_cursor(created_at: str, record_id: str) -> str:
+    return f"{created_at},{record_id}"
+
+
+def parse_cursor(cursor: str) -> OrderKey:
+    created_at, sep, record_id = cursor.rpartition(",")
+    if not sep or not created_at:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return created_at, record_id
+
+
+def _encode(key: OrderKey) -> bytes:
+    created_at, record_id = key
+    if len(created_at) > STAMP_WIDTH or len(record_id) > ID_WIDTH:
+        raise ValueError(f"Order key too wide: {key}")
+    return f"{created_at:<{STAMP_WIDTH}} {record_id:<{ID_WIDTH}}\n".encode("ascii")
+
+
+def _decode(line: bytes) -> OrderKey:
+    text = line.decode("ascii")
+    return text[:STAMP_WIDTH].rstrip(), text[STAMP_WIDTH + 1:-1].rstrip()
+
+
+class OrderIndex:
+    """
+    Fixed-width, sorted (created_at, id) index in a single file.
+
+    Every line has the same length, so the n-th key lives at n * LINE_WIDTH
+    and a cursor lookup is a binary search over file offsets. Keys are
+    compared on their padded form, which sorts the same way as the
+    ISO-8601 timestamps they hold.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def __len__(self) -> int:
+        try:
+            return self.path.stat().st_size // LINE_WIDTH
+        except FileNotFoundError:
+            return 0
+
+    def append(self, key: OrderKey) -> None:
+        self.extend([key])
+
+    def extend(self, keys: Iterable[OrderKey]) -> None:
+        new = sorted(_encode(k) for k in keys)
+        if not new:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size >= LINE_WIDTH:
+                f.seek(size - LINE_WIDTH)
+                last = f.read(LINE_WIDTH)
+                if new[0] < last:
+                    # Out-of-order write (clock skew, concurrent writers):
+                    # rare, so restore order with a full rewrite.
+                    f.seek(0)
+                    lines = [f.read(LINE_WIDTH) for _ in range(size // LINE_WIDTH)]
+                    lines.extend(new)
+                    lines.sort()
+                    f.seek(0)
+                    f.truncate()
+                    f.write(b"".join(lines))
+                    return
+            f.write(b"".join(new))
+
+    def rebuild(self, keys: Iterable[OrderKey]) -> None:
+        data = b"".join(sorted(_encode(k) for k in keys))
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(data)
+        os.replace(tmp, self.path)
+
+    def iter_from(
+        self,
+        after: Optional[OrderKey] = None,
+        before: Optional[OrderKey] = None,
+    ) -> Iterator[OrderKey]:
+        """
+        Yield keys strictly greater than `after` (and strictly less than
+        `before`, when given) in ascending order.
+        """
+        n = len(self)
+        if not n:
+            return
+        with self.path.open("rb") as f:
+            start = 0
+            if after is not None:
+                start = self._bisect(f, n, _encode(after))
+            stop = _encode(before) if before is not None else None
+            f.seek(start * LINE_WIDTH)
+            for _ in range(start, n):
+                line = f.read(LINE_WIDTH)
+                if len(line) < LINE_WIDTH:
+                    return
+                if stop is not None and line >= stop:
+                    return
+                yield _decode(line)
+
+    def _bisect(self, f, n: int, probe: bytes) -> int:
+        # First position whose line sorts after probe.
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            f.seek(mid * LINE_WIDTH)
+            if f.read(LINE_WIDTH) <= probe:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
@@ -1,47 +1,251 @@
 from __future__ import annotations
 
+import bisect
 import json
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional
 
-from app.memory.proposals import MemoryProposal
+from app.memory.proposals import MemoryProposal, MemoryProposalStatus
+from app.storage.archive import PackArchive
+from app.storage.atomic import atomic_write_text, file_version
+from app.storage.ids import id_sort_key
+from app.storage.locking import dir_lock
+from app.storage.sharding import find_path, layout_files, layout_path, read_layout
 
 
 class MemoryProposalStore:
     """
     File-based store for memory proposals.
     Stored under .kimiko/memory/proposals/<id>.json
+    (or proposals/ab/cd/<id>.json once resharded).
+
+    Files are replaced atomically; `lock` serializes writers across
+    processes and is held by callers doing load-modify-save.
+
+    Applied and rejected proposals can be moved to the compressed archive
+    under proposals/archive/ (see archive()); load, list and iter read
+    through it, list_active/iter_active skip it.
+
+    proposals/status.idx maps every proposal not yet in a final state to
+    its status, so pending lookups open only the pending proposals. save()
+    writes an open proposal's index entry before its file, and drops a
+    final one's after, so the index never misses an open proposal; stale
+    entries left by a crash are filtered out on load (or rebuilt with
+    rebuild_status_index()).
     """
 
+    # Final states: the proposal's record has been written, or never will
+    # be. APPROVED is left hot, since the write may not have happened yet.
+    ARCHIVED_STATUSES = (MemoryProposalStatus.APPLIED, MemoryProposalStatus.REJECTED)
+
     def __init__(self, repo_root: Path) -> None:
         self.base_dir = repo_root / ".kimiko" / "memory" / "proposals"
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.lock = dir_lock(self.base_dir)
+        self.archive_store = PackArchive(self.base_dir / "archive")
+        self.status_path = self.base_dir / "status.idx"
+        # ((mtime_ns, inode), id -> status) of the last status.idx read
+        self._status_cache: Optional[tuple] = None
 
     def _path(self, proposal_id: str) -> Path:
-        return self.base_dir / f"{proposal_id}.json"
+        path = layout_path(self.base_dir, proposal_id, read_layout(self.base_dir))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _find(self, proposal_id: str) -> Path:
+        return find_path(self.base_dir, proposal_id, read_layout(self.base_dir))
 
     def save(self, proposal: MemoryProposal) -> None:
-        self._path(proposal.id).write_text(
-            json.dumps(proposal.to_dict(), indent=2),
-            encoding="utf-8",
-        )
+        self.save_many([proposal])
+
+    def save_many(self, proposals: List[MemoryProposal]) -> None:
+        """
+        Write proposals, updating the status index once before the files
+        (entries for open proposals) and once after (final ones dropped).
+        """
+        with self.lock:
+            opened = [p for p in proposals if p.status not in self.ARCHIVED_STATUSES]
+            if opened:
+                self._set_statuses({p.id: p.status for p in opened})
+            for proposal in proposals:
+                path = self._path(proposal.id)
+                existing = self._find(proposal.id)
+                atomic_write_text(path, json.dumps(proposal.to_dict(), indent=2))
+                if existing != path:
+                    existing.unlink(missing_ok=True)
+            closed = [p for p in proposals if p.status in self.ARCHIVED_STATUSES]
+            if closed:
+                self._set_statuses({p.id: None for p in closed})
 
     def load(self, proposal_id: str) -> MemoryProposal:
-        path = self._path(proposal_id)
-        if not path.exists():
+        path = self._find(proposal_id)
+        if path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+        elif proposal_id in self.archive_store:
+            data = self.archive_store.load(proposal_id)
+        else:
             raise FileNotFoundError(f"Memory proposal not found: {proposal_id}")
-        data = json.loads(path.read_text(encoding="utf-8"))
         return MemoryProposal.from_dict(data)
 
+    def exists(self, proposal_id: str) -> bool:
+        return self._find(proposal_id).exists() or proposal_id in self.archive_store
+
+    def list_ids(self, after: Optional[str] = None, limit: Optional[int] = None) -> List[str]:
+        """
+        Ids of every proposal, archived ones included, in creation order
+        (id_sort_key), only those past `after` when given; pages like
+        ProposalStore.list_ids.
+        """
+        hot = (p.stem for p in layout_files(self.base_dir, read_layout(self.base_dir)))
+        ids = sorted(set(hot) | set(self.archive_store.keys()), key=id_sort_key)
+        return _page(ids, after, limit)
+
+    def iter(self) -> Iterator[MemoryProposal]:
+        """Proposals one at a time, archived ones last; unreadable ones are skipped."""
+        hot = set()
+        for p in self.iter_active():
+            hot.add(p.id)
+            yield p
+        for pid, blob in self.archive_store.items():
+            if pid in hot:
+                continue  # a loose copy shadows the archived one
+            try:
+                yield MemoryProposal.from_dict(json.loads(blob))
+            except Exception:
+                continue
+
     def list(self) -> List[MemoryProposal]:
-        proposals: List[MemoryProposal] = []
-        for p in self.base_dir.glob("*.json"):
+        return list(self.iter())
+
+    def iter_active(self) -> Iterator[MemoryProposal]:
+        """Only proposals still on disk as loose files; never opens the archive."""
+        for p in layout_files(self.base_dir, read_layout(self.base_dir)):
             try:
-                proposals.append(
-                    MemoryProposal.from_dict(
-                        json.loads(p.read_text(encoding="utf-8"))
-                    )
-                )
+                yield MemoryProposal.from_dict(json.loads(p.read_text(encoding="utf-8")))
             except Exception:
                 continue
-        return proposals
+
+    def list_active(self) -> List[MemoryProposal]:
+        return list(self.iter_active())
+
+    # ---------- Status index ----------
+
+    def open_statuses(self) -> Dict[str, str]:
+        """id -> status of every proposal not in a final state, from the index."""
+        return dict(self._statuses())
+
+    def list_by_status(
+        self,
+        status: MemoryProposalStatus,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[MemoryProposal]:
+        """
+        Proposals currently in `status`, which must not be a final one, in
+        creation order and paged like list_ids(). Only the proposals the
+        index lists under it are opened.
+        """
+        if status in self.ARCHIVED_STATUSES:
+            raise ValueError(f"{status.value} proposals are not indexed")
+        ids = sorted(
+            (pid for pid, indexed in self._statuses().items() if indexed == status.value),
+            key=id_sort_key,
+        )
+        out = []
+        for pid in _page(ids, after, None):
+            if limit is not None and len(out) >= limit:
+                break
+            try:
+                p = self.load(pid)
+            except (FileNotFoundError, ValueError, KeyError):
+                continue
+            if p.status == status:
+                out.append(p)
+        return out
+
+    def rebuild_status_index(self) -> int:
+        """Rewrite status.idx from the proposal files; returns the open count."""
+        with self.lock:
+            statuses = {
+                p.id: p.status.value
+                for p in self.iter_active()
+                if p.status not in self.ARCHIVED_STATUSES
+            }
+            self._write_statuses(statuses)
+        return len(statuses)
+
+    def generation(self) -> tuple:
+        """
+        A token that changes whenever the set of open proposals may have:
+        save() replaces status.idx on every status change, and files added
+        or removed by hand move the directory mtime.
+        """
+        try:
+            index = file_version(self.status_path)
+        except FileNotFoundError:
+            index = None
+        return (index, self.base_dir.stat().st_mtime_ns)
+
+    # ---------- Archive ----------
+
+    def archive(self, before: Optional[str] = None) -> List[str]:
+        """
+        Move applied/rejected proposals last updated before `before` (an
+        ISO-8601 prefix; all of them when None) into a new archive pack,
+        then remove their loose files. Safe to re-run after an interruption.
+        Returns the archived ids.
+        """
+        with self.lock:
+            items = []
+            for p in self.iter_active():
+                if p.status not in self.ARCHIVED_STATUSES:
+                    continue
+                if before is not None and p.updated_at >= before:
+                    continue
+                items.append((p.id, json.dumps(p.to_dict()).encode("utf-8")))
+            self.archive_store.add(items)
+            for pid, _ in items:
+                self._find(pid).unlink(missing_ok=True)
+        return sorted(pid for pid, _ in items)
+
+    # ---------- Internals ----------
+
+    def _statuses(self) -> Dict[str, str]:
+        try:
+            version = file_version(self.status_path)
+        except FileNotFoundError:
+            # A tree from before the index existed.
+            self.rebuild_status_index()
+            version = file_version(self.status_path)
+        if self._status_cache is not None and self._status_cache[0] == version:
+            return self._status_cache[1]
+        try:
+            statuses = json.loads(self.status_path.read_text(encoding="utf-8"))["open"]
+        except (ValueError, KeyError, TypeError):
+            self.rebuild_status_index()
+            return self._statuses()
+        self._status_cache = (version, statuses)
+        return statuses
+
+    def _set_statuses(self, changes: Dict[str, Optional[MemoryProposalStatus]]) -> None:
+        # Caller holds self.lock. None drops the entry.
+        statuses = self._statuses()
+        updated = dict(statuses)
+        for proposal_id, status in changes.items():
+            if status is None:
+                updated.pop(proposal_id, None)
+            else:
+                updated[proposal_id] = status.value
+        if updated != statuses:
+            self._write_statuses(updated)
+
+    def _write_statuses(self, statuses: Dict[str, str]) -> None:
+        atomic_write_text(self.status_path, json.dumps({"version": 1, "open": statuses}))
+        self._status_cache = (file_version(self.status_path), statuses)
+
+
+def _page(ids: List[str], after: Optional[str], limit: Optional[int]) -> List[str]:
+    # ids are sorted by id_sort_key.
+    if after is not None:
+        ids = ids[bisect.bisect_right(ids, id_sort_key(after), key=id_sort_key):]
+    return ids[:limit] if limit is not None else ids
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+import re
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from app.memory.models import MemoryCategory
 
@@ -20,7 +21,7 @@ class MemoryProposalStatus(str, Enum):
     FAILED = "FAILED"
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryProposal:
     id: str
     category: MemoryCategory
@@ -33,10 +34,18 @@ class MemoryProposal:
     notes: str = ""
 
     def to_dict(self) -> Dict:
-        d = asdict(self)
-        d["category"] = self.category.value
-        d["status"] = self.status.value
-        return d
+        # Field by field rather than asdict(), which deep-copies content.
+        return {
+            "id": self.id,
+            "category": self.category.value,
+            "content": self.content,
+            "reason": self.reason,
+            "source": self.source,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "notes": self.notes,
+        }
 
     @staticmethod
     def from_dict(d: Dict) -> "MemoryProposal":
@@ -51,3 +60,33 @@ class MemoryProposal:
             updated_at=d["updated_at"],
             notes=d.get("notes", ""),
         )
+
+
+@dataclass(frozen=True)
+class ProposalSelector:
+    """
+    Which proposals a bulk approve/reject acts on. Every given condition
+    must hold; `reason` is a regular expression searched in the reason.
+    """
+
+    ids: Optional[FrozenSet[str]] = None
+    category: Optional[MemoryCategory] = None
+    source: Optional[str] = None
+    reason: Optional[str] = None
+
+    def matches(self, proposal: MemoryProposal) -> bool:
+        if self.ids is not None and proposal.id not in self.ids:
+            return False
+        if self.category is not None and proposal.category != self.category:
+            return False
+        if self.source is not None and proposal.source != self.source:
+            return False
+        if self.reason is not None and not re.search(self.reason, proposal.reason):
+            return False
+        return True
+
+
+@dataclass
+class BulkResult:
+    done: List[MemoryProposal] = field(default_factory=list)
+    failed: List[Tuple[str, str]] = field(default_factory=list)  # (proposal id, reason)
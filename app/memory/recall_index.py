@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import zlib
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.memory.models import MemoryCategory, MemoryRecord
+from app.memory.search_index import _strings, tokenize
+from app.storage.atomic import atomic_write_text
+from app.storage.delta_log import DeltaLog
+
+try:
+    import numpy as np
+except ImportError:  # optional: MemoryManager.recall falls back to BM25 search
+    np = None
+
+
+# Hashed feature space (word unigrams and bigrams).
+DIM = 1 << 18
+
+MIN_DELTA_BEFORE_COMPACT = 1000
+
+CATEGORIES = list(MemoryCategory)
+
+# feature -> weight
+Vector = Dict[int, float]
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature(token: str) -> int:
+    return zlib.crc32(token.encode("utf-8")) & (DIM - 1)
+
+
+def content_vector(content) -> Vector:
+    """Unit-length sublinear-tf vector of the hashed features of content."""
+    counts: Counter = Counter()
+    for s in _strings(content):
+        tokens = tokenize(s)
+        counts.update(_feature(t) for t in tokens)
+        counts.update(_feature(f"{a} {b}") for a, b in zip(tokens, tokens[1:]))
+    weights = {f: 1.0 + math.log(n) for f, n in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+    return {f: w / norm for f, w in weights.items()}
+
+
+class RecallIndex:
+    """
+    Hashed TF-IDF similarity index over MemoryRecord.content, kept as
+    NumPy arrays under .kimiko/memory/recall/:
+
+      meta.json                  generation, document keys and categories
+      postings-<gen>.npz         feature-major postings: ptr, docs, weights
+      delta.log                  one JSON line per document written since
+
+    Documents store unit tf vectors; idf is applied to the query from
+    live document frequencies, so adding documents never rewrites old
+    ones. A query gathers the posting slices of its features and adds
+    them into one score array, then takes the top k with argpartition.
+
+    Rewritten documents shadow their old row until the next compaction,
+    which folds the delta log into a new generation of arrays.
+    """
+
+    def __init__(self, index_dir: Path) -> None:
+        if np is None:
+            raise RuntimeError("RecallIndex requires numpy")
+        self.index_dir = index_dir
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.meta_path = self.index_dir / "meta.json"
+        self.delta_path = self.index_dir / "delta.log"
+        self._reset()
+        self._log = DeltaLog(
+            self.meta_path,
+            self.delta_path,
+            self._load,
+            lambda entry: self._apply_delta(entry["k"], {f: w for f, w in entry["f"]}),
+        )
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    # ---------- Maintenance ----------
+
+    def records_written(self, records: List[MemoryRecord], moved: Optional[tuple] = None) -> None:
+        self._log.append([
+            {
+                "k": f"{r.category.value}/{r.id}",
+                "f": [[f, round(w, 6)] for f, w in content_vector(r.content).items()],
+            }
+            for r in records
+        ], moved)
+        if len(self._delta) >= max(MIN_DELTA_BEFORE_COMPACT, len(self._keys) // 4):
+            self.compact()
+
+    def rebuild(
+        self, records: Iterable[MemoryRecord], generation: Optional[tuple] = None
+    ) -> None:
+        """Index records from scratch, as of store generation `generation`."""
+        self._reset()
+        for r in records:
+            self._apply_delta(f"{r.category.value}/{r.id}", content_vector(r.content))
+        # Not compact(): its refresh would reload the old index from disk.
+        self._write_generation(generation)
+
+    def compact(self) -> None:
+        """Fold the delta into a fresh generation of arrays."""
+        self._log.refresh()
+        self._write_generation()
+
+    def _write_generation(self, store_generation: Optional[tuple] = None) -> None:
+        n_base = len(self._keys)
+        live = ~self._dead[:n_base]
+
+        # Expand the base postings to (feature, doc, weight) triples,
+        # keep live rows, renumber them, and append the delta documents.
+        feats = np.repeat(np.arange(DIM, dtype=np.int32), np.diff(self._ptr))
+        docs = self._docs
+        weights = self._weights
+        keep = live[docs]
+        feats, docs, weights = feats[keep], docs[keep], weights[keep]
+        remap = np.cumsum(live, dtype=np.int64) - 1
+        docs = remap[docs].astype(np.int32)
+
+        keys = [k for k, alive in zip(self._keys, live) if alive]
+        cats = list(self._cats[:n_base][live])
+        extra_f, extra_d, extra_w = [], [], []
+        for key, vec in self._delta.items():
+            doc = len(keys)
+            keys.append(key)
+            cats.append(_cat_code(key))
+            extra_f.extend(vec.keys())
+            extra_d.extend([doc] * len(vec))
+            extra_w.extend(vec.values())
+        feats = np.concatenate([feats, np.asarray(extra_f, dtype=np.int32)])
+        docs = np.concatenate([docs, np.asarray(extra_d, dtype=np.int32)])
+        weights = np.concatenate([weights, np.asarray(extra_w, dtype=np.float32)])
+
+        order = np.argsort(feats, kind="stable")
+        ptr = np.zeros(DIM + 1, dtype=np.int64)
+        np.cumsum(np.bincount(feats, minlength=DIM), out=ptr[1:])
+
+        gen = self._gen + 1
+        postings = self.index_dir / f"postings-{gen}.npz"
+        tmp = self.index_dir / f".postings-{gen}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, ptr=ptr, docs=docs[order], weights=weights[order])
+        os.replace(tmp, postings)
+        atomic_write_text(
+            self.meta_path,
+            json.dumps({"gen": gen, "keys": keys, "cats": [int(c) for c in cats]}),
+        )
+        self._log.truncate(store_generation)
+        for old in self.index_dir.glob("postings-*.npz"):
+            if old != postings:
+                old.unlink(missing_ok=True)
+        self._log.reload()
+
+    # ---------- Queries ----------
+
+    def in_sync(self, generation: Optional[tuple]) -> bool:
+        """Whether the index reflects the store as of `generation`."""
+        return self._log.covers(generation)
+
+    def count(self, category: MemoryCategory) -> int:
+        self._log.refresh()
+        return self._cat_counts[category.value]
+
+    def search(
+        self,
+        text: str,
+        k: int = 5,
+        category: MemoryCategory | None = None,
+    ) -> List[Tuple[float, MemoryCategory, str]]:
+        """Top-k (cosine score, category, record id), best first."""
+        self._log.refresh()
+        query = content_vector(text)
+        if not query:
+            return []
+
+        n_docs = max(self._n_live, 1)
+        n_base = len(self._keys)
+        scores = np.zeros(n_base, dtype=np.float32)
+        q: Vector = {}
+        for f, w in query.items():
+            idf = math.log((n_docs + 1) / (self._df.get(f, 0) + self._base_df[f] + 1)) + 1.0
+            q[f] = w * idf
+            start, stop = self._ptr[f], self._ptr[f + 1]
+            if stop > start:
+                scores[self._docs[start:stop]] += q[f] * self._weights[start:stop]
+        q_norm = math.sqrt(sum(w * w for w in q.values())) or 1.0
+
+        mask = self._dead[:n_base].copy()
+        if category is not None:
+            mask |= self._cats[:n_base] != CATEGORIES.index(category)
+        scores[mask] = 0.0
+
+        hits: List[Tuple[float, str]] = []
+        top = min(k, n_base)
+        if top:
+            idx = np.argpartition(-scores, top - 1)[:top]
+            hits.extend((float(scores[i]) / q_norm, self._keys[i]) for i in idx if scores[i] > 0)
+        delta_scores: Counter = Counter()
+        for f, w in q.items():
+            for key, dw in self._delta_post.get(f, {}).items():
+                delta_scores[key] += w * dw
+        for key, score in delta_scores.items():
+            if category is not None and not key.startswith(f"{category.value}/"):
+                continue
+            hits.append((score / q_norm, key))
+
+        hits.sort(key=lambda h: (-h[0], h[1]))
+        out = []
+        for score, key in hits[:k]:
+            cat, record_id = key.split("/", 1)
+            out.append((score, MemoryCategory(cat), record_id))
+        return out
+
+    # ---------- Internals ----------
+
+    def _reset(self) -> None:
+        self._gen = 0
+        self._keys: List[str] = []
+        self._row: Dict[str, int] = {}
+        self._cats = np.zeros(0, dtype=np.int8)
+        self._ptr = np.zeros(DIM + 1, dtype=np.int64)
+        self._docs = np.zeros(0, dtype=np.int32)
+        self._weights = np.zeros(0, dtype=np.float32)
+        self._base_df = np.zeros(DIM, dtype=np.int64)
+        self._dead = np.zeros(0, dtype=bool)
+        self._delta: Dict[str, Vector] = {}
+        # feature -> {doc key: weight}, the delta documents inverted
+        self._delta_post: Dict[int, Dict[str, float]] = {}
+        self._df: Counter = Counter()  # document frequency of delta documents
+        self._cat_counts: Counter = Counter()
+        self._n_live = 0
+
+    def _apply_delta(self, key: str, vec: Vector) -> None:
+        old = self._delta.pop(key, None)
+        if old is not None:
+            self._df.subtract(old.keys())
+            for f in old:
+                self._delta_post[f].pop(key, None)
+        else:
+            row = self._row.get(key)
+            if row is not None and not self._dead[row]:
+                # Shadow the base row; its df is corrected at compaction.
+                self._dead[row] = True
+            else:
+                self._n_live += 1
+                self._cat_counts[key.split("/", 1)[0]] += 1
+        self._delta[key] = vec
+        self._df.update(vec.keys())
+        for f, w in vec.items():
+            self._delta_post.setdefault(f, {})[key] = w
+
+    def _load_generation(self):
+        # Another process may compact between reading meta.json and
+        # opening the arrays it names; re-read meta and try again.
+        for _ in range(5):
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+            try:
+                with np.load(self.index_dir / f"postings-{meta['gen']}.npz") as npz:
+                    return meta, {name: npz[name] for name in ("ptr", "docs", "weights")}
+            except FileNotFoundError:
+                continue
+        raise RuntimeError(f"Recall index keeps changing under {self.index_dir}")
+
+    def _load(self, meta_path: Optional[Path]) -> None:
+        self._reset()
+        if meta_path is None:
+            return
+        meta, data = self._load_generation()
+        self._ptr = data["ptr"]
+        self._docs = data["docs"]
+        self._weights = data["weights"]
+        self._gen = meta["gen"]
+        self._keys = meta["keys"]
+        self._row = {k: i for i, k in enumerate(self._keys)}
+        self._cats = np.asarray(meta["cats"], dtype=np.int8)
+        self._dead = np.zeros(len(self._keys), dtype=bool)
+        self._base_df = np.diff(self._ptr)
+        self._n_live = len(self._keys)
+        for c, n in zip(*np.unique(self._cats, return_counts=True)):
+            self._cat_counts[CATEGORIES[c].value] = int(n)
+
+
+def _cat_code(key: str) -> int:
+    return CATEGORIES.index(MemoryCategory(key.split("/", 1)[0]))
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Dict
+
+from app.memory.models import MemoryCategory
+from app.storage.sharding import reshard
+
+
+def reshard_memory(repo_root: Path) -> Dict[str, int]:
+    """
+    Move an existing .kimiko/memory tree to the sharded layout, in place.
+
+    Safe while other Kimiko processes are running: each directory is
+    flagged sharded before any file moves, readers fall back to the flat
+    location, and re-running only moves what is left. History is skipped;
+    it is already partitioned by hour.
+
+    Returns files moved per directory.
+    """
+    memory_dir = repo_root / ".kimiko" / "memory"
+    moved: Dict[str, int] = {}
+    for category in MemoryCategory:
+        if category == MemoryCategory.HISTORY:
+            continue
+        moved[category.value] = reshard(memory_dir / category.value)
+    moved["proposals"] = reshard(memory_dir / "proposals")
+    return moved
+
+
+def main(argv: list[str]) -> int:
+    repo_root = Path(argv[0]) if argv else Path(__file__).resolve().parents[2]
+    for name, count in reshard_memory(repo_root).items():
+        print(f"{name}: moved {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
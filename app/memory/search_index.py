@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.memory.models import MemoryCategory, MemoryRecord
+from app.storage.atomic import atomic_write_text
+from app.storage.delta_log import DeltaLog
+
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Fold the delta log into a fresh snapshot once it grows past this
+# many entries (or a quarter of the indexed documents, if larger).
+MIN_DELTA_BEFORE_SNAPSHOT = 1000
+
+
+def _strings(value) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _strings(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            yield from _strings(v)
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def content_terms(content) -> Dict[str, int]:
+    counts: Counter = Counter()
+    for s in _strings(content):
+        counts.update(tokenize(s))
+    return dict(counts)
+
+
+class SearchIndex:
+    """
+    On-disk inverted index over the string values of MemoryRecord.content.
+
+    Layout under .kimiko/memory/index/:
+      postings.json   token -> {doc key: term frequency} snapshot
+      delta.log       one JSON line per document written since the snapshot
+
+    The index is held in memory once loaded, so lookups only touch the
+    posting lists of the query terms. Changes made by other processes
+    are picked up by replaying the part of delta.log not yet seen (see
+    DeltaLog).
+    """
+
+    def __init__(self, index_dir: Path) -> None:
+        self.index_dir = index_dir
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshot_path = self.index_dir / "postings.json"
+        self.delta_path = self.index_dir / "delta.log"
+
+        self._postings: Dict[str, Dict[str, int]] = {}
+        # doc key -> (category, document length, distinct terms)
+        self._docs: Dict[str, Tuple[str, int, List[str]]] = {}
+        self._total_len = 0
+        self._cat_counts: Counter = Counter()
+        self._log = DeltaLog(self.snapshot_path, self.delta_path, self._load, self._apply_entry)
+
+    # ---------- Maintenance ----------
+
+    def records_written(self, records: List[MemoryRecord], moved: Optional[tuple] = None) -> None:
+        self._log.append([
+            {
+                "k": f"{record.category.value}/{record.id}",
+                "c": record.category.value,
+                "t": content_terms(record.content),
+            }
+            for record in records
+        ], moved)
+        if self._log.entries >= max(MIN_DELTA_BEFORE_SNAPSHOT, len(self._docs) // 4):
+            self.save_snapshot()
+
+    def rebuild(
+        self, records: Iterable[MemoryRecord], generation: Optional[tuple] = None
+    ) -> None:
+        """Index records from scratch, as of store generation `generation`."""
+        self._reset()
+        for record in records:
+            self._apply(
+                f"{record.category.value}/{record.id}",
+                record.category.value,
+                content_terms(record.content),
+            )
+        self.save_snapshot(generation)
+
+    def save_snapshot(self, generation: Optional[tuple] = None) -> None:
+        data = {
+            "docs": {k: list(v) for k, v in self._docs.items()},
+            "postings": self._postings,
+        }
+        atomic_write_text(self.snapshot_path, json.dumps(data, separators=(",", ":")))
+        self._log.truncate(generation)
+
+    # ---------- Queries ----------
+
+    def in_sync(self, generation: Optional[tuple]) -> bool:
+        """Whether the index reflects the store as of `generation`."""
+        return self._log.covers(generation)
+
+    def count(self, category: MemoryCategory) -> int:
+        self._log.refresh()
+        return self._cat_counts[category.value]
+
+    def search(
+        self,
+        query: str,
+        category: MemoryCategory | None = None,
+        limit: int = 10,
+    ) -> List[Tuple[float, MemoryCategory, str]]:
+        """
+        BM25-ranked hits as (score, category, record id), best first.
+
+        Terms are scored rarest first (MaxScore): a term adds at most
+        idf * (K1 + 1) to any document, so once the limit-th best score
+        beats what the remaining terms could add together, no document
+        they alone match can make the cut. From then on, the remaining
+        (common) terms only rescore the documents already found, looking
+        each up in the posting list instead of walking it. The cost is
+        the posting lists of the rare terms plus, per common term, the
+        smaller of its posting list and the candidate set.
+        """
+        self._log.refresh()
+        n_docs = len(self._docs)
+        if not n_docs or limit <= 0:
+            return []
+        avg_len = self._total_len / n_docs or 1.0
+
+        terms = []
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings:
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                terms.append((idf, term, postings))
+        terms.sort(key=lambda t: -t[0])
+        remaining = sum(idf * (K1 + 1) for idf, _, _ in terms)
+
+        scores: Dict[str, float] = {}
+        closed = False  # no new documents can reach the top `limit`
+        for idf, term, postings in terms:
+            if not closed and len(scores) >= limit:
+                threshold = heapq.nlargest(limit, scores.values())[-1]
+                closed = threshold > remaining
+            remaining -= idf * (K1 + 1)
+
+            if closed and len(scores) < len(postings):
+                matched = [(key, postings[key]) for key in scores if key in postings]
+            else:
+                matched = postings.items()
+            for key, tf in matched:
+                doc = self._docs[key]
+                if category is not None and doc[0] != category.value:
+                    continue
+                if closed and key not in scores:
+                    continue
+                norm = tf * (K1 + 1) / (tf + K1 * (1 - B + B * doc[1] / avg_len))
+                scores[key] = scores.get(key, 0.0) + idf * norm
+
+        hits = [
+            (score, MemoryCategory(self._docs[key][0]), key.split("/", 1)[1])
+            for key, score in scores.items()
+        ]
+        hits.sort(key=lambda h: (-h[0], h[2]))
+        return hits[:limit]
+
+    # ---------- Internals ----------
+
+    def _reset(self) -> None:
+        self._postings = {}
+        self._docs = {}
+        self._total_len = 0
+        self._cat_counts = Counter()
+
+    def _apply(self, key: str, category: str, terms: Dict[str, int]) -> None:
+        old = self._docs.pop(key, None)
+        if old is not None:
+            self._total_len -= old[1]
+            self._cat_counts[old[0]] -= 1
+            for term in old[2]:
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(key, None)
+                    if not postings:
+                        del self._postings[term]
+
+        length = sum(terms.values())
+        self._docs[key] = (category, length, list(terms))
+        self._total_len += length
+        self._cat_counts[category] += 1
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[key] = tf
+
+    def _load(self, snapshot: Optional[Path]) -> None:
+        self._reset()
+        if snapshot is None:
+            return
+        data = json.loads(snapshot.read_text(encoding="utf-8"))
+        self._postings = data["postings"]
+        for key, (cat, length, terms) in data["docs"].items():
+            self._docs[key] = (cat, length, terms)
+            self._total_len += length
+            self._cat_counts[cat] += 1
+
+    def _apply_entry(self, entry: dict) -> None:
+        self._apply(entry["k"], entry["c"], entry["t"])
@@ -0,0 +1,440 @@
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.memory.models import MemoryCategory, MemoryRecord
+from app.memory.order_index import OrderKey, parse_cursor
+from app.memory.store import BaseMemoryStore, _check_order
+from app.storage.atomic import sync_written
+from app.storage.locking import dir_lock
+
+
+# Active segments roll over once they pass this size.
+SEGMENT_MAX_BYTES = 8 * 1024 * 1024
+
+# Compaction kicks in automatically when superseded frames outweigh
+# live ones and there is enough garbage to be worth a rewrite.
+COMPACT_MIN_DEAD_BYTES = 1024 * 1024
+
+# (segment number, payload offset, payload length)
+Location = Tuple[int, int, int]
+
+
+class SegmentCorruption(Exception):
+    pass
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """
+    One frame per line:
+      <payload length> <crc32 hex> <payload>\\n
+    """
+    header = b"%d %08x " % (len(payload), zlib.crc32(payload))
+    return header + payload + b"\n"
+
+
+def decode_frames(data: bytes):
+    """
+    Yield (frame_offset, payload_offset, payload) for every frame.
+
+    A well-framed entry whose checksum does not match is yielded with a
+    payload of None so the caller can skip it. A torn frame cannot be
+    stepped over, so SegmentCorruption is raised with its offset.
+    """
+    pos = 0
+    end = len(data)
+    while pos < end:
+        try:
+            sp1 = data.index(b" ", pos, pos + 24)
+            sp2 = data.index(b" ", sp1 + 1, sp1 + 10)
+            length = int(data[pos:sp1])
+            crc = int(data[sp1 + 1:sp2], 16)
+        except ValueError:
+            raise SegmentCorruption(pos)
+
+        start = sp2 + 1
+        stop = start + length
+        if stop >= end or data[stop:stop + 1] != b"\n":
+            raise SegmentCorruption(pos)
+
+        payload = data[start:stop]
+        yield pos, start, payload if zlib.crc32(payload) == crc else None
+        pos = stop + 1
+
+
+def _encode_record(record: MemoryRecord) -> bytes:
+    # ensure_ascii keeps byte and character offsets identical (see below)
+    return json.dumps(record.to_dict(), separators=(",", ":")).encode("ascii")
+
+
+def _frame_records(payload: bytes):
+    """
+    Yield (offset, length, record dict) for each record in a frame payload:
+    either a single record object or a JSON array written by a group commit.
+    """
+    if payload[:1] != b"[":
+        yield 0, len(payload), json.loads(payload)
+        return
+
+    text = payload.decode("ascii")
+    decoder = json.JSONDecoder()
+    pos = 1
+    while pos < len(text) - 1:
+        d, end = decoder.raw_decode(text, pos)
+        yield pos, end - pos, d
+        pos = end + 1
+
+
+class SegmentMemoryStore(BaseMemoryStore):
+    """
+    Log-structured memory store.
+
+    Records are appended as checksummed frames to per-category segment
+    files instead of one JSON file per record:
+      .kimiko/memory/segments/<category>/<n>.seg
+
+    An in-memory id -> location map is rebuilt by a recovery scan when
+    the store is opened. update() appends a new frame for the same id;
+    compact() folds those rewrites away.
+
+    Appends and compaction hold the directory lock. Frames appended by
+    another process are picked up by rescanning the category whenever
+    its active segment is no longer where this process left it.
+    """
+
+    def __init__(self, repo_root: Path) -> None:
+        super().__init__()
+        self.base_dir = repo_root / ".kimiko" / "memory" / "segments"
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+        self._index: Dict[MemoryCategory, Dict[str, Location]] = {}
+        # Sorted (created_at, id) keys per category, for cursor paging
+        self._order: Dict[MemoryCategory, List[OrderKey]] = {}
+        self._dead_bytes: Dict[MemoryCategory, int] = {}
+        self._live_bytes: Dict[MemoryCategory, int] = {}
+        self._active: Dict[MemoryCategory, int] = {}
+        # (last segment, its size) as of this process's last scan or write
+        self._tail: Dict[MemoryCategory, Tuple[int, int]] = {}
+        self.recovered_frames = 0
+        self.corrupt_frames = 0
+        self.discarded_bytes = 0
+
+        self.lock = dir_lock(self.base_dir)
+        with self.lock:
+            for category in MemoryCategory:
+                self._recover(category)
+
+    def _cat_dir(self, category: MemoryCategory) -> Path:
+        d = self.base_dir / category.value
+        d.mkdir(parents=True, exist_ok=True)
+        return d
+
+    def _segment_path(self, category: MemoryCategory, seq: int) -> Path:
+        return self._cat_dir(category) / f"{seq:08d}.seg"
+
+    def _segments(self, category: MemoryCategory) -> List[int]:
+        seqs = []
+        for p in self._cat_dir(category).glob("*.seg"):
+            try:
+                seqs.append(int(p.stem))
+            except ValueError:
+                continue
+        return sorted(seqs)
+
+    # ---------- Recovery ----------
+
+    def _recover(self, category: MemoryCategory) -> None:
+        index: Dict[str, Location] = {}
+        order: List[OrderKey] = []
+        dead = 0
+        live = 0
+        seqs = self._segments(category)
+
+        for seq in seqs:
+            path = self._segment_path(category, seq)
+            data = path.read_bytes()
+            good_until = len(data)
+            try:
+                for _, start, payload in decode_frames(data):
+                    if payload is None:
+                        self.corrupt_frames += 1
+                        continue
+                    for offset, length, d in _frame_records(payload):
+                        record_id = d["id"]
+                        old = index.get(record_id)
+                        if old is not None:
+                            dead += old[2]
+                            live -= old[2]
+                        else:
+                            order.append((d["created_at"], record_id))
+                        index[record_id] = (seq, start + offset, length)
+                        live += length
+                    self.recovered_frames += 1
+            except SegmentCorruption as e:
+                good_until = e.args[0]
+
+            if good_until < len(data):
+                # A torn tail is the expected result of a crash mid-append;
+                # cut it off so the next append starts on a frame boundary.
+                self.discarded_bytes += len(data) - good_until
+                with path.open("r+b") as f:
+                    f.truncate(good_until)
+
+        order.sort()
+        self._index[category] = index
+        self._order[category] = order
+        self._dead_bytes[category] = dead
+        self._live_bytes[category] = live
+        self._active[category] = seqs[-1] if seqs else 1
+        self._tail[category] = self._disk_tail(category)
+
+    def _disk_tail(self, category: MemoryCategory) -> Tuple[int, int]:
+        seqs = self._segments(category)
+        seq = seqs[-1] if seqs else 1
+        try:
+            return seq, self._segment_path(category, seq).stat().st_size
+        except FileNotFoundError:
+            return seq, 0
+
+    def _tail_moved(self, category: MemoryCategory) -> bool:
+        # Two stats: appends grow the last segment, and rollover and
+        # compaction both start the one after it (compaction also removes
+        # the last one).
+        seq, size = self._tail[category]
+        try:
+            current = self._segment_path(category, seq).stat().st_size
+        except FileNotFoundError:
+            current = 0 if size == 0 else -1
+        return current != size or self._segment_path(category, seq + 1).exists()
+
+    def _catch_up(self, category: MemoryCategory) -> None:
+        """Rescan category if another process appended or compacted it."""
+        if not self._tail_moved(category):
+            return
+        with self.lock:
+            disk = self._disk_tail(category)
+            seq, size = self._tail[category]
+            if disk[0] == seq and disk[1] > size:
+                self._scan_tail(category, seq, size)
+            elif disk != (seq, size):
+                self._recover(category)
+
+    def _scan_tail(self, category: MemoryCategory, seq: int, start: int) -> None:
+        """Index the frames another process appended after `start`."""
+        with self._segment_path(category, seq).open("rb") as f:
+            f.seek(start)
+            data = f.read()
+        try:
+            for _, pos, payload in decode_frames(data):
+                if payload is None:
+                    self.corrupt_frames += 1
+                    continue
+                for offset, length, d in _frame_records(payload):
+                    self._place_key(
+                        category, d["id"], d["created_at"],
+                        (seq, start + pos + offset, length),
+                    )
+                self.recovered_frames += 1
+        except SegmentCorruption:
+            # Torn append from a writer that died; a full scan truncates it.
+            self._recover(category)
+            return
+        self._tail[category] = (seq, start + len(data))
+
+    # ---------- Queries ----------
+
+    def list(self, category: MemoryCategory) -> List[MemoryRecord]:
+        self._catch_up(category)
+        locations = sorted(self._index[category].values())
+        records: List[MemoryRecord] = []
+        current_seq: Optional[int] = None
+        f = None
+        try:
+            for seq, offset, length in locations:
+                if seq != current_seq:
+                    if f is not None:
+                        f.close()
+                    f = self._segment_path(category, seq).open("rb")
+                    current_seq = seq
+                f.seek(offset)
+                try:
+                    records.append(self._from_dict(json.loads(f.read(length))))
+                except Exception:
+                    continue
+        finally:
+            if f is not None:
+                f.close()
+        return records
+
+    def get(self, category: MemoryCategory, record_id: str) -> MemoryRecord:
+        # Every lookup: another process may have rewritten this very id.
+        self._catch_up(category)
+        loc = self._index[category].get(record_id)
+        if loc is None:
+            raise FileNotFoundError(f"Memory record not found: {record_id}")
+        try:
+            payload = self._read_payload(category, loc)
+        except FileNotFoundError:
+            # Its segment was compacted away by another process.
+            self._catch_up(category)
+            if self._index[category].get(record_id) == loc:
+                raise
+            return self.get(category, record_id)
+        return self._from_dict(json.loads(payload))
+
+    def iter(
+        self,
+        category: MemoryCategory,
+        after: str | None = None,
+        limit: int | None = None,
+        order: str = "created_at",
+    ) -> Iterator[MemoryRecord]:
+        _check_order(order)
+        self._catch_up(category)
+        keys = self._order[category]
+        start = bisect.bisect_right(keys, parse_cursor(after)) if after else 0
+        stop = len(keys) if limit is None else min(len(keys), start + limit)
+        for _, record_id in keys[start:stop]:
+            yield self.get(category, record_id)
+
+    def count(self, category: MemoryCategory) -> int:
+        self._catch_up(category)
+        return len(self._index[category])
+
+    def generation(self) -> Optional[tuple]:
+        # Segments are append-only: the last segment and its size move on
+        # every append, compaction included.
+        return tuple(self._disk_tail(c) for c in MemoryCategory)
+
+    def _exists(self, category: MemoryCategory, record_id: str) -> bool:
+        self._catch_up(category)
+        return record_id in self._index[category]
+
+    def _read_payload(self, category: MemoryCategory, loc: Location) -> bytes:
+        seq, offset, length = loc
+        with self._segment_path(category, seq).open("rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    # ---------- Writes ----------
+
+    def _write(self, record: MemoryRecord) -> None:
+        self._catch_up(record.category)
+        payload = _encode_record(record)
+        seq, start = self._append(record.category, payload)
+        self._place(record, (seq, start, len(payload)))
+        self._maybe_compact(record.category)
+
+    def _write_many(self, records: List[MemoryRecord]) -> None:
+        """
+        Group commit: each category's share of the batch goes into a single
+        frame holding a JSON array, so one checksum covers the whole batch
+        and a torn append drops all of it on recovery.
+        """
+        for category in dict.fromkeys(r.category for r in records):
+            self._catch_up(category)
+            batch = [r for r in records if r.category == category]
+            parts = [_encode_record(r) for r in batch]
+            seq, start = self._append(category, b"[" + b",".join(parts) + b"]")
+            pos = start + 1
+            for record, part in zip(batch, parts):
+                self._place(record, (seq, pos, len(part)))
+                pos += len(part) + 1
+            self._maybe_compact(category)
+
+    def _append(self, category: MemoryCategory, payload: bytes) -> Tuple[int, int]:
+        """
+        Append one frame to the active segment; returns (segment, payload offset).
+        """
+        frame = encode_frame(payload)
+
+        seq = self._active[category]
+        path = self._segment_path(category, seq)
+        if path.exists() and path.stat().st_size >= SEGMENT_MAX_BYTES:
+            seq += 1
+            self._active[category] = seq
+            path = self._segment_path(category, seq)
+
+        with path.open("ab") as f:
+            offset = f.tell()
+            f.write(frame)
+        self._tail[category] = (seq, offset + len(frame))
+        sync_written([path])
+        return seq, offset + len(frame) - len(payload) - 1
+
+    def _place(self, record: MemoryRecord, loc: Location) -> None:
+        self._place_key(record.category, record.id, record.created_at, loc)
+
+    def _place_key(
+        self, category: MemoryCategory, record_id: str, created_at: str, loc: Location
+    ) -> None:
+        index = self._index[category]
+        old = index.get(record_id)
+        if old is not None:
+            self._dead_bytes[category] += old[2]
+            self._live_bytes[category] -= old[2]
+        else:
+            bisect.insort(self._order[category], (created_at, record_id))
+        index[record_id] = loc
+        self._live_bytes[category] += loc[2]
+
+    def _maybe_compact(self, category: MemoryCategory) -> None:
+        dead = self._dead_bytes[category]
+        if dead >= COMPACT_MIN_DEAD_BYTES and dead > self._live_bytes[category]:
+            self.compact(category)
+
+    # ---------- Compaction ----------
+
+    def compact(self, category: MemoryCategory | None = None) -> None:
+        """
+        Rewrite live frames into a fresh segment and drop the old ones.
+
+        The new segment is fully written before it is renamed into place,
+        and it sorts after every segment it replaces, so a crash at any
+        point leaves the recovery scan with the same live records.
+        """
+        with self.lock:
+            categories = [category] if category else list(MemoryCategory)
+            for cat in categories:
+                self._catch_up(cat)
+                old_seqs = self._segments(cat)
+                if not old_seqs:
+                    continue
+
+                new_seq = old_seqs[-1] + 1
+                final = self._segment_path(cat, new_seq)
+                tmp = final.with_suffix(".seg.tmp")
+
+                new_index: Dict[str, Location] = {}
+                live = 0
+                with tmp.open("wb") as out:
+                    for record_id, loc in sorted(
+                        self._index[cat].items(), key=lambda kv: kv[1]
+                    ):
+                        payload = self._read_payload(cat, loc)
+                        frame = encode_frame(payload)
+                        offset = out.tell()
+                        out.write(frame)
+                        new_index[record_id] = (
+                            new_seq,
+                            offset + len(frame) - len(payload) - 1,
+                            len(payload),
+                        )
+                        live += len(payload)
+                    out.flush()
+                    os.fsync(out.fileno())
+
+                os.replace(tmp, final)
+                for seq in old_seqs:
+                    self._segment_path(cat, seq).unlink(missing_ok=True)
+
+                self._index[cat] = new_index
+                self._dead_bytes[cat] = 0
+                self._live_bytes[cat] = live
+                self._active[cat] = new_seq
+                self._tail[cat] = self._disk_tail(cat)
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from app.memory.field_index import RecordFilter
+from app.memory.models import ApprovalInfo, MemoryCategory, MemoryRecord, RawJSON
+from app.memory.order_index import parse_cursor
+from app.memory.store import BaseMemoryStore, _check_order, iter_tree_records
+from app.storage.atomic import fsync_mode
+from app.storage.locking import dir_lock
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    category      TEXT NOT NULL,
+    id            TEXT NOT NULL,
+    content       TEXT NOT NULL,
+    source        TEXT NOT NULL,
+    created_at    TEXT NOT NULL,
+    updated_at    TEXT NOT NULL,
+    approval_required INTEGER,
+    approved_by   TEXT,
+    approved_at   TEXT,
+    PRIMARY KEY (category, id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS records_created_at
+    ON records (category, created_at);
+CREATE INDEX IF NOT EXISTS records_source
+    ON records (category, source);
+CREATE INDEX IF NOT EXISTS records_approved_by
+    ON records (category, approved_by);
+CREATE INDEX IF NOT EXISTS records_approved_at
+    ON records (category, approved_at);
+CREATE INDEX IF NOT EXISTS records_updated_at
+    ON records (category, updated_at);
+
+-- A write counter every connection sees the same value of, moved by
+-- triggers so writes made with other tools count too.
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('seq', 0);
+CREATE TRIGGER IF NOT EXISTS records_seq_insert AFTER INSERT ON records
+    BEGIN UPDATE meta SET value = value + 1 WHERE key = 'seq'; END;
+CREATE TRIGGER IF NOT EXISTS records_seq_update AFTER UPDATE ON records
+    BEGIN UPDATE meta SET value = value + 1 WHERE key = 'seq'; END;
+CREATE TRIGGER IF NOT EXISTS records_seq_delete AFTER DELETE ON records
+    BEGIN UPDATE meta SET value = value + 1 WHERE key = 'seq'; END;
+"""
+
+COLUMNS = (
+    "category, id, content, source, created_at, updated_at, "
+    "approval_required, approved_by, approved_at"
+)
+
+
+class SqliteMemoryStore(BaseMemoryStore):
+    """
+    SQLite-backed memory store (stdlib sqlite3, WAL mode).
+    All categories share one table keyed by (category, id):
+      .kimiko/memory/memory.sqlite3
+
+    Every RecordFilter field is an indexed column, so query() is plain
+    SQL and no FieldIndex is needed.
+
+    SQLite serializes its own transactions; the directory lock is still
+    taken so update() and the attached indexes see one writer at a time.
+    """
+
+    native_field_queries = True
+
+    def __init__(self, repo_root: Path) -> None:
+        super().__init__()
+        self.base_dir = repo_root / ".kimiko" / "memory"
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.base_dir / "memory.sqlite3"
+
+        self.lock = dir_lock(self.base_dir)
+        self._db = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL syncs at checkpoints, which is already group commit;
+        # FULL syncs every transaction.
+        synchronous = "FULL" if fsync_mode() == "always" else "NORMAL"
+        self._db.execute(f"PRAGMA synchronous={synchronous}")
+        self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    # ---------- Queries ----------
+
+    def list(self, category: MemoryCategory) -> List[MemoryRecord]:
+        rows = self._db.execute(
+            f"SELECT {COLUMNS} FROM records WHERE category = ? ORDER BY created_at",
+            (category.value,),
+        )
+        return [self._from_row(r) for r in rows]
+
+    def get(self, category: MemoryCategory, record_id: str) -> MemoryRecord:
+        row = self._db.execute(
+            f"SELECT {COLUMNS} FROM records WHERE category = ? AND id = ?",
+            (category.value, record_id),
+        ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Memory record not found: {record_id}")
+        return self._from_row(row)
+
+    def iter(
+        self,
+        category: MemoryCategory,
+        after: str | None = None,
+        limit: int | None = None,
+        order: str = "created_at",
+    ) -> Iterator[MemoryRecord]:
+        _check_order(order)
+        sql = f"SELECT {COLUMNS} FROM records WHERE category = ?"
+        params: list = [category.value]
+        if after is not None:
+            sql += " AND (created_at, id) > (?, ?)"
+            params.extend(parse_cursor(after))
+        sql += " ORDER BY created_at, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for row in self._db.execute(sql, params):
+            yield self._from_row(row)
+
+    def query(
+        self,
+        category: MemoryCategory,
+        filters: List[RecordFilter],
+        after: str | None = None,
+        limit: int | None = None,
+    ) -> List[MemoryRecord]:
+        sql = f"SELECT {COLUMNS} FROM records WHERE category = ?"
+        params: list = [category.value]
+        if after is not None:
+            sql += " AND (created_at, id) > (?, ?)"
+            params.extend(parse_cursor(after))
+        for f in filters:
+            # Field names are validated by RecordFilter and match the columns.
+            if f.equals is not None:
+                sql += f" AND {f.field} = ?"
+                params.append(f.equals)
+            if f.since is not None:
+                sql += f" AND {f.field} >= ?"
+                params.append(f.since)
+            if f.until is not None:
+                sql += f" AND {f.field} < ?"
+                params.append(f.until)
+            sql += f" AND {f.field} IS NOT NULL"
+        sql += " ORDER BY created_at, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._from_row(r) for r in self._db.execute(sql, params)]
+
+    def count(self, category: MemoryCategory) -> int:
+        (n,) = self._db.execute(
+            "SELECT COUNT(*) FROM records WHERE category = ?",
+            (category.value,),
+        ).fetchone()
+        return n
+
+    def _exists(self, category: MemoryCategory, record_id: str) -> bool:
+        row = self._db.execute(
+            "SELECT 1 FROM records WHERE category = ? AND id = ?",
+            (category.value, record_id),
+        ).fetchone()
+        return row is not None
+
+    def last_approved_at(self) -> Optional[str]:
+        (stamp,) = self._db.execute(
+            "SELECT MAX(approved_at) FROM records WHERE approved_at IS NOT NULL"
+        ).fetchone()
+        return stamp
+
+    def generation(self) -> Optional[tuple]:
+        # The trigger-kept write counter, so other processes (and the
+        # indexes they write) agree on it.
+        (seq,) = self._db.execute("SELECT value FROM meta WHERE key = 'seq'").fetchone()
+        return (seq,)
+
+    # ---------- Writes ----------
+
+    def _write(self, record: MemoryRecord) -> None:
+        with self._db:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO records ({COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._to_row(record),
+            )
+
+    def _write_many(self, records: List[MemoryRecord]) -> None:
+        # One transaction, so the batch commits (and syncs) exactly once.
+        with self._db:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO records ({COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._to_row(r) for r in records],
+            )
+
+    def import_json_tree(self, memory_dir: Path | None = None) -> int:
+        """
+        One-shot import of the file layout (.kimiko/memory/<category>/...),
+        in whatever shape it has reached: flat or sharded categories,
+        hour-partitioned history and its sealed packs.
+
+        Records keep their ids and timestamps; rows that already exist are
+        left alone, so re-running the import is harmless. Returns the
+        number of records inserted.
+        """
+        memory_dir = memory_dir or self.base_dir
+        inserted = 0
+        with self._db:
+            for category in MemoryCategory:
+                for blob in iter_tree_records(memory_dir / category.value, category):
+                    try:
+                        record = self._from_dict(json.loads(blob))
+                    except Exception:
+                        continue
+                    cur = self._db.execute(
+                        f"INSERT OR IGNORE INTO records ({COLUMNS}) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        self._to_row(record),
+                    )
+                    inserted += cur.rowcount
+        return inserted
+
+    # ---------- Helpers ----------
+
+    def _to_row(self, record: MemoryRecord) -> tuple:
+        approval = record.approval
+        return (
+            record.category.value,
+            record.id,
+            record.content_json(),
+            record.source,
+            record.created_at,
+            record.updated_at,
+            None if approval is None else int(approval.required),
+            None if approval is None else approval.approved_by,
+            None if approval is None else approval.approved_at,
+        )
+
+    def _from_row(self, row: tuple) -> MemoryRecord:
+        (
+            category, record_id, content, source, created_at, updated_at,
+            approval_required, approved_by, approved_at,
+        ) = row
+        approval = None
+        if approval_required is not None:
+            approval = ApprovalInfo(
+                required=bool(approval_required),
+                approved_by=approved_by,
+                approved_at=approved_at,
+            )
+        return MemoryRecord(
+            id=record_id,
+            category=MemoryCategory(category),
+            # Decoded only if the caller actually reads the content.
+            content=RawJSON(content),
+            source=source,
+            created_at=created_at,
+            updated_at=updated_at,
+            approval=approval,
+        )
@@ -1,58 +1,225 @@
 from __future__ import annotations
 
+import itertools
 import json
+import os
+import re
+import shutil
+import threading
 import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from app.memory.models import (
+    APPROVAL_REQUIRED,
     MemoryCategory,
     MemoryRecord,
     ApprovalInfo,
 )
+from app.memory.field_index import FieldIndex, RecordFilter
+from app.memory.order_index import OrderIndex, make_cursor, parse_cursor
+from app.storage.atomic import (
+    atomic_write_text,
+    file_version,
+    fsync_mode,
+    fsync_paths,
+    sync_written,
+)
+from app.storage.locking import dir_lock, pid_alive
+from app.storage.pack import PackReader, write_pack
+from app.storage.sharding import SHARDED, find_path, layout_files, layout_path, read_layout
+
+
+# Shard / hour-partition directories whose mtimes the manifest keeps per
+# category (besides the category directory itself).
+MAX_STAMPED_DIRS = 16
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# History ids lead with their creation time, e.g.
+#   20261017T014926298997-<20 hex chars>
+# so they sort chronologically and name the partition they live in.
+HISTORY_ID_RE = re.compile(r"^(\d{8})T(\d{2})\d{10}-[0-9a-f]+$")
+
+
+def _new_id(category: MemoryCategory, created_at: str) -> str:
+    if category != MemoryCategory.HISTORY:
+        return str(uuid.uuid4())
+    stamp = datetime.fromisoformat(created_at).strftime("%Y%m%dT%H%M%S%f")
+    return f"{stamp}-{uuid.uuid4().hex[:20]}"
+
+
+def history_partition(record_id: str) -> Optional[tuple[str, str]]:
+    """
+    (day, hour) partition of a history id, e.g. ("2026-10-17", "01").
+    None for pre-partitioning uuid ids, which stay in the flat layout.
+    """
+    m = HISTORY_ID_RE.match(record_id)
+    if not m:
+        return None
+    day, hour = m.groups()
+    return f"{day[:4]}-{day[4:6]}-{day[6:]}", hour
 
 
 class MemoryViolation(Exception):
     pass
 
 
-class MemoryStore:
-    """
-    File-based memory store with category-level enforcement.
-    Each record is stored as a JSON file under:
-      .kimiko/memory/<category>/<id>.json
+class BaseMemoryStore:
     """
+    Category enforcement shared by every memory backend.
 
-    def __init__(self, repo_root: Path) -> None:
-        self.base_dir = repo_root / ".kimiko" / "memory"
-        self.base_dir.mkdir(parents=True, exist_ok=True)
+    Backends only implement persistence (_write / get / list); the v1.5
+    rules for identity, approval and append-only history live here so
+    they cannot drift between backends.
 
-    def _cat_dir(self, category: MemoryCategory) -> Path:
-        d = self.base_dir / category.value
-        d.mkdir(parents=True, exist_ok=True)
-        return d
+    Indexes attached to `indexes` are told about every successful write
+    via records_written(records, moved), moved being the (before, after)
+    generation() of the write, or None when the backend has none.
 
-    def _path(self, category: MemoryCategory, record_id: str) -> Path:
-        return self._cat_dir(category) / f"{record_id}.json"
+    Every write runs under `lock`; file-backed stores replace the default
+    in-process lock with a DirLock so concurrent Kimiko processes
+    serialize too.
+
+    query() is answered by an attached FieldIndex; backends that can
+    filter natively set native_field_queries and override it.
+    """
+
+    native_field_queries = False
+
+    def __init__(self) -> None:
+        self.indexes: List = []
+        self.lock = threading.RLock()
 
     # ---------- Queries ----------
 
     def list(self, category: MemoryCategory) -> List[MemoryRecord]:
+        raise NotImplementedError
+
+    def get(self, category: MemoryCategory, record_id: str) -> MemoryRecord:
+        raise NotImplementedError
+
+    def iter(
+        self,
+        category: MemoryCategory,
+        after: str | None = None,
+        limit: int | None = None,
+        order: str = "created_at",
+    ) -> Iterator[MemoryRecord]:
+        """
+        Yield records in (created_at, id) order, starting after `after`
+        (a cursor from order_index.make_cursor) and stopping after `limit`
+        records. Backends override this to avoid loading the category.
+        """
+        _check_order(order)
+        records = sorted(self.list(category), key=lambda r: (r.created_at, r.id))
+        if after is not None:
+            key = parse_cursor(after)
+            records = [r for r in records if (r.created_at, r.id) > key]
+        yield from records[:limit]
+
+    def iter_range(
+        self,
+        category: MemoryCategory,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int | None = None,
+    ) -> Iterator[MemoryRecord]:
+        """
+        Records with since <= created_at < until, oldest first. Bounds are
+        ISO-8601 prefixes ("2026-10-17", "2026-10-17T09"), so both ends
+        resolve through the same ordered scan iter() uses for cursors.
+        """
+        after = make_cursor(since, "") if since else None
+        emitted = 0
+        for record in self.iter(category, after=after):
+            if until is not None and record.created_at >= until:
+                return
+            if limit is not None and emitted >= limit:
+                return
+            yield record
+            emitted += 1
+
+    def query(
+        self,
+        category: MemoryCategory,
+        filters: List[RecordFilter],
+        after: str | None = None,
+        limit: int | None = None,
+    ) -> List[MemoryRecord]:
+        """
+        Records in category matching every filter, in (created_at, id)
+        order, resuming after an iter() cursor. Uses an attached
+        FieldIndex (rebuilt first if it has fallen behind the store);
+        without one, falls back to a scan.
+        """
+        index = next((i for i in self.indexes if isinstance(i, FieldIndex)), None)
+        if index is None:
+            matched = (
+                r for r in self.iter(category, after=after)
+                if all(f.matches(r) for f in filters)
+            )
+            return list(itertools.islice(matched, limit))
+
+        if self._field_index_behind(index, category):
+            # Under the lock: a rebuild truncates the index's delta log.
+            with self.lock:
+                if self._field_index_behind(index, category):
+                    index.rebuild(
+                        (r for c in MemoryCategory for r in self.iter(c)),
+                        self.generation(),
+                    )
+        key = parse_cursor(after) if after is not None else None
         records: List[MemoryRecord] = []
-        for p in self._cat_dir(category).glob("*.json"):
+        for record_id in index.lookup(category, filters, after=key):
+            if limit is not None and len(records) >= limit:
+                break
             try:
-                data = json.loads(p.read_text(encoding="utf-8"))
-                records.append(self._from_dict(data))
-            except Exception:
+                records.append(self.get(category, record_id))
+            except FileNotFoundError:
                 continue
         return records
 
-    def get(self, category: MemoryCategory, record_id: str) -> MemoryRecord:
-        path = self._path(category, record_id)
-        if not path.exists():
-            raise FileNotFoundError(f"Memory record not found: {record_id}")
-        data = json.loads(path.read_text(encoding="utf-8"))
-        return self._from_dict(data)
+    def _field_index_behind(self, index: FieldIndex, category: MemoryCategory) -> bool:
+        # Like MemoryManager._index_behind: a write made without the index
+        # leaves the store at a generation the index's log does not name.
+        generation = self.generation()
+        if generation is None:
+            return index.count(category) != self.count(category)
+        return not index.in_sync(generation)
+
+    def seal_history(self, before: str) -> List[str]:
+        # Only backends that partition history have anything to seal.
+        return []
+
+    def cache_stats(self) -> Dict[str, int]:
+        return {}
+
+    def count(self, category: MemoryCategory) -> int:
+        # Backends with an index override this; the fallback parses everything.
+        return len(self.list(category))
+
+    def last_approved_at(self) -> Optional[str]:
+        stamps = [
+            r.approval.approved_at
+            for category in APPROVAL_REQUIRED
+            for r in self.list(category)
+            if r.approval and r.approval.approved_at
+        ]
+        return max(stamps, default=None)
+
+    def generation(self) -> Optional[tuple]:
+        """
+        A token that changes whenever counts or approval stamps may have
+        changed, cheap enough to check before every status query. None
+        means the backend cannot tell, and callers must recompute.
+        """
+        return None
 
     # ---------- Writes ----------
 
@@ -72,18 +239,95 @@ class MemoryStore:
             if not approval or not approval.approved_by:
                 raise MemoryViolation(f"{category.value} requires approval to persist")
 
+        created_at = _now_iso()
         record = MemoryRecord(
-            id=str(uuid.uuid4()),
+            id=_new_id(category, created_at),
             category=category,
             content=content,
             source=source,
+            created_at=created_at,
+            updated_at=created_at,
             approval=approval,
         )
 
-        path = self._path(category, record.id)
-        path.write_text(json.dumps(record.to_dict(), indent=2), encoding="utf-8")
+        with self.lock:
+            before = self._index_generation()
+            self._write(record)
+            self._notify_indexes([record], before)
         return record
 
+    def create_many(
+        self,
+        category: MemoryCategory,
+        contents: List[dict],
+        source: str,
+        approval: ApprovalInfo | None = None,
+    ) -> List[MemoryRecord]:
+        """
+        Create one record per content dict as a single batch.
+        Category rules are checked once; the batch is committed
+        all-or-nothing by the backend.
+        """
+        if category == MemoryCategory.IDENTITY:
+            raise MemoryViolation("Identity memory is read-only")
+
+        if MemoryRecord.requires_approval(category):
+            if not approval or not approval.approved_by:
+                raise MemoryViolation(f"{category.value} requires approval to persist")
+
+        records = []
+        for content in contents:
+            created_at = _now_iso()
+            records.append(
+                MemoryRecord(
+                    id=_new_id(category, created_at),
+                    category=category,
+                    content=content,
+                    source=source,
+                    created_at=created_at,
+                    updated_at=created_at,
+                    approval=approval,
+                )
+            )
+        if records:
+            with self.lock:
+                before = self._index_generation()
+                self._write_many(records)
+                self._notify_indexes(records, before)
+        return records
+
+    def import_many(
+        self, records: List[MemoryRecord]
+    ) -> Tuple[List[MemoryRecord], List[Tuple[MemoryRecord, str]]]:
+        """
+        Restore records as they are (ids and timestamps kept), e.g. from
+        an export. The same category rules as create() apply per record;
+        records already present are skipped so a re-run is harmless.
+
+        Returns (imported, rejected) where rejected holds (record, reason).
+        """
+        accepted: List[MemoryRecord] = []
+        rejected: List[Tuple[MemoryRecord, str]] = []
+        for record in records:
+            if record.category == MemoryCategory.IDENTITY:
+                rejected.append((record, "Identity memory is read-only"))
+            elif MemoryRecord.requires_approval(record.category) and not (
+                record.approval and record.approval.approved_by
+            ):
+                rejected.append(
+                    (record, f"{record.category.value} requires approval to persist")
+                )
+            else:
+                accepted.append(record)
+
+        with self.lock:
+            imported = [r for r in accepted if not self._exists(r.category, r.id)]
+            if imported:
+                before = self._index_generation()
+                self._write_many(imported)
+                self._notify_indexes(imported, before)
+        return imported, rejected
+
     def append_history(self, content: dict, source: str) -> MemoryRecord:
         # History is append-only
         return self.create(
@@ -93,6 +337,14 @@ class MemoryStore:
             approval=None,
         )
 
+    def append_history_many(self, contents: List[dict], source: str) -> List[MemoryRecord]:
+        return self.create_many(
+            category=MemoryCategory.HISTORY,
+            contents=contents,
+            source=source,
+            approval=None,
+        )
+
     def update(
         self,
         category: MemoryCategory,
@@ -113,39 +365,644 @@ class MemoryStore:
             if not approval or not approval.approved_by:
                 raise MemoryViolation(f"{category.value} requires approval to update")
 
-        record = self.get(category, record_id)
-        record.content = content
-        record.updated_at = record.updated_at  # timestamp bump handled below
-        record.updated_at = record.updated_at = record.updated_at = record.updated_at
-        record.updated_at = record.updated_at = record.updated_at
-        record.updated_at = record.updated_at
-        record.updated_at = record.updated_at = record.updated_at
-        record.updated_at = record.updated_at = record.updated_at
-        record.updated_at = record.updated_at
-        record.updated_at = record.updated_at
-        record.updated_at = record.updated_at
-
-        record.updated_at = record.updated_at  # keep explicit; we’ll set fresh below
-        from datetime import datetime, timezone
-        record.updated_at = datetime.now(timezone.utc).isoformat()
-        record.approval = approval
-
-        path = self._path(category, record.id)
-        path.write_text(json.dumps(record.to_dict(), indent=2), encoding="utf-8")
+        with self.lock:
+            record = self.get(category, record_id)
+            record.content = content
+            record.updated_at = _now_iso()
+            record.approval = approval
+
+            before = self._index_generation()
+            self._write(record)
+            self._notify_indexes([record], before)
         return record
 
+    # ---------- Backend hooks ----------
+
+    def _write(self, record: MemoryRecord) -> None:
+        raise NotImplementedError
+
+    def _write_many(self, records: List[MemoryRecord]) -> None:
+        # Backends override this to commit the whole batch at once.
+        for record in records:
+            self._write(record)
+
+    def _exists(self, category: MemoryCategory, record_id: str) -> bool:
+        try:
+            self.get(category, record_id)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _index_generation(self) -> Optional[tuple]:
+        # Only worth reading when some index will be told about the write.
+        return self.generation() if self.indexes else None
+
+    def _notify_indexes(self, records: List[MemoryRecord], before: Optional[tuple]) -> None:
+        if not self.indexes:
+            return
+        moved = (before, self.generation()) if before is not None else None
+        for index in self.indexes:
+            index.records_written(records, moved)
+
     # ---------- Helpers ----------
 
     def _from_dict(self, d: dict) -> MemoryRecord:
-        approval = None
-        if d.get("approval"):
-            approval = ApprovalInfo(**d["approval"])
-        return MemoryRecord(
-            id=d["id"],
-            category=MemoryCategory(d["category"]),
-            content=d["content"],
-            source=d["source"],
-            created_at=d["created_at"],
-            updated_at=d["updated_at"],
-            approval=approval,
-        )
+        return record_from_dict(d)
+
+
+class MemoryStore(BaseMemoryStore):
+    """
+    File-based memory store with category-level enforcement.
+    Each record is stored as a JSON file under:
+      .kimiko/memory/<category>/<id>.json
+
+    Other categories can be switched to a two-level hash-prefix layout
+    (<category>/ab/cd/<id>.json, see app.memory.reshard) once they grow
+    too large for one directory.
+
+    History is partitioned by creation hour instead:
+      .kimiko/memory/history/<YYYY-MM-DD>/<HH>/<id>.json
+    and sealed partitions become a single read-only pack:
+      .kimiko/memory/history/<YYYY-MM-DD>/<HH>.pack
+
+    Counts and timestamps are kept in .kimiko/memory/manifest.json so
+    status queries never have to open the records themselves.
+
+    Parsed records are kept in a bounded LRU, revalidated against the
+    file's mtime/size on every hit; whole-category listings of at most
+    cache_size records (never history) are cached until the manifest
+    changes.
+    """
+
+    def __init__(self, repo_root: Path, cache_size: int = 4096) -> None:
+        super().__init__()
+        self.base_dir = repo_root / ".kimiko" / "memory"
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.base_dir / "manifest.json"
+        self._manifest_text: Optional[tuple] = None  # (file version, text)
+        self.order_dir = self.base_dir / "order"
+        self.batches_dir = self.base_dir / ".batches"
+        # Open pack readers, revalidated against the file on every use
+        self._packs: Dict[Path, PackReader] = {}
+
+        self.cache_size = cache_size
+        # (category, id) -> ((mtime_ns, size), record)
+        self._record_cache: "OrderedDict[Tuple[MemoryCategory, str], tuple]" = OrderedDict()
+        # category -> (signature, records)
+        self._list_cache: Dict[MemoryCategory, tuple] = {}
+        self._stats = {"hits": 0, "misses": 0, "list_hits": 0, "list_misses": 0}
+
+        self.lock = dir_lock(self.base_dir)
+        with self.lock:
+            self._recover_batches()
+
+    def _cat_dir(self, category: MemoryCategory) -> Path:
+        d = self.base_dir / category.value
+        d.mkdir(parents=True, exist_ok=True)
+        return d
+
+    def _path(self, category: MemoryCategory, record_id: str) -> Path:
+        """Where a write of record_id goes; creates its directory."""
+        path = self._history_path(record_id) if category == MemoryCategory.HISTORY else None
+        if path is None:
+            cat_dir = self._cat_dir(category)
+            path = layout_path(cat_dir, record_id, read_layout(cat_dir))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _find(self, category: MemoryCategory, record_id: str) -> Path:
+        """
+        Where record_id currently lives, without creating anything (a
+        lookup must not bring back a sealed hour or an empty shard). Also
+        finds files a reshard has not moved yet.
+        """
+        if category == MemoryCategory.HISTORY:
+            path = self._history_path(record_id)
+            if path is not None:
+                return path
+        cat_dir = self._cat_dir(category)
+        return find_path(cat_dir, record_id, read_layout(cat_dir))
+
+    def _history_path(self, record_id: str) -> Optional[Path]:
+        # None for pre-partitioning ids, which live in the flat layout.
+        partition = history_partition(record_id)
+        if partition is None:
+            return None
+        day, hour = partition
+        return self._cat_dir(MemoryCategory.HISTORY) / day / hour / f"{record_id}.json"
+
+    def _record_files(self, category: MemoryCategory) -> List[Path]:
+        return record_files(self._cat_dir(category), category)
+
+    # ---------- Queries ----------
+
+    def list(self, category: MemoryCategory) -> List[MemoryRecord]:
+        # Copies, as from get(): a caller changing a listed record must
+        # not change the cached one.
+        signature = self._list_signature(category)
+        cached = self._list_cache.get(category)
+        if cached is not None and cached[0] == signature:
+            self._stats["list_hits"] += 1
+            return [r.copy() for r in cached[1]]
+        self._stats["list_misses"] += 1
+
+        records = self._load_all(category)
+        # History grows without bound; only listings that fit in the
+        # record cache's budget are kept.
+        if category == MemoryCategory.HISTORY or len(records) > self.cache_size:
+            self._list_cache.pop(category, None)
+            return records
+        self._list_cache[category] = (signature, records)
+        return [r.copy() for r in records]
+
+    def _load_all(self, category: MemoryCategory) -> List[MemoryRecord]:
+        records: List[MemoryRecord] = []
+        loose = set()
+        for p in self._record_files(category):
+            try:
+                data = json.loads(p.read_text(encoding="utf-8"))
+                records.append(self._from_dict(data))
+            except Exception:
+                continue
+            loose.add(p.stem)
+        if category == MemoryCategory.HISTORY:
+            for pack in self._sealed_packs():
+                for record_id, blob in pack.items():
+                    if record_id in loose:
+                        continue  # a seal interrupted before removing its files
+                    records.append(self._from_dict(json.loads(blob)))
+        return records
+
+    def get(self, category: MemoryCategory, record_id: str) -> MemoryRecord:
+        key = (category, record_id)
+        path = self._find(category, record_id)
+        pack = None
+        try:
+            st = path.stat()
+            version: tuple = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            pack = self._pack_for(category, record_id)
+            if pack is None or record_id not in pack:
+                self._record_cache.pop(key, None)
+                raise FileNotFoundError(f"Memory record not found: {record_id}")
+            # A pack only changes by being re-sealed into a new file.
+            version = (str(pack.path),) + pack.version
+
+        cached = self._record_cache.get(key)
+        if cached is not None and cached[0] == version:
+            self._stats["hits"] += 1
+            self._record_cache.move_to_end(key)
+            return cached[1].copy()
+
+        self._stats["misses"] += 1
+        if pack is None:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        else:
+            data = json.loads(pack.get(record_id))
+        record = self._from_dict(data)
+        self._remember(key, version, record)
+        return record.copy()
+
+    def cache_stats(self) -> Dict[str, int]:
+        return dict(self._stats, size=len(self._record_cache))
+
+    def _remember(self, key: tuple, version: tuple, record: MemoryRecord) -> None:
+        self._record_cache[key] = (version, record)
+        self._record_cache.move_to_end(key)
+        while len(self._record_cache) > self.cache_size:
+            self._record_cache.popitem(last=False)
+
+    def _list_signature(self, category: MemoryCategory) -> tuple:
+        # Every write through a MemoryStore replaces the manifest, and
+        # _manifest() rebuilds it when its directory stamps moved.
+        return self.generation()
+
+    def iter(
+        self,
+        category: MemoryCategory,
+        after: str | None = None,
+        limit: int | None = None,
+        order: str = "created_at",
+    ) -> Iterator[MemoryRecord]:
+        _check_order(order)
+        index = self._order_index(category)
+        if len(index) != self.count(category):
+            with self.lock:
+                # Streamed: only the keys are held, not the records (nor
+                # is the list cache filled, as list() would).
+                index.rebuild(_order_keys(self._cat_dir(category), category))
+
+        if limit is not None and limit <= 0:
+            return
+        key = parse_cursor(after) if after is not None else None
+        emitted = 0
+        for _, record_id in index.iter_from(after=key):
+            try:
+                yield self.get(category, record_id)
+            except (FileNotFoundError, ValueError):
+                continue
+            emitted += 1
+            if limit is not None and emitted >= limit:
+                return
+
+    def count(self, category: MemoryCategory) -> int:
+        return self._manifest()["counts"][category.value]
+
+    def last_approved_at(self) -> Optional[str]:
+        return self._manifest()["last_approved_at"]
+
+    def last_write_at(self) -> Optional[str]:
+        return self._manifest()["last_write_at"]
+
+    def generation(self) -> Optional[tuple]:
+        # The manifest's write sequence: every write through the store
+        # bumps it, and _manifest() rebuilds (and bumps) it when a stamped
+        # directory changed behind the store's back.
+        manifest = self._manifest()
+        return (manifest["seq"], manifest["rebuilt"])
+
+    # ---------- Writes ----------
+
+    def _write(self, record: MemoryRecord) -> None:
+        path = self._path(record.category, record.id)
+        existing = self._find(record.category, record.id)
+        is_new = not existing.exists()
+        manifest = self._manifest()
+
+        atomic_write_text(path, json.dumps(record.to_dict(), indent=2))
+        if not is_new and existing != path:
+            # Rewritten mid-reshard: the shard copy supersedes the flat one.
+            existing.unlink(missing_ok=True)
+
+        self._record_writes(manifest, [record] if is_new else [], [record])
+
+    def _write_many(self, records: List[MemoryRecord]) -> None:
+        """
+        Group commit: every record file is staged in
+        .kimiko/memory/.batches/<pid>-<batch>/, a COMMIT marker is written,
+        and only then are the files renamed into place. A crash before the
+        marker discards the batch; after it, the next open finishes it.
+        """
+        manifest = self._manifest()
+        batch_dir = self.batches_dir / f"{os.getpid()}-{uuid.uuid4().hex}"
+        batch_dir.mkdir(parents=True)
+
+        staged = []
+        for r in records:
+            path = batch_dir / f"{r.category.value}.{r.id}.json"
+            path.write_text(json.dumps(r.to_dict()), encoding="utf-8")
+            staged.append(path)
+        if fsync_mode() != "off":
+            # The batch must be on disk before COMMIT can vouch for it.
+            fsync_paths(staged + [batch_dir])
+        atomic_write_text(batch_dir / "COMMIT", str(len(records)))
+
+        self._finish_batch(batch_dir)
+        self._record_writes(manifest, records, records)
+
+    def _finish_batch(self, batch_dir: Path) -> None:
+        targets = []
+        for staged in batch_dir.glob("*.json"):
+            cat, record_id = staged.stem.split(".", 1)
+            target = self._path(MemoryCategory(cat), record_id)
+            os.replace(staged, target)
+            targets.append(target.parent)
+        shutil.rmtree(batch_dir)
+        sync_written(targets)
+
+    def _recover_batches(self) -> None:
+        if not self.batches_dir.is_dir():
+            return
+        for batch_dir in self.batches_dir.iterdir():
+            pid = batch_dir.name.split("-", 1)[0]
+            if pid.isdigit() and int(pid) != os.getpid() and pid_alive(int(pid)):
+                continue  # another live process is still staging it
+            if (batch_dir / "COMMIT").exists():
+                self._finish_batch(batch_dir)
+            else:
+                shutil.rmtree(batch_dir, ignore_errors=True)
+
+    def _record_writes(
+        self,
+        manifest: dict,
+        created: List[MemoryRecord],
+        written: List[MemoryRecord],
+    ) -> None:
+        for category in {r.category for r in created}:
+            new = [r for r in created if r.category == category]
+            manifest["counts"][category.value] += len(new)
+            self._order_index(category).extend((r.created_at, r.id) for r in new)
+
+        for record in written:
+            manifest["last_write_at"] = record.updated_at
+            if record.approval and record.approval.approved_at:
+                manifest["last_approved_at"] = max(
+                    manifest["last_approved_at"] or "", record.approval.approved_at
+                )
+        for category in {r.category for r in written}:
+            self._stamp_dirs(
+                manifest,
+                category,
+                [self._record_dir(r) for r in written if r.category == category],
+            )
+        self._save_manifest(manifest)
+
+    def _exists(self, category: MemoryCategory, record_id: str) -> bool:
+        if self._find(category, record_id).exists():
+            return True
+        pack = self._pack_for(category, record_id)
+        return pack is not None and record_id in pack
+
+    def _order_index(self, category: MemoryCategory) -> OrderIndex:
+        return OrderIndex(self.order_dir / f"{category.value}.idx")
+
+    # ---------- Sealed history ----------
+
+    def _pack(self, path: Path) -> Optional[PackReader]:
+        """
+        Reader for the pack at path, None when there is none. A pack
+        re-sealed by another store or process is a new file with new
+        offsets, so the cached reader is reopened whenever the file's
+        version no longer matches the one it indexed.
+        """
+        try:
+            version = file_version(path)
+        except FileNotFoundError:
+            self._packs.pop(path, None)
+            return None
+        reader = self._packs.get(path)
+        if reader is None or reader.version != version:
+            try:
+                reader = self._packs[path] = PackReader(path)
+            except FileNotFoundError:
+                self._packs.pop(path, None)
+                return None
+        return reader
+
+    def _pack_for(self, category: MemoryCategory, record_id: str) -> Optional[PackReader]:
+        if category != MemoryCategory.HISTORY:
+            return None
+        partition = history_partition(record_id)
+        if partition is None:
+            return None
+        return self._pack(self._cat_dir(category) / partition[0] / f"{partition[1]}.pack")
+
+    def _sealed_packs(self) -> List[PackReader]:
+        packs = (self._pack(p) for p in history_pack_files(self._cat_dir(MemoryCategory.HISTORY)))
+        return [p for p in packs if p is not None]
+
+    def seal_history(self, before: str) -> List[str]:
+        """
+        Pack every hour partition that ends at or before `before` (an
+        ISO-8601 prefix such as "2026-10-17") into an immutable,
+        compressed <HH>.pack and remove its loose files.
+
+        The pack is complete on disk before any file is deleted, and reads
+        prefer loose files, so an interrupted seal only needs re-running.
+        Returns the sealed partitions as "<day>/<hour>".
+        """
+        with self.lock:
+            manifest = self._manifest()
+            history = self._cat_dir(MemoryCategory.HISTORY)
+            sealed: List[str] = []
+            for hour_dir in sorted(history.glob("*/*")):
+                if not hour_dir.is_dir():
+                    continue
+                day, hour = hour_dir.parent.name, hour_dir.name
+                if not _partition_closed(day, hour, before):
+                    continue
+
+                files = sorted(hour_dir.glob("*.json"))
+                pack_path = hour_dir.parent / f"{hour}.pack"
+                # Finish an interrupted seal, or fold in late writes.
+                existing = self._pack(pack_path)
+                items = dict(existing.items()) if existing is not None else {}
+                for p in files:
+                    items[p.stem] = p.read_bytes()
+                write_pack(pack_path, sorted(items.items()))
+
+                shutil.rmtree(hour_dir)
+                sealed.append(f"{day}/{hour}")
+            if sealed:
+                # Same records, new directories: keep the manifest current
+                # instead of leaving the next count() to rebuild it.
+                self._stamp_dirs(
+                    manifest,
+                    MemoryCategory.HISTORY,
+                    [history / name for name in sealed],
+                )
+                self._save_manifest(manifest)
+        return sealed
+
+    # ---------- Manifest ----------
+
+    def _record_dir(self, record: MemoryRecord) -> Path:
+        # Where a write of record just went, without a lookup.
+        if record.category == MemoryCategory.HISTORY:
+            path = self._history_path(record.id)
+            if path is not None:
+                return path.parent
+        cat_dir = self._cat_dir(record.category)
+        return layout_path(cat_dir, record.id, read_layout(cat_dir)).parent
+
+    def _stamp_dirs(self, manifest: dict, category: MemoryCategory, touched: List[Path]) -> None:
+        """
+        Record the mtimes of the directories a write touched (each with
+        its parents up to the category directory) in the manifest. Only
+        the MAX_STAMPED_DIRS most recently touched are kept per category,
+        so checking the stamps costs a bounded number of stats however
+        many shards or hour partitions exist.
+        """
+        cat_dir = self._cat_dir(category)
+        stamps = manifest["dir_stamps"].setdefault(category.value, {})
+        rels = set()
+        for d in touched:
+            rel = d.relative_to(cat_dir)
+            while rel != Path("."):
+                rels.add(rel.as_posix())
+                rel = rel.parent
+        # Deepest first, so the category directory ends up newest.
+        for rel in sorted(rels, key=lambda r: -r.count("/")) + [""]:
+            stamps.pop(rel, None)
+            stamps[rel] = _mtime(cat_dir / rel)
+        for rel in list(stamps)[: max(0, len(stamps) - MAX_STAMPED_DIRS)]:
+            if rel:
+                del stamps[rel]
+
+    def _stamps_current(self, manifest: dict) -> bool:
+        stamps = manifest.get("dir_stamps")
+        if not isinstance(stamps, dict) or set(stamps) != {c.value for c in MemoryCategory}:
+            return False
+        for category, dirs in stamps.items():
+            if not isinstance(dirs, dict) or "" not in dirs:
+                return False
+            cat_dir = self.base_dir / category
+            for rel, mtime in dirs.items():
+                if _mtime(cat_dir / rel) != mtime:
+                    return False
+        return True
+
+    def _manifest(self) -> dict:
+        """
+        Load the manifest, rebuilding it when it is missing, unreadable,
+        or one of the directories it stamped has changed (files added or
+        removed behind the store's back). Only the category directories
+        and the shards or hour partitions recently written are stamped:
+        a file dropped by hand anywhere else is picked up by the next
+        rebuild_manifest().
+        """
+        try:
+            # Status views ask for several counts in a row; reread the
+            # file only when it has been replaced.
+            version = file_version(self.manifest_path)
+            if self._manifest_text is None or self._manifest_text[0] != version:
+                self._manifest_text = (version, self.manifest_path.read_text(encoding="utf-8"))
+            manifest = json.loads(self._manifest_text[1])
+            if "seq" in manifest and self._stamps_current(manifest):
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return self.rebuild_manifest()
+
+    def rebuild_manifest(self) -> dict:
+        with self.lock:
+            counts: Dict[str, int] = {}
+            last_write_ns = 0
+            last_approved: Optional[str] = None
+
+            for category in MemoryCategory:
+                files = self._record_files(category)
+                counts[category.value] = len(files)
+                if category == MemoryCategory.HISTORY:
+                    # Loose files left by an interrupted seal are also
+                    # in the pack; count each id once.
+                    loose = {p.stem for p in files}
+                    counts[category.value] += sum(
+                        1
+                        for pack in self._sealed_packs()
+                        for record_id in pack.keys()
+                        if record_id not in loose
+                    )
+                for p in files:
+                    last_write_ns = max(last_write_ns, p.stat().st_mtime_ns)
+                if category in APPROVAL_REQUIRED:
+                    for r in self._load_all(category):
+                        if r.approval and r.approval.approved_at:
+                            last_approved = max(last_approved or "", r.approval.approved_at)
+
+            manifest = {
+                "version": 1,
+                "counts": counts,
+                "last_write_at": (
+                    datetime.fromtimestamp(last_write_ns / 1e9, timezone.utc).isoformat()
+                    if last_write_ns else None
+                ),
+                "last_approved_at": last_approved,
+                "seq": 0,
+                # Distinguishes this rebuild's sequence from the last one's.
+                "rebuilt": uuid.uuid4().hex,
+                "dir_stamps": {
+                    c.value: {"": _mtime(self._cat_dir(c))} for c in MemoryCategory
+                },
+            }
+            self._save_manifest(manifest)
+        return manifest
+
+    def _save_manifest(self, manifest: dict) -> None:
+        # Caller holds self.lock.
+        manifest["seq"] += 1
+        atomic_write_text(self.manifest_path, json.dumps(manifest, indent=2))
+
+
+# -----------------------------
+# File Layout
+# -----------------------------
+
+def record_files(cat_dir: Path, category: MemoryCategory) -> List[Path]:
+    """
+    Loose record files under a category directory of the file layout:
+    flat or ab/cd-sharded, or <day>/<hour>-partitioned for history.
+    """
+    if not cat_dir.is_dir():
+        return []
+    if category == MemoryCategory.HISTORY:
+        return list(cat_dir.glob("*.json")) + list(cat_dir.glob("*/*/*.json"))
+    return layout_files(cat_dir, read_layout(cat_dir))
+
+
+def history_pack_files(history_dir: Path) -> List[Path]:
+    """Sealed <day>/<hour>.pack files under the history directory."""
+    return sorted(history_dir.glob("*/*.pack"))
+
+
+def iter_tree_records(cat_dir: Path, category: MemoryCategory) -> Iterator[bytes]:
+    """
+    Every record stored under a category directory of the file layout,
+    as raw JSON: loose files first, then sealed history packs, each id
+    once (loose copies win). For reading a tree no MemoryStore has open,
+    e.g. when migrating it to another backend.
+    """
+    seen = set()
+    for path in record_files(cat_dir, category):
+        if path.stem in seen:
+            continue  # mid-reshard: flat and shard copy
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            continue
+        seen.add(path.stem)
+        yield data
+    if category == MemoryCategory.HISTORY:
+        for pack_path in history_pack_files(cat_dir):
+            for record_id, blob in PackReader(pack_path).items():
+                if record_id not in seen:
+                    seen.add(record_id)
+                    yield blob
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _order_keys(cat_dir: Path, category: MemoryCategory) -> Iterator[Tuple[str, str]]:
+    # (created_at, id) of every record, for rebuilding an order index.
+    for blob in iter_tree_records(cat_dir, category):
+        try:
+            d = json.loads(blob)
+            yield d["created_at"], d["id"]
+        except (ValueError, KeyError, TypeError):
+            continue  # unreadable files are skipped, as in list()
+
+
+def _partition_closed(day: str, hour: str, before: str) -> bool:
+    # The partition covers [day T hour, day T hour+1); it is closed once
+    # its end is not after `before`.
+    start = datetime.fromisoformat(f"{day}T{hour}:00:00+00:00")
+    end = start.timestamp() + 3600
+    cutoff = datetime.fromisoformat(before if "T" in before else f"{before}T00:00:00")
+    if cutoff.tzinfo is None:
+        cutoff = cutoff.replace(tzinfo=timezone.utc)
+    return end <= cutoff.timestamp()
+
+
+def _check_order(order: str) -> None:
+    if order != "created_at":
+        raise ValueError(f"Unsupported memory order: {order}")
+
+
+def record_from_dict(d: dict) -> MemoryRecord:
+    approval = None
+    if d.get("approval"):
+        approval = ApprovalInfo(**d["approval"])
+    return MemoryRecord(
+        id=d["id"],
+        category=MemoryCategory(d["category"]),
+        content=d["content"],
+        source=d["source"],
+        created_at=d["created_at"],
+        updated_at=d["updated_at"],
+        approval=approval,
+    )
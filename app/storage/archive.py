@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.storage.pack import PackReader, write_pack
+
+
+class PackArchive:
+    """
+    Cold tier for documents that are never modified again: they are moved
+    out of a store directory into numbered, compressed packs:
+
+      <archive_dir>/<NNNNNN>.pack
+
+    Each archive run adds one pack; when a key appears in several packs
+    the newest one wins. Stores read their loose (hot) files first and
+    fall back here, so a document written again after archiving shadows
+    its archived copy.
+
+    The key -> pack map is rebuilt only when the archive directory's
+    mtime changes, so a miss costs one stat.
+    """
+
+    def __init__(self, archive_dir: Path, codec: str = "lzma") -> None:
+        self.archive_dir = archive_dir
+        self.codec = codec
+        self._mtime: Optional[int] = None
+        self._readers: List[PackReader] = []
+        self._where: Dict[str, PackReader] = {}
+
+    # ---------- Queries ----------
+
+    def __contains__(self, key: str) -> bool:
+        self._refresh()
+        return key in self._where
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._where)
+
+    def keys(self) -> List[str]:
+        self._refresh()
+        return list(self._where)
+
+    def get(self, key: str) -> bytes:
+        self._refresh()
+        return self._where[key].get(key)
+
+    def load(self, key: str) -> dict:
+        return json.loads(self.get(key))
+
+    def items(self) -> Iterator[Tuple[str, bytes]]:
+        """Current (key, blob) pairs, decompressing each block once."""
+        self._refresh()
+        for reader in self._readers:
+            for key, blob in reader.items():
+                if self._where.get(key) is reader:
+                    yield key, blob
+
+    # ---------- Writes ----------
+
+    def add(self, items: Iterable[Tuple[str, bytes]]) -> Optional[Path]:
+        """
+        Write items as a new pack; returns its path, or None if there was
+        nothing to write. Callers hold the owning store's lock and only
+        remove the hot copies after this returns.
+        """
+        items = sorted(items)
+        if not items:
+            return None
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self._refresh()
+        seq = int(self._readers[-1].path.stem) + 1 if self._readers else 1
+        path = self.archive_dir / f"{seq:06d}.pack"
+        write_pack(path, items, codec=self.codec)
+        return path
+
+    # ---------- Internals ----------
+
+    def _refresh(self) -> None:
+        try:
+            mtime = self.archive_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = 0
+        if mtime == self._mtime:
+            return
+
+        known = {r.path: r for r in self._readers}
+        paths = sorted(self.archive_dir.glob("[0-9]*.pack")) if mtime else []
+        readers = [known.get(p) or PackReader(p) for p in paths]
+        self._readers = readers
+        self._where = {key: r for r in readers for key in r.keys()}
+        self._mtime = mtime
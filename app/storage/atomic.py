@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+
+# KIMIKO_FSYNC controls durability of store writes:
+#   off     rename only; survives a crashed process, not a power cut
+#   batch   fsync once per group of writes (see fsync_batch)
+#   always  fsync every file before it is renamed into place
+FSYNC_MODES = ("off", "batch", "always")
+DEFAULT_FSYNC_MODE = "off"
+
+_batch = threading.local()
+
+
+def fsync_mode() -> str:
+    mode = os.environ.get("KIMIKO_FSYNC", DEFAULT_FSYNC_MODE).strip().lower()
+    return mode if mode in FSYNC_MODES else DEFAULT_FSYNC_MODE
+
+
+def _fsync_path(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return  # replaced or removed since; whatever replaced it is synced itself
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_paths(paths: List[Path]) -> None:
+    """fsync each of paths (files or directories) now, once each."""
+    for p in dict.fromkeys(paths):
+        _fsync_path(p)
+
+
+def sync_written(paths: List[Path]) -> None:
+    """
+    Make paths (files or directories) durable according to KIMIKO_FSYNC.
+    Inside fsync_batch() the sync is deferred to the end of the batch.
+    """
+    mode = fsync_mode()
+    if mode == "off":
+        return
+    pending = getattr(_batch, "pending", None)
+    if mode == "batch" and pending is not None:
+        pending.extend(paths)
+        return
+    fsync_paths(paths)
+
+
+@contextmanager
+def fsync_batch() -> Iterator[None]:
+    """
+    Group commit for KIMIKO_FSYNC=batch: writes made inside the block are
+    synced once, together, when the outermost block exits.
+    """
+    if getattr(_batch, "pending", None) is not None:
+        yield
+        return
+    _batch.pending = []
+    try:
+        yield
+    finally:
+        pending, _batch.pending = _batch.pending, None
+        fsync_paths(pending)
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """
+    Replace path with text without ever exposing a partial file.
+    The content goes to a sibling temp file that is renamed over path.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            f.write(text)
+            if fsync_mode() == "always":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if fsync_mode() == "always":
+        _fsync_path(path.parent)
+    else:
+        sync_written([path, path.parent])
+
+
+def file_version(path: Path) -> tuple:
+    """
+    (mtime_ns, inode) of path, for cache validation. Every atomic rewrite
+    is a new inode, so this changes even when two writes land within one
+    mtime tick.
+    """
+    st = path.stat()
+    return (st.st_mtime_ns, st.st_ino)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from app.storage.atomic import file_version
+
+
+class DeltaLog:
+    """
+    The snapshot + delta-log scheme shared by the in-memory indexes:
+
+      <snapshot>     the index as of its last save, written by the owner
+      <delta>        one JSON line per document written since
+
+    The owner keeps its index in memory and calls refresh() before each
+    read: a full load (`load`, handed the snapshot path or None when
+    there is none) when the snapshot changed, otherwise `apply` for each
+    delta line not yet seen. Lines other processes appended are picked
+    up the same way, and a line still being written is left for the
+    next refresh.
+
+    Callers must hold the store lock around append() and truncate(), so
+    no line is lost to a concurrent truncation.
+
+    The log also records which store generation the index reflects, as
+    {"gen": ...} lines: truncate() starts the log with one, and append()
+    adds one when a write moves the store on from the generation the
+    index was at. A store generation the log does not name means
+    something wrote to the store without updating the index.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: Path,
+        delta_path: Path,
+        load: Callable[[Optional[Path]], None],
+        apply: Callable[[dict], None],
+    ) -> None:
+        self.snapshot_path = snapshot_path
+        self.delta_path = delta_path
+        self._load = load
+        self._apply = apply
+        self.entries = 0  # delta lines applied since the snapshot
+        self.generation: Optional[list] = None  # store generation, in JSON form
+        self._loaded_from: Optional[Tuple[Optional[tuple], int]] = None
+
+    def refresh(self) -> None:
+        snapshot = self._snapshot_version()
+        try:
+            delta_size = self.delta_path.stat().st_size
+        except FileNotFoundError:
+            delta_size = 0
+
+        start = 0
+        if self._loaded_from is not None and self._loaded_from[0] == snapshot:
+            if self._loaded_from[1] == delta_size:
+                return
+            if self._loaded_from[1] < delta_size:
+                start = self._loaded_from[1]
+
+        if start == 0:
+            self.entries = 0
+            self.generation = None
+            self._load(self.snapshot_path if snapshot is not None else None)
+
+        end = start
+        if delta_size:
+            with self.delta_path.open("rb") as f:
+                f.seek(start)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # a writer is mid-append; pick it up next time
+                    end += len(line)
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if "gen" in entry:
+                        self.generation = entry["gen"]
+                        continue
+                    self._apply(entry)
+                    self.entries += 1
+
+        self._loaded_from = (snapshot, end)
+
+    def append(self, entries: List[dict], moved: Optional[tuple] = None) -> None:
+        """
+        Log entries and apply them. When nothing else was appended since
+        the last refresh they are applied directly, without being parsed
+        back from the log.
+
+        moved is the (before, after) store generation of the write the
+        entries describe; the log follows it only from `before`.
+        """
+        self.refresh()
+        generation = self.generation
+        if moved is not None and generation is not None and generation == _plain(moved[0]):
+            generation = _plain(moved[1])
+            entries = entries + [{"gen": generation}]
+        data = _lines(entries)
+        with self.delta_path.open("ab") as f:
+            offset = f.tell()
+            f.write(data)
+        if self._loaded_from is not None and self._loaded_from[1] == offset:
+            for entry in entries:
+                if "gen" not in entry:
+                    self._apply(entry)
+                    self.entries += 1
+            self.generation = generation
+            self._loaded_from = (self._loaded_from[0], offset + len(data))
+        else:
+            self.refresh()
+
+    def truncate(self, generation: Optional[tuple] = None) -> None:
+        """
+        Empty the delta log once the owner has saved a new snapshot.
+        generation is the store generation the snapshot reflects; by
+        default the one the log was at.
+        """
+        if generation is not None:
+            self.generation = _plain(generation)
+        data = _lines([{"gen": self.generation}]) if self.generation is not None else b""
+        self.delta_path.write_bytes(data)
+        self.entries = 0
+        self._loaded_from = (self._snapshot_version(), len(data))
+
+    def covers(self, generation: Optional[tuple]) -> bool:
+        """Whether the index reflects the store as of `generation`."""
+        self.refresh()
+        return self.generation is not None and self.generation == _plain(generation)
+
+    def reload(self) -> None:
+        """Drop what was loaded and load again from disk."""
+        self._loaded_from = None
+        self.refresh()
+
+    def _snapshot_version(self) -> Optional[tuple]:
+        try:
+            return file_version(self.snapshot_path)
+        except FileNotFoundError:
+            return None
+
+
+def _plain(generation) -> list:
+    # Generations are compared in the form they take after a JSON round trip.
+    return json.loads(json.dumps(generation))
+
+
+def _lines(entries: List[dict]) -> bytes:
+    return "".join(
+        json.dumps(e, separators=(",", ":")) + "\n" for e in entries
+    ).encode("utf-8")
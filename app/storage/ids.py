@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+
+# ULID layout: 48-bit millisecond timestamp, then 80 random bits, as 26
+# Crockford base32 characters (10 + 16). Fixed width, so ids of one
+# prefix sort lexically in creation order.
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+TIME_CHARS = 10
+RANDOM_CHARS = 16
+RANDOM_BITS = 80
+
+_lock = threading.Lock()
+_last_ms = -1
+_last_random = 0
+
+
+def _encode(value: int, width: int) -> str:
+    out = []
+    for _ in range(width):
+        value, digit = divmod(value, 32)
+        out.append(ALPHABET[digit])
+    return "".join(reversed(out))
+
+
+def _decode(text: str) -> int:
+    value = 0
+    for ch in text.upper():
+        value = value * 32 + ALPHABET.index(ch)
+    return value
+
+
+def new_ulid() -> str:
+    """
+    A new 26-character ULID, monotonic within this process: ids minted in
+    the same millisecond (or after the clock stepped back) increment the
+    random part of the previous one instead of drawing a fresh one.
+    Across processes, 80 random bits keep ids apart.
+    """
+    global _last_ms, _last_random
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms <= _last_ms:
+            ms = _last_ms
+            rand = _last_random + 1
+            if rand >> RANDOM_BITS:
+                # 2^80 ids in one millisecond: borrow the next one.
+                ms, rand = ms + 1, int.from_bytes(os.urandom(10), "big") >> 1
+        else:
+            # Top bit clear leaves room to increment within the millisecond.
+            rand = int.from_bytes(os.urandom(10), "big") >> 1
+        _last_ms, _last_random = ms, rand
+    return _encode(ms, TIME_CHARS) + _encode(rand, RANDOM_CHARS)
+
+
+def new_id(prefix: str) -> str:
+    """`<prefix>-<ULID>`, e.g. mem-01JAB4Q1ZK3M8X9T6V2R5W7Y0C."""
+    return f"{prefix}-{new_ulid()}"
+
+
+def _legacy_ms(record_id: str) -> Optional[int]:
+    # Ids from before ULIDs: `<prefix>-<unix seconds>`.
+    suffix = record_id.rsplit("-", 1)[-1]
+    if not suffix.isdigit() or len(suffix) == TIME_CHARS + RANDOM_CHARS:
+        return None
+    return int(suffix) * 1000
+
+
+def id_time(record_id: str) -> Optional[datetime]:
+    """
+    Creation time encoded in an id from new_id/new_ulid (or a legacy
+    `<prefix>-<unix seconds>` id), else None.
+    """
+    ms = _legacy_ms(record_id)
+    if ms is None:
+        ulid = record_id.rsplit("-", 1)[-1]
+        if len(ulid) != TIME_CHARS + RANDOM_CHARS:
+            return None
+        try:
+            ms = _decode(ulid[:TIME_CHARS])
+        except ValueError:
+            return None
+    return datetime.fromtimestamp(ms / 1000, timezone.utc)
+
+
+def id_sort_key(record_id: str) -> Tuple[str, str]:
+    """
+    Sort key putting ids of one prefix in creation order. Legacy
+    `<prefix>-<unix seconds>` ids would otherwise sort after every ULID;
+    they are keyed as the smallest ULID of their second instead, with
+    the id itself breaking ties.
+    """
+    ms = _legacy_ms(record_id)
+    if ms is None:
+        return (record_id, record_id)
+    head, sep, _ = record_id.rpartition("-")
+    return (f"{head}{sep}{_encode(ms, TIME_CHARS)}{'0' * RANDOM_CHARS}", record_id)
+
+
+def id_floor(prefix: str, when: datetime) -> str:
+    """
+    The smallest id `prefix` could have been given at or after `when`,
+    for range scans over id-sorted listings without parsing ids.
+    """
+    ms = int(when.timestamp() * 1000)
+    return f"{prefix}-{_encode(ms, TIME_CHARS)}{'0' * RANDOM_CHARS}"
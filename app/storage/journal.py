@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.storage.atomic import atomic_write_text, fsync_mode
+from app.storage.ids import new_ulid
+from app.storage.locking import dir_lock, pid_alive
+
+
+# Once every transaction in the log has ended and the log is larger
+# than this, recovery truncates it.
+COMPACT_BYTES = 1 << 20
+
+# Recovery handler: (begin data, names of the steps logged) -> None.
+# Handlers must be idempotent; a crash during recovery replays them again.
+Handler = Callable[[dict, List[str]], None]
+
+# Transactions open in this process, so recovery run by another manager
+# in the same process does not replay them under their owner.
+_in_flight: set = set()
+_in_flight_mutex = threading.Lock()
+
+
+class Transaction:
+    def __init__(self, journal: "Journal", tx_id: str) -> None:
+        self.journal = journal
+        self.id = tx_id
+
+    def step(self, name: str) -> None:
+        """Record that the transaction got past `name`; synced like begin."""
+        self.journal._append({"tx": self.id, "op": "step", "name": name}, sync=True)
+
+
+class Journal:
+    """
+    Write-ahead journal for transitions that touch more than one file,
+    shared by every manager of a .kimiko tree:
+
+      .kimiko/journal/wal.log      JSON lines: begin / step / end per transaction
+      .kimiko/journal/checkpoint   byte offset before which every transaction ended
+
+    A transaction's begin record (its kind and everything needed to
+    finish it) is durable before any of its effects, and its end record is
+    appended once they are all written. Recovery reads only the log past
+    the checkpoint and hands each transaction that began but never ended
+    (and whose process is gone) to the handler registered for its kind.
+
+    Group commit: begin and step records are synced (per KIMIKO_FSYNC),
+    but one fsync covers every record appended before it, so concurrent
+    threads share it; end records are not synced at all, since a lost end
+    only costs an idempotent replay.
+    """
+
+    def __init__(self, state_dir: Path) -> None:
+        self.dir = state_dir / "journal"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.log_path = self.dir / "wal.log"
+        self.checkpoint_path = self.dir / "checkpoint"
+        self.lock = dir_lock(self.dir)
+        self._handlers: Dict[str, Handler] = {}
+
+        self._fd: Optional[int] = None
+        self._cond = threading.Condition()
+        self._appended = 0  # records this instance has written
+        self._synced = 0  # ... and of those, how many are known durable
+        self._syncing = False
+
+    def register(self, kind: str, handler: Handler) -> None:
+        self._handlers[kind] = handler
+
+    # ---------- Transactions ----------
+
+    @contextmanager
+    def transaction(self, kind: str, data: dict) -> Iterator[Transaction]:
+        """
+        Log the begin record, run the block, log the end record. If the
+        block raises, the transaction is left open for recovery to finish.
+        """
+        tx = Transaction(self, new_ulid())
+        with _in_flight_mutex:
+            _in_flight.add(tx.id)
+        try:
+            self._append(
+                {"tx": tx.id, "op": "begin", "kind": kind, "pid": os.getpid(), "data": data},
+                sync=True,
+            )
+            yield tx
+            self._append({"tx": tx.id, "op": "end"}, sync=False)
+        finally:
+            with _in_flight_mutex:
+                _in_flight.discard(tx.id)
+
+    # ---------- Recovery ----------
+
+    def recover(self) -> int:
+        """
+        Finish the open transactions of every registered kind; returns how
+        many were replayed. Transactions of other kinds, or whose process
+        is still running, stay open and hold the checkpoint back.
+        """
+        start = self._checkpoint()
+        entries, end = self._read_tail(start)
+
+        open_tx: Dict[str, Tuple[int, dict, List[str]]] = {}
+        for offset, entry in entries:
+            tx_id, op = entry.get("tx"), entry.get("op")
+            if op == "begin":
+                open_tx[tx_id] = (offset, entry, [])
+            elif op == "step" and tx_id in open_tx:
+                open_tx[tx_id][2].append(entry.get("name"))
+            elif op == "end":
+                open_tx.pop(tx_id, None)
+
+        replayed = 0
+        held: List[int] = []
+        for tx_id, (offset, begin, steps) in open_tx.items():
+            handler = self._handlers.get(begin.get("kind"))
+            with _in_flight_mutex:
+                ours = tx_id in _in_flight
+            pid = begin.get("pid")
+            running = isinstance(pid, int) and pid != os.getpid() and pid_alive(pid)
+            if handler is None or ours or running:
+                held.append(offset)
+                continue
+            handler(begin.get("data") or {}, steps)
+            self._append({"tx": tx_id, "op": "end"}, sync=False)
+            replayed += 1
+
+        self._advance(min(held) if held else end)
+        return replayed
+
+    # ---------- Internals ----------
+
+    def _append(self, entry: dict, sync: bool) -> None:
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        # The dir lock only excludes truncation by recovery; one O_APPEND
+        # write per record keeps concurrent appenders from interleaving.
+        with self.lock:
+            if self._fd is None:
+                self._fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            os.write(self._fd, line)
+            with self._cond:
+                self._appended += 1
+                ticket = self._appended
+        if sync and fsync_mode() != "off":
+            self._sync(ticket)
+
+    def _sync(self, ticket: int) -> None:
+        with self._cond:
+            while self._synced < ticket and self._syncing:
+                self._cond.wait()
+            if self._synced >= ticket:
+                return  # another thread's fsync covered this record
+            self._syncing = True
+            target = self._appended
+        try:
+            os.fsync(self._fd)
+        finally:
+            with self._cond:
+                self._synced = max(self._synced, target)
+                self._syncing = False
+                self._cond.notify_all()
+
+    def _checkpoint(self) -> int:
+        try:
+            offset = int(self.checkpoint_path.read_text(encoding="utf-8").strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+        try:
+            size = self.log_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        # Past the end: the log was truncated after the checkpoint was written.
+        return offset if offset <= size else 0
+
+    def _read_tail(self, start: int) -> Tuple[List[Tuple[int, dict]], int]:
+        entries: List[Tuple[int, dict]] = []
+        end = start
+        try:
+            with self.log_path.open("rb") as f:
+                f.seek(start)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # a writer is mid-append
+                    offset, end = end, end + len(line)
+                    try:
+                        entries.append((offset, json.loads(line)))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return entries, end
+
+    def _advance(self, offset: int) -> None:
+        with self.lock:
+            try:
+                size = self.log_path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if offset == size and size > COMPACT_BYTES:
+                # Everything has ended and nothing was appended since the
+                # scan (appends take this lock): start the log over.
+                os.truncate(self.log_path, 0)
+                offset = 0
+            try:
+                if self.checkpoint_path.read_text(encoding="utf-8").strip() == str(offset):
+                    return  # nothing ended since: read-only commands write nothing
+            except FileNotFoundError:
+                pass
+            atomic_write_text(self.checkpoint_path, str(offset))
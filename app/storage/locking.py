@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict
+
+from app.storage.atomic import fsync_batch
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: in-process locking only
+    fcntl = None
+
+
+LOCK_FILE = ".lock"
+
+
+class DirLock:
+    """
+    Advisory, re-entrant lock on a store directory.
+
+    Threads of one process serialize on an RLock; processes serialize on
+    flock() of <dir>/.lock, taken by the outermost holder only (flock
+    locks belong to the open file, so a second descriptor in the same
+    process would deadlock against the first). The outermost holder also
+    runs an fsync_batch(), so KIMIKO_FSYNC=batch syncs once per lock hold.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.path = directory / LOCK_FILE
+        self._mutex = threading.RLock()
+        self._depth = 0
+        self._fd: int | None = None
+        self._batch = None
+
+    def __enter__(self) -> "DirLock":
+        self._mutex.acquire()
+        if self._depth == 0:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except BaseException:
+                self._close()
+                self._mutex.release()
+                raise
+            self._batch = fsync_batch()
+            self._batch.__enter__()
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._depth -= 1
+        try:
+            if self._depth == 0:
+                try:
+                    self._batch.__exit__(*exc)
+                finally:
+                    self._batch = None
+                    self._close()
+        finally:
+            self._mutex.release()
+
+    def _close(self) -> None:
+        if self._fd is not None:
+            # Closing the descriptor releases the flock.
+            os.close(self._fd)
+            self._fd = None
+
+
+_locks: Dict[str, DirLock] = {}
+_locks_mutex = threading.Lock()
+
+
+def dir_lock(directory: Path) -> DirLock:
+    """The process-wide lock for directory (one per path, shared by all stores)."""
+    key = os.path.abspath(directory)
+    with _locks_mutex:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = DirLock(Path(key))
+        return lock
+
+
+def pid_alive(pid: int) -> bool:
+    """Whether process pid still exists (for spotting work a dead process left)."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
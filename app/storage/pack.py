@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import lzma
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+MAGIC = b"KPACK001"
+FOOTER = struct.Struct(">Q8s")  # index offset, magic
+
+# Records are compressed together in blocks of roughly this many bytes,
+# which compresses far better than per-record streams while keeping a
+# point read down to one block.
+BLOCK_BYTES = 64 * 1024
+
+CODECS = {
+    "zlib": (lambda b: zlib.compress(b, 6), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+# key -> (block offset, block length, offset in block, length)
+Entry = Tuple[int, int, int, int]
+
+
+class PackError(Exception):
+    pass
+
+
+def write_pack(path: Path, items: Iterable[Tuple[str, bytes]], codec: str = "zlib") -> int:
+    """
+    Write an immutable pack of (key, blob) pairs; returns the item count.
+
+    Layout: compressed blocks, then the compressed JSON offset index,
+    then a fixed footer pointing at the index. The file is written to a
+    temp name and renamed, so a pack either exists complete or not at all.
+    """
+    compress, _ = CODECS[codec]
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    index: Dict[str, Entry] = {}
+
+    with tmp.open("wb") as f:
+        block: List[Tuple[str, bytes]] = []
+        size = 0
+
+        def flush() -> None:
+            nonlocal size
+            if not block:
+                return
+            raw = b"".join(blob for _, blob in block)
+            data = compress(raw)
+            offset = f.tell()
+            f.write(data)
+            pos = 0
+            for key, blob in block:
+                index[key] = (offset, len(data), pos, len(blob))
+                pos += len(blob)
+            block.clear()
+            size = 0
+
+        for key, blob in items:
+            block.append((key, blob))
+            size += len(blob)
+            if size >= BLOCK_BYTES:
+                flush()
+        flush()
+
+        index_offset = f.tell()
+        f.write(compress(json.dumps({"codec": codec, "entries": index}).encode("utf-8")))
+        f.write(FOOTER.pack(index_offset, MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp, path)
+    os.chmod(path, 0o444)
+    return len(index)
+
+
+class PackReader:
+    """
+    Random access into a pack written by write_pack. The offset index is
+    loaded once; each read decompresses a single block.
+
+    Reads reopen the path, so a reader is only valid while the file it
+    indexed is still there: `version` is that file's (mtime_ns, inode),
+    comparable with app.storage.atomic.file_version().
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as f:
+            st = os.fstat(f.fileno())
+            self.version = (st.st_mtime_ns, st.st_ino)
+            f.seek(-FOOTER.size, os.SEEK_END)
+            end = f.tell()
+            index_offset, magic = FOOTER.unpack(f.read(FOOTER.size))
+            if magic != MAGIC:
+                raise PackError(f"Not a pack file: {path}")
+            f.seek(index_offset)
+            raw_index = f.read(end - index_offset)
+
+        for _, decompress in CODECS.values():
+            try:
+                meta = json.loads(decompress(raw_index))
+                break
+            except Exception:
+                continue
+        else:
+            raise PackError(f"Unreadable pack index: {path}")
+
+        self.codec = meta["codec"]
+        self._decompress = CODECS[self.codec][1]
+        self._entries: Dict[str, Entry] = {k: tuple(v) for k, v in meta["entries"].items()}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> List[str]:
+        return list(self._entries)
+
+    def get(self, key: str) -> bytes:
+        offset, length, pos, size = self._entries[key]
+        with self.path.open("rb") as f:
+            f.seek(offset)
+            block = self._decompress(f.read(length))
+        return block[pos:pos + size]
+
+    def items(self) -> Iterator[Tuple[str, bytes]]:
+        """All (key, blob) pairs, decompressing each block once."""
+        by_block: Dict[Tuple[int, int], List[Tuple[str, int, int]]] = {}
+        for key, (offset, length, pos, size) in self._entries.items():
+            by_block.setdefault((offset, length), []).append((key, pos, size))
+        with self.path.open("rb") as f:
+            for (offset, length), members in sorted(by_block.items()):
+                f.seek(offset)
+                block = self._decompress(f.read(length))
+                for key, pos, size in members:
+                    yield key, block[pos:pos + size]
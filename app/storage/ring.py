@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import struct
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from app.storage.locking import dir_lock
+
+
+MAGIC = b"KRING001"
+# magic, capacity, records ever appended; then a u32-prefixed JSON list
+# of field names, then `capacity` fixed-width slots of float64s
+HEADER = struct.Struct("<8sIQ")
+NAMES_LEN = struct.Struct("<I")
+
+Row = Tuple[float, ...]
+
+
+class RingFile:
+    """
+    Fixed-size ring of numeric rows in one file:
+
+      header | field names | capacity slots of len(fields) float64s
+
+    Row n lives in slot n % capacity, so the file never grows past its
+    preallocated size and the newest `capacity` rows are always kept.
+    A missing value is stored as NaN.
+
+    append() writes the slot before bumping the row count in the header,
+    so a torn append leaves the previous rows intact. Appends hold the
+    directory lock; reads take none and may see a row being overwritten
+    by a concurrent append when reading all `capacity` rows. Nothing is
+    fsynced: the ring holds metrics, and losing the last rows on a crash
+    is fine.
+
+    A file whose fields or capacity differ from the ones asked for (or
+    that is unreadable) is started over.
+    """
+
+    def __init__(self, path: Path, fields: Sequence[str], capacity: int = 1024) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.path = path
+        self.fields = list(fields)
+        self.capacity = capacity
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = dir_lock(self.path.parent)
+
+        names = json.dumps(self.fields).encode("utf-8")
+        self._header = HEADER.pack(MAGIC, capacity, 0) + NAMES_LEN.pack(len(names)) + names
+        self._data_start = len(self._header)
+        self._row = struct.Struct(f"<{len(self.fields)}d")
+
+    def __len__(self) -> int:
+        return max(0, min(self._appended(), self.capacity))
+
+    def append(self, values: Sequence[Optional[float]]) -> None:
+        if len(values) != len(self.fields):
+            raise ValueError(f"expected {len(self.fields)} values, got {len(values)}")
+        row = self._row.pack(*(math.nan if v is None else float(v) for v in values))
+        with self.lock:
+            appended = self._appended()
+            if appended < 0:
+                self._reset()
+                appended = 0
+            fd = os.open(self.path, os.O_RDWR)
+            try:
+                slot = appended % self.capacity
+                os.pwrite(fd, row, self._data_start + slot * self._row.size)
+                os.pwrite(fd, HEADER.pack(MAGIC, self.capacity, appended + 1), 0)
+            finally:
+                os.close(fd)
+
+    def rows(self, last: Optional[int] = None) -> List[Row]:
+        """The newest `last` rows (all kept rows when None), oldest first."""
+        appended = self._appended()
+        if appended <= 0:
+            return []
+        kept = min(appended, self.capacity)
+        n = kept if last is None else max(0, min(last, kept))
+        first = appended - n
+        out: List[Row] = []
+        with self.path.open("rb") as f:
+            # At most two contiguous runs of slots: up to the end of the
+            # file, then from its start.
+            while first < appended:
+                slot = first % self.capacity
+                run = min(appended - first, self.capacity - slot)
+                f.seek(self._data_start + slot * self._row.size)
+                data = f.read(run * self._row.size)
+                out.extend(self._row.iter_unpack(data))
+                first += run
+        return out
+
+    # ---------- Internals ----------
+
+    def _appended(self) -> int:
+        """Rows ever appended; -1 when the file must be started over."""
+        try:
+            with self.path.open("rb") as f:
+                head = f.read(self._data_start)
+        except FileNotFoundError:
+            return -1
+        if len(head) != self._data_start or head[HEADER.size:] != self._header[HEADER.size:]:
+            return -1
+        magic, capacity, appended = HEADER.unpack_from(head)
+        if magic != MAGIC or capacity != self.capacity:
+            return -1
+        return appended
+
+    def _reset(self) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(self._header)
+            f.truncate(self._data_start + self.capacity * self._row.size)
+        os.replace(tmp, self.path)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import List
+
+
+FLAT = "flat"
+SHARDED = "sharded"
+
+LAYOUT_FILE = ".layout"
+
+
+def shard_dir(base_dir: Path, key: str) -> Path:
+    """
+    Two-level hash-prefix directory for key: <base>/ab/cd/.
+    Hashing keeps shards even when keys share a prefix (timestamps).
+    """
+    h = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return base_dir / h[:2] / h[2:4]
+
+
+def read_layout(base_dir: Path) -> str:
+    try:
+        return (base_dir / LAYOUT_FILE).read_text(encoding="utf-8").strip() or FLAT
+    except FileNotFoundError:
+        return FLAT
+
+
+def write_layout(base_dir: Path, layout: str) -> None:
+    (base_dir / LAYOUT_FILE).write_text(layout + "\n", encoding="utf-8")
+
+
+def layout_path(base_dir: Path, key: str, layout: str, suffix: str = ".json") -> Path:
+    if layout == SHARDED:
+        return shard_dir(base_dir, key) / f"{key}{suffix}"
+    return base_dir / f"{key}{suffix}"
+
+
+def find_path(base_dir: Path, key: str, layout: str, suffix: str = ".json") -> Path:
+    """
+    Where key currently lives: the layout's own location, or the other
+    one for files a reshard (possibly in another process) has not moved
+    yet or already moved. At most two stats.
+    """
+    path = layout_path(base_dir, key, layout, suffix)
+    if not path.exists():
+        other = layout_path(base_dir, key, FLAT if layout == SHARDED else SHARDED, suffix)
+        if other.exists():
+            return other
+    return path
+
+
+def layout_files(base_dir: Path, layout: str, suffix: str = ".json") -> List[Path]:
+    files = list(base_dir.glob(f"*{suffix}"))
+    if layout == SHARDED:
+        files.extend(base_dir.glob(f"[0-9a-f][0-9a-f]/[0-9a-f][0-9a-f]/*{suffix}"))
+    return files
+
+
+def reshard(base_dir: Path, suffix: str = ".json") -> int:
+    """
+    Switch base_dir to the sharded layout and move flat files into shards.
+
+    The layout marker is written first, so every write from then on lands
+    in a shard while readers fall back to the flat location for files not
+    yet moved. Each move is a single rename; re-running is safe.
+    Returns the number of files moved.
+    """
+    base_dir.mkdir(parents=True, exist_ok=True)
+    write_layout(base_dir, SHARDED)
+    moved = 0
+    for path in list(base_dir.glob(f"*{suffix}")):
+        target = shard_dir(base_dir, path.name[: -len(suffix)]) / path.name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            # A newer copy was already written to the shard; it wins.
+            path.unlink(missing_ok=True)
+            continue
+        os.replace(path, target)
+        moved += 1
+    return moved
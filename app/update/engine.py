@@ -54,7 +54,7 @@ def _backup_files(repo_root: Path, backup_dir: Path, files: List[str]) -> None:
             dst.write_text("", encoding="utf-8")
 
 
-def _restore_backup(repo_root: Path, backup_dir: Path) -> None:
+def restore_backup(repo_root: Path, backup_dir: Path) -> None:
     for src in backup_dir.rglob("*"):
         if src.is_dir():
             continue
@@ -65,7 +65,16 @@ def _restore_backup(repo_root: Path, backup_dir: Path) -> None:
         dst.write_bytes(content)
 
 
-def apply_proposal(repo_root: Path, backups_root: Path, proposal: UpdateProposal) -> ApplyResult:
+def backup_dir_for(backups_root: Path, proposal: UpdateProposal) -> Path:
+    return backups_root / f"{proposal.id}-{_utc_stamp()}"
+
+
+def apply_proposal(
+    repo_root: Path,
+    backups_root: Path,
+    proposal: UpdateProposal,
+    backup_dir: Path | None = None,
+) -> ApplyResult:
     try:
         validate_proposal(proposal)
     except GuardrailViolation as e:
@@ -75,7 +84,7 @@ def apply_proposal(repo_root: Path, backups_root: Path, proposal: UpdateProposal
         return ApplyResult(False, f"Proposal must be APPROVED before apply. Current: {proposal.status.value}")
 
     files_to_backup = sorted(set([*proposal.scope, *[c.file for c in proposal.changes]]))
-    backup_dir = backups_root / f"{proposal.id}-{_utc_stamp()}"
+    backup_dir = backup_dir or backup_dir_for(backups_root, proposal)
     _backup_files(repo_root, backup_dir, files_to_backup)
 
     try:
@@ -92,11 +101,11 @@ def apply_proposal(repo_root: Path, backups_root: Path, proposal: UpdateProposal
 
         ok, msg = _run_healthcheck()
         if not ok:
-            _restore_backup(repo_root, backup_dir)
+            restore_backup(repo_root, backup_dir)
             return ApplyResult(False, f"Post-update health check failed; rolled back.\n{msg}", backup_dir=backup_dir)
 
         return ApplyResult(True, "Update applied successfully and health check passed.", backup_dir=backup_dir)
 
     except Exception as e:
-        _restore_backup(repo_root, backup_dir)
+        restore_backup(repo_root, backup_dir)
         return ApplyResult(False, f"Apply failed with exception; rolled back. {e}", backup_dir=backup_dir)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Dict, List, Literal, Optional
@@ -23,7 +23,7 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-@dataclass
+@dataclass(slots=True)
 class FileChange:
     file: str
     action: Literal["create", "modify", "delete"]
@@ -31,8 +31,16 @@ class FileChange:
     # Full-content replacement for v1.5 (simple + safe)
     new_content: Optional[str] = None
 
+    def to_dict(self) -> Dict:
+        return {
+            "file": self.file,
+            "action": self.action,
+            "description": self.description,
+            "new_content": self.new_content,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class UpdateProposal:
     id: str
     type: UpdateType
@@ -49,9 +57,23 @@ class UpdateProposal:
     notes: str = ""
 
     def to_dict(self) -> Dict:
-        d = asdict(self)
-        d["status"] = self.status.value
-        return d
+        # Field by field rather than asdict(), which deep-copies every
+        # change's new_content.
+        return {
+            "id": self.id,
+            "type": self.type,
+            "scope": list(self.scope),
+            "summary": self.summary,
+            "reason": self.reason,
+            "risk_level": self.risk_level,
+            "requires_restart": self.requires_restart,
+            "rollback_supported": self.rollback_supported,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "changes": [c.to_dict() for c in self.changes],
+            "notes": self.notes,
+        }
 
     @staticmethod
     def from_dict(d: Dict) -> "UpdateProposal":
@@ -78,3 +100,69 @@ class UpdateProposal:
             ],
             notes=d.get("notes", ""),
         )
+
+
+@dataclass(slots=True)
+class ProposalHeader:
+    """What listings and status views need of a proposal: no change payloads."""
+
+    id: str
+    type: UpdateType
+    status: ProposalStatus
+    summary: str
+    risk_level: RiskLevel
+    created_at: str
+    updated_at: str
+    change_count: int
+
+    @staticmethod
+    def from_proposal(p: UpdateProposal) -> "ProposalHeader":
+        return ProposalHeader(
+            id=p.id,
+            type=p.type,
+            status=p.status,
+            summary=p.summary,
+            risk_level=p.risk_level,
+            created_at=p.created_at,
+            updated_at=p.updated_at,
+            change_count=len(p.changes),
+        )
+
+    @staticmethod
+    def from_proposal_dict(d: Dict) -> "ProposalHeader":
+        # Straight from the stored JSON, without building FileChange objects.
+        return ProposalHeader(
+            id=d["id"],
+            type=d["type"],
+            status=ProposalStatus(d.get("status", "PROPOSED")),
+            summary=d.get("summary", ""),
+            risk_level=d.get("risk_level", "low"),
+            created_at=d.get("created_at", ""),
+            updated_at=d.get("updated_at", ""),
+            change_count=len(d.get("changes", [])),
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "type": self.type,
+            "status": self.status.value,
+            "summary": self.summary,
+            "risk_level": self.risk_level,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "change_count": self.change_count,
+        }
+
+    @staticmethod
+    def from_dict(d: Dict) -> "ProposalHeader":
+        return ProposalHeader(
+            id=d["id"],
+            type=d["type"],
+            status=ProposalStatus(d["status"]),
+            summary=d["summary"],
+            risk_level=d["risk_level"],
+            created_at=d["created_at"],
+            updated_at=d["updated_at"],
+            change_count=d["change_count"],
+        )
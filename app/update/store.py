@@ -1,53 +1,263 @@
 from __future__ import annotations
 
+import bisect
 import json
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional
 
-from app.update.models import UpdateProposal
+from app.storage.archive import PackArchive
+from app.storage.atomic import atomic_write_text, file_version
+from app.storage.ids import id_sort_key
+from app.storage.locking import dir_lock
+from app.update.models import ProposalHeader, ProposalStatus, UpdateProposal
 
 
 class ProposalStore:
     """
     File-based proposal store.
     One JSON file per proposal under .kimiko/proposals/<id>.json
+
+    Files are replaced atomically; `lock` serializes writers across
+    processes and is held by callers doing load-modify-save.
+
+    Applied and rejected proposals can be moved to the compressed
+    archive under .kimiko/proposals/archive/ (see archive()); load, list
+    and iter read through it, list_active/iter_active skip it.
+
+    .kimiko/proposals/headers.idx holds a ProposalHeader per proposal
+    (archived ones included) plus the mtime/size of its file, so listings
+    never parse change payloads (see list_headers()).
     """
 
+    # Final states: nothing moves a proposal out of these.
+    ARCHIVED_STATUSES = (ProposalStatus.APPLIED, ProposalStatus.REJECTED)
+
     def __init__(self, base_dir: Path) -> None:
         self.base_dir = base_dir
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.lock = dir_lock(self.base_dir)
+        self.archive_store = PackArchive(self.base_dir / "archive")
+        self.headers_path = self.base_dir / "headers.idx"
+        # (file version, entries) of the last headers.idx read
+        self._headers_cache: Optional[tuple] = None
 
     def _path(self, proposal_id: str) -> Path:
         return self.base_dir / f"{proposal_id}.json"
 
     def save(self, proposal: UpdateProposal) -> None:
-        path = self._path(proposal.id)
-        path.write_text(
-            json.dumps(proposal.to_dict(), indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
+        self.save_many([proposal])
+
+    def save_many(self, proposals: List[UpdateProposal]) -> None:
+        """Write proposals, rewriting headers.idx once for all of them."""
+        with self.lock:
+            entries = dict(self._header_entries())
+            for proposal in proposals:
+                path = self._path(proposal.id)
+                atomic_write_text(
+                    path,
+                    json.dumps(proposal.to_dict(), indent=2, ensure_ascii=False),
+                )
+                entries[proposal.id] = {
+                    "stat": _stat(path),
+                    "h": ProposalHeader.from_proposal(proposal).to_dict(),
+                }
+            self._write_headers(entries)
 
     def load(self, proposal_id: str) -> UpdateProposal:
         path = self._path(proposal_id)
-        if not path.exists():
+        if path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+        elif proposal_id in self.archive_store:
+            data = self.archive_store.load(proposal_id)
+        else:
             raise FileNotFoundError(f"Proposal not found: {proposal_id}")
-        data = json.loads(path.read_text(encoding="utf-8"))
         return UpdateProposal.from_dict(data)
 
-    def list_ids(self) -> List[str]:
+    def _hot_ids(self) -> List[str]:
         if not self.base_dir.exists():
             return []
-        return sorted(p.stem for p in self.base_dir.glob("*.json"))
+        return sorted((p.stem for p in self.base_dir.glob("*.json")), key=id_sort_key)
 
-    def list(self) -> List[UpdateProposal]:
-        items: List[UpdateProposal] = []
-        for pid in self.list_ids():
+    def list_ids(self, after: Optional[str] = None, limit: Optional[int] = None) -> List[str]:
+        """
+        Ids in creation order (id_sort_key, which also places legacy
+        numeric ids), only those past `after` when given, so this pages
+        through proposals oldest first (id_floor gives an `after` for a
+        time).
+        """
+        ids = sorted(set(self._hot_ids()) | set(self.archive_store.keys()), key=id_sort_key)
+        if after is not None:
+            ids = ids[bisect.bisect_right(ids, id_sort_key(after), key=id_sort_key):]
+        return ids[:limit] if limit is not None else ids
+
+    def iter(self) -> Iterator[UpdateProposal]:
+        """
+        Proposals one at a time: loose ones in id order, then archived
+        ones not shadowed by a loose copy. Unreadable ones are skipped.
+        """
+        hot = set()
+        for pid in self._hot_ids():
+            hot.add(pid)
             try:
-                items.append(self.load(pid))
+                yield self.load(pid)
             except Exception:
                 # Corrupted proposal files are skipped, not fatal
                 continue
-        return items
+        # Streamed: each archive block is decompressed once, as it is reached.
+        for pid, blob in self.archive_store.items():
+            if pid in hot:
+                continue
+            try:
+                yield UpdateProposal.from_dict(json.loads(blob))
+            except Exception:
+                continue
+
+    def list(self) -> List[UpdateProposal]:
+        return list(self.iter())
+
+    def iter_active(self) -> Iterator[UpdateProposal]:
+        """Only proposals still on disk as loose files; never opens the archive."""
+        for pid in self._hot_ids():
+            try:
+                data = json.loads(self._path(pid).read_text(encoding="utf-8"))
+                yield UpdateProposal.from_dict(data)
+            except Exception:
+                continue
+
+    def list_active(self) -> List[UpdateProposal]:
+        return list(self.iter_active())
+
+    def list_headers(
+        self, after: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[ProposalHeader]:
+        """
+        Headers of every proposal, archived ones included, in creation
+        order (paged like list_ids). Loose files are only stat'ed: one is parsed
+        only when it changed since it was indexed (written by something
+        other than save(), or a tree from before the index), and the index
+        is then brought up to date.
+        """
+        entries = self._header_entries()
+        current: Dict[str, dict] = {}
+        changed = False
+        for pid in self._hot_ids():
+            stat = _stat(self._path(pid))
+            entry = entries.get(pid)
+            if stat is None:
+                continue
+            if entry is not None and entry["stat"] == stat:
+                current[pid] = entry
+                continue
+            try:
+                data = json.loads(self._path(pid).read_text(encoding="utf-8"))
+                header = ProposalHeader.from_proposal_dict(data)
+            except (OSError, ValueError, KeyError, TypeError):
+                continue  # unreadable files are skipped, as in iter()
+            current[pid] = {"stat": stat, "h": header.to_dict()}
+            changed = True
+        for pid, entry in entries.items():
+            if pid in current:
+                continue
+            changed = changed or entry["stat"] is not None
+            if entry["stat"] is None:
+                current[pid] = entry
+            elif pid in self.archive_store:
+                # Archived by a process whose index write this one raced.
+                header = ProposalHeader.from_proposal_dict(self.archive_store.load(pid))
+                current[pid] = {"stat": None, "h": header.to_dict()}
+        if changed:
+            with self.lock:
+                self._write_headers(current)
+
+        ids = sorted(current, key=id_sort_key)
+        if after is not None:
+            ids = ids[bisect.bisect_right(ids, id_sort_key(after), key=id_sort_key):]
+        if limit is not None:
+            ids = ids[:limit]
+        return [ProposalHeader.from_dict(current[pid]["h"]) for pid in ids]
 
     def exists(self, proposal_id: str) -> bool:
-        return self._path(proposal_id).exists()
+        return self._path(proposal_id).exists() or proposal_id in self.archive_store
+
+    def generation(self) -> tuple:
+        """
+        A token that changes whenever list_headers() may answer differently:
+        every save() and archive() replaces headers.idx, and any proposal
+        file written, added or removed moves the directory mtime.
+        """
+        try:
+            headers = file_version(self.headers_path)
+        except FileNotFoundError:
+            headers = None
+        return (headers, self.base_dir.stat().st_mtime_ns)
+
+    # ---------- Archive ----------
+
+    def archive(self, before: Optional[str] = None) -> List[str]:
+        """
+        Move applied/rejected proposals last updated before `before` (an
+        ISO-8601 prefix; all of them when None) into a new archive pack.
+
+        The pack is complete on disk before any loose file is removed, and
+        loose files win over archived copies, so an interrupted run only
+        needs re-running. Returns the archived ids.
+        """
+        with self.lock:
+            items = []
+            for p in self.iter_active():
+                if p.status not in self.ARCHIVED_STATUSES:
+                    continue
+                if before is not None and p.updated_at >= before:
+                    continue
+                items.append((p.id, json.dumps(p.to_dict(), ensure_ascii=False).encode("utf-8")))
+            self.archive_store.add(items)
+            for pid, _ in items:
+                self._path(pid).unlink(missing_ok=True)
+            if items:
+                entries = dict(self._header_entries())
+                for pid, blob in items:
+                    header = ProposalHeader.from_proposal_dict(json.loads(blob))
+                    entries[pid] = {"stat": None, "h": header.to_dict()}
+                self._write_headers(entries)
+        return sorted(pid for pid, _ in items)
+
+    # ---------- Internals ----------
+
+    def _header_entries(self) -> Dict[str, dict]:
+        """id -> {"stat": [mtime_ns, size, inode] or None once archived, "h": header}."""
+        try:
+            version = file_version(self.headers_path)
+        except FileNotFoundError:
+            version = None
+        if self._headers_cache is not None and self._headers_cache[0] == version:
+            return self._headers_cache[1]
+        entries = None
+        if version is not None:
+            try:
+                entries = json.loads(self.headers_path.read_text(encoding="utf-8"))["entries"]
+            except (ValueError, KeyError, TypeError):
+                entries = None
+        if entries is None:
+            # Missing or unreadable: start from the archive; list_headers
+            # picks up the loose files.
+            entries = {
+                pid: {"stat": None, "h": ProposalHeader.from_proposal_dict(json.loads(blob)).to_dict()}
+                for pid, blob in self.archive_store.items()
+            }
+        self._headers_cache = (version, entries)
+        return entries
+
+    def _write_headers(self, entries: Dict[str, dict]) -> None:
+        atomic_write_text(
+            self.headers_path,
+            json.dumps({"version": 1, "entries": entries}, ensure_ascii=False),
+        )
+        self._headers_cache = (file_version(self.headers_path), entries)
+
+
+def _stat(path: Path) -> Optional[list]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
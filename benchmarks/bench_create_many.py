@@ -0,0 +1,59 @@
+"""
+Records/sec for per-record memory writes vs. create_many group commits.
+
+Run from the repo root:
+  python -m benchmarks.bench_create_many [--records N] [--backend file|segment|sqlite]
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from app.memory.manager import MemoryManager
+
+
+def _payloads(n: int) -> list[dict]:
+    return [{"event": "ingest", "seq": i, "note": f"record {i}"} for i in range(n)]
+
+
+def bench_single(backend: str, n: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        mm = MemoryManager(Path(tmp), backend=backend)
+        payloads = _payloads(n)
+        start = time.perf_counter()
+        for content in payloads:
+            mm.append_history(content)
+        return n / (time.perf_counter() - start)
+
+
+def bench_batch(backend: str, n: int, batch_size: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        mm = MemoryManager(Path(tmp), backend=backend)
+        payloads = _payloads(n)
+        start = time.perf_counter()
+        for i in range(0, n, batch_size):
+            mm.append_history_many(payloads[i:i + batch_size])
+        return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--backend", action="append")
+    args = parser.parse_args()
+
+    for backend in args.backend or ["file", "segment", "sqlite"]:
+        single = bench_single(backend, args.records)
+        batch = bench_batch(backend, args.records, args.batch_size)
+        print(
+            f"{backend:8s} append_history: {single:10.0f} rec/s   "
+            f"append_history_many({args.batch_size}): {batch:10.0f} rec/s   "
+            f"({batch / single:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
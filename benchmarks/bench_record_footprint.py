@@ -0,0 +1,86 @@
+"""
+Memory footprint of 100k loaded memory records.
+
+Run from the repo root:
+  python -m benchmarks.bench_record_footprint [--records N]
+
+Measures (tracemalloc, MiB retained after loading):
+  - file-style loads: records built from parsed JSON dicts
+  - sqlite listing: SqliteMemoryStore.list() over the whole category
+  - to_dict: time to serialize every loaded record
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.memory.models import MemoryCategory
+from app.memory.sqlite_store import SqliteMemoryStore
+from app.memory.store import record_from_dict
+
+
+def _content(i: int) -> dict:
+    return {
+        "title": f"project {i}",
+        "notes": "lorem ipsum dolor sit amet " * 30,
+        "tags": ["alpha", "beta", "gamma"],
+    }
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / (1024 * 1024), elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.records
+
+    dicts = [
+        {
+            "id": f"{i:08d}",
+            "category": "projects",
+            "content": _content(i),
+            "source": "kimiko",
+            "created_at": "2026-10-17T00:00:00+00:00",
+            "updated_at": "2026-10-17T00:00:00+00:00",
+            "approval": None,
+        }
+        for i in range(n)
+    ]
+    records, mib, secs = _measure(lambda: [record_from_dict(d) for d in dicts])
+    print(f"file-style load   {n} records: {mib:8.1f} MiB retained  {secs:6.2f}s")
+
+    start = time.perf_counter()
+    for r in records:
+        r.to_dict()
+    print(f"to_dict           {n} records: {time.perf_counter() - start:6.2f}s")
+    del records, dicts
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SqliteMemoryStore(Path(tmp))
+        for i in range(0, n, 5000):
+            store.create_many(
+                MemoryCategory.PROJECTS,
+                [_content(j) for j in range(i, min(n, i + 5000))],
+                source="kimiko",
+            )
+        listed, mib, secs = _measure(lambda: store.list(MemoryCategory.PROJECTS))
+        print(f"sqlite list()     {len(listed)} records: {mib:8.1f} MiB retained  {secs:6.2f}s")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
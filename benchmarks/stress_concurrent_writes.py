@@ -0,0 +1,146 @@
+"""
+Concurrent writer processes against one .kimiko tree.
+
+Each worker process writes projects records (one at a time and in
+batches) and bumps a shared update proposal with load-modify-save under
+the proposal store lock. Afterwards the tree is checked for lost or torn
+records and lost proposal updates, and write throughput is reported.
+
+Run from the repo root:
+  python -m benchmarks.stress_concurrent_writes [--workers N] [--records N]
+      [--backend file|segment|sqlite] [--fsync off|batch|always]
+
+Exits non-zero if any check fails.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.update_manager import UpdateManager
+from app.memory.backends import open_memory_store
+from app.memory.models import MemoryCategory
+from app.update.models import UpdateProposal
+
+SHARED_PROPOSAL = "stress-counter"
+
+
+def _worker(root: str, backend: str, worker: int, records: int, bumps: int) -> list:
+    repo_root = Path(root)
+    store = open_memory_store(repo_root, backend)
+    updates = UpdateManager(repo_root)
+    ids = []
+
+    half = records // 2
+    for i in range(half):
+        r = store.create(MemoryCategory.PROJECTS, {"worker": worker, "seq": i}, source="kimiko")
+        ids.append(r.id)
+    for start in range(half, records, 50):
+        batch = [
+            {"worker": worker, "seq": i}
+            for i in range(start, min(records, start + 50))
+        ]
+        ids.extend(r.id for r in store.create_many(MemoryCategory.PROJECTS, batch, source="kimiko"))
+
+    for _ in range(bumps):
+        with updates.store.lock:
+            p = updates.load(SHARED_PROPOSAL)
+            p.notes = str(int(p.notes or "0") + 1)
+            updates.store.save(p)
+    return ids
+
+
+def _check_files(repo_root: Path) -> int:
+    """Number of record files under the file backend that do not parse."""
+    torn = 0
+    for p in (repo_root / ".kimiko" / "memory" / "projects").rglob("*.json"):
+        try:
+            json.loads(p.read_text(encoding="utf-8"))
+        except ValueError:
+            torn += 1
+    return torn
+
+
+def run(backend: str, workers: int, records: int, bumps: int) -> bool:
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_root = Path(tmp)
+        UpdateManager(repo_root).propose(
+            UpdateProposal(
+                id=SHARED_PROPOSAL,
+                type="self-update",
+                scope=[],
+                summary="stress counter",
+                reason="stress test",
+            )
+        )
+
+        ctx = multiprocessing.get_context("spawn")
+        start = time.perf_counter()
+        with ctx.Pool(workers) as pool:
+            results = pool.starmap(
+                _worker,
+                [(tmp, backend, w, records, bumps) for w in range(workers)],
+            )
+        elapsed = time.perf_counter() - start
+
+        expected = {i for ids in results for i in ids}
+        store = open_memory_store(repo_root, backend)
+        found = {r.id for r in store.list(MemoryCategory.PROJECTS)}
+        counter = int(UpdateManager(repo_root).load(SHARED_PROPOSAL).notes or "0")
+
+        checks = {
+            "ids unique": len(expected) == workers * records,
+            "no lost records": expected <= found,
+            "no extra records": found <= expected,
+            "count() matches": store.count(MemoryCategory.PROJECTS) == len(expected),
+            "no lost proposal updates": counter == workers * bumps,
+        }
+        if backend == "file":
+            checks["no torn files"] = _check_files(repo_root) == 0
+            checks["order index complete"] = sum(
+                1 for _ in store.iter(MemoryCategory.PROJECTS)
+            ) == len(expected)
+
+        total = workers * records
+        print(
+            f"{backend:8s} fsync={os.environ.get('KIMIKO_FSYNC', 'off'):6s} "
+            f"{workers} workers x {records} records: "
+            f"{total / elapsed:8.0f} rec/s  ({elapsed:.2f}s)"
+        )
+        ok = True
+        for name, passed in checks.items():
+            if not passed:
+                ok = False
+                print(f"  FAIL {name}")
+        if ok:
+            print(f"  ok: {len(found)} records, {counter} proposal updates")
+        return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--bumps", type=int, default=50)
+    parser.add_argument("--backend", action="append")
+    parser.add_argument("--fsync", choices=["off", "batch", "always"])
+    args = parser.parse_args()
+
+    if args.fsync:
+        # Inherited by the spawned workers.
+        os.environ["KIMIKO_FSYNC"] = args.fsync
+
+    ok = True
+    for backend in args.backend or ["file", "segment", "sqlite"]:
+        ok = run(backend, args.workers, args.records, args.bumps) and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
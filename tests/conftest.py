@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.memory.models import MemoryCategory, MemoryRecord  # noqa: E402
+from app.memory.store import _new_id  # noqa: E402
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """An empty repo root; stores create .kimiko/ under it."""
+    return tmp_path
+
+
+def history_records(hour: str, n: int, start: int = 0) -> list:
+    """
+    n history records created within `hour` ("2020-01-01T05"), so they
+    land in one partition regardless of the wall clock.
+    """
+    records = []
+    for i in range(start, start + n):
+        created_at = f"{hour}:00:{i:02d}.000000+00:00"
+        records.append(
+            MemoryRecord(
+                id=_new_id(MemoryCategory.HISTORY, created_at),
+                category=MemoryCategory.HISTORY,
+                content={"i": i},
+                source="test",
+                created_at=created_at,
+                updated_at=created_at,
+            )
+        )
+    return records
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from app.memory.models import MemoryCategory
+from app.memory.store import MemoryStore
+
+PROJECTS = MemoryCategory.PROJECTS
+ROOT = Path(__file__).resolve().parents[1]
+
+# Writes a batch of 10 records and dies (os._exit, so nothing is cleaned
+# up) at the step named by argv[2].
+CRASHING_WRITER = textwrap.dedent(
+    """
+    import os, sys
+    from pathlib import Path
+    import app.memory.store as store_module
+    from app.memory.models import MemoryCategory
+    from app.memory.store import MemoryStore
+
+    repo, step = Path(sys.argv[1]), sys.argv[2]
+    real_write, real_replace = store_module.atomic_write_text, os.replace
+    moved = []
+
+    def write(path, text):
+        if step == "before-commit" and Path(path).name == "COMMIT":
+            os._exit(3)
+        real_write(path, text)
+
+    def replace(src, dst):
+        if step == "mid-rename" and len(moved) == 5:
+            os._exit(3)
+        moved.append(dst)
+        real_replace(src, dst)
+
+    store_module.atomic_write_text = write
+    store_module.os.replace = replace
+    store = MemoryStore(repo)
+    store.create_many(MemoryCategory.PROJECTS, [{"n": i} for i in range(10)], source="test")
+    """
+)
+
+
+def _crash(repo: Path, step: str) -> None:
+    result = subprocess.run(
+        [sys.executable, "-c", CRASHING_WRITER, str(repo), step],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+    )
+    assert result.returncode == 3
+
+
+@pytest.mark.parametrize("step, survivors", [("before-commit", 0), ("mid-rename", 10)])
+def test_batch_interrupted_by_a_crash_is_all_or_nothing(repo, step, survivors):
+    MemoryStore(repo)  # lay out the store before the writer dies in it
+    _crash(repo, step)
+    batches = repo / ".kimiko" / "memory" / ".batches"
+    assert len(list(batches.iterdir())) == 1
+
+    store = MemoryStore(repo)
+    assert sorted(r.content["n"] for r in store.list(PROJECTS)) == list(range(survivors))
+    assert store.count(PROJECTS) == survivors
+    assert list(batches.iterdir()) == []
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import pytest
+
+from app.cli_main import RuntimeState, _run_command
+from app.core.update_manager import UpdateManager
+from app.memory.manager import MemoryManager
+from app.memory.models import MemoryCategory
+from app.memory.proposals import MemoryProposalStatus
+from app.memory.sqlite_store import SqliteMemoryStore
+from app.storage.ids import new_id
+from app.update.models import UpdateProposal
+
+
+@pytest.fixture
+def state(repo):
+    return RuntimeState(
+        repo_root=repo,
+        update_manager=UpdateManager(repo),
+        memory_manager=MemoryManager(repo),
+    )
+
+
+def run(state, capsys, line):
+    parts = line.split()
+    _run_command(state, parts[0].lower(), parts)
+    return capsys.readouterr().out
+
+
+def _updates(state, n):
+    ids = []
+    for i in range(n):
+        p = UpdateProposal(
+            id=new_id("update"), type="self-update", scope=[], summary=f"u{i}", reason="test"
+        )
+        state.update_manager.propose(p)
+        ids.append(p.id)
+    return ids
+
+
+@pytest.mark.parametrize(
+    "line", ["update list --limit x", "update list --limit 0", "update list --after"]
+)
+def test_update_list_bad_options_print_usage(state, capsys, line):
+    assert run(state, capsys, line).startswith("Usage: update list")
+
+
+def test_update_list_pages(state, capsys):
+    ids = _updates(state, 3)
+    out = run(state, capsys, "update list --limit 2")
+    assert [l.split()[1] for l in out.splitlines()] == ids[:2]
+    out = run(state, capsys, f"update list --after {ids[1]}")
+    assert [l.split()[1] for l in out.splitlines()] == ids[2:]
+
+
+def test_update_on_missing_proposal_keeps_the_session(state, capsys):
+    assert "not found" in run(state, capsys, "update approve update-nope")
+
+
+def test_memory_proposals_pages(state, capsys):
+    mm = state.memory_manager
+    ids = [mm.propose(MemoryCategory.FACTS, {"i": i}, reason="r").id for i in range(3)]
+    out = run(state, capsys, f"memory proposals --after {ids[0]} --limit 1")
+    assert [l.split()[1] for l in out.splitlines()] == [ids[1]]
+    assert run(state, capsys, "memory proposals --limit no").startswith("Usage: memory proposals")
+
+
+def _memory_proposals(state):
+    mm = state.memory_manager
+    return {
+        "tool_fact": mm.propose(MemoryCategory.FACTS, {"a": 1}, "import-batch", source="tool"),
+        "tool_fact2": mm.propose(MemoryCategory.FACTS, {"a": 2}, "import-batch", source="tool"),
+        "own_fact": mm.propose(MemoryCategory.FACTS, {"a": 3}, "cleanup-old"),
+        "tool_pref": mm.propose(MemoryCategory.PREFERENCES, {"a": 4}, "cleanup-old", source="tool"),
+    }
+
+
+def _status(state, proposal):
+    return state.memory_manager.proposals.load(proposal.id).status
+
+
+def test_memory_approve_all_matching(state, capsys):
+    props = _memory_proposals(state)
+    out = run(state, capsys, "memory approve --all-matching --category facts --source tool")
+    assert out.splitlines() == ["Approved 2 proposal(s)."]
+
+    stored = state.memory_manager.list_memory(MemoryCategory.FACTS)
+    assert sorted(r.content["a"] for r in stored) == [1, 2]
+    assert _status(state, props["tool_fact"]) == MemoryProposalStatus.APPLIED
+    assert _status(state, props["own_fact"]) == MemoryProposalStatus.PROPOSED
+    assert _status(state, props["tool_pref"]) == MemoryProposalStatus.PROPOSED
+
+    # Nothing left that matches.
+    out = run(state, capsys, "memory approve --all-matching --category facts --source tool")
+    assert out.splitlines() == ["Approved 0 proposal(s)."]
+
+
+def test_memory_reject_all_matching_with_note(state, capsys):
+    props = _memory_proposals(state)
+    out = run(state, capsys, "memory reject --all-matching --reason ^cleanup --note stale")
+    assert out.splitlines() == ["Rejected 2 proposal(s)."]
+
+    for key in ("own_fact", "tool_pref"):
+        rejected = state.memory_manager.proposals.load(props[key].id)
+        assert (rejected.status, rejected.notes) == (MemoryProposalStatus.REJECTED, "stale")
+    assert _status(state, props["tool_fact"]) == MemoryProposalStatus.PROPOSED
+    assert state.memory_manager.list_memory(MemoryCategory.FACTS) == []
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "memory approve --all-matching --category nope",
+        "memory reject --all-matching --note",
+    ],
+)
+def test_memory_bulk_bad_selector_keeps_the_session(state, capsys, line):
+    props = _memory_proposals(state)
+    assert run(state, capsys, line).startswith("Memory error:")
+    assert all(_status(state, p) == MemoryProposalStatus.PROPOSED for p in props.values())
+
+
+def test_memory_import_sqlite_copies_the_file_tree(state, repo, capsys):
+    records = [state.memory_manager.write_project({"n": i}) for i in range(3)]
+    state.memory_manager.append_history({"event": "x"})
+
+    out = run(state, capsys, "memory import-sqlite").splitlines()
+    assert out[0] == f"Imported 4 record(s) into {repo / '.kimiko' / 'memory' / 'memory.sqlite3'}"
+    assert "KIMIKO_MEMORY_BACKEND=sqlite" in out[1]
+
+    db = SqliteMemoryStore(repo)
+    try:
+        assert sorted(r.id for r in db.list(MemoryCategory.PROJECTS)) == sorted(
+            r.id for r in records
+        )
+        assert db.count(MemoryCategory.HISTORY) == 1
+    finally:
+        db.close()
+    assert run(state, capsys, "memory import-sqlite").startswith("Imported 0 record(s)")
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+
+from app.core.diagnostics import (
+    DiagnosticResult,
+    RegisteredCheck,
+    diagnostics_to_json,
+    run_diagnostics,
+)
+
+calls = []
+
+
+def _check(name, cost, status="OK", sleep=0.0, budget_ms=100.0):
+    def func(snapshot):
+        calls.append(name)
+        time.sleep(sleep)
+        return DiagnosticResult(name=name, status=status, message=status)
+
+    return RegisteredCheck(name=name, func=func, cost=cost, budget_ms=budget_ms)
+
+
+def test_a_failing_class_skips_the_costlier_ones():
+    calls.clear()
+    checks = [
+        _check("expensive", "expensive"),
+        _check("broken", "cheap", status="FAIL"),
+        _check("fine", "cheap"),
+        _check("moderate", "moderate"),
+    ]
+    report = run_diagnostics(None, checks)
+
+    assert sorted(calls) == ["broken", "fine"]
+    assert [r.name for r in report.results] == ["broken", "fine"]
+    assert report.skipped == ["moderate", "expensive"]
+    assert report.skip_reason == "fail"
+    assert report.overall == "FAIL"
+    assert diagnostics_to_json(report)["skip_reason"] == "fail"
+
+
+def test_spent_budget_skips_the_costlier_classes():
+    calls.clear()
+    checks = [
+        _check("cheap", "cheap", budget_ms=5.0),
+        _check("slow", "moderate", sleep=0.1, budget_ms=50.0),
+        _check("expensive", "expensive", budget_ms=100.0),
+    ]
+    report = run_diagnostics(None, checks, budget_ms=150.0)
+
+    assert calls == ["cheap", "slow"]
+    assert report.results[1].over_budget
+    assert report.skipped == ["expensive"]
+    assert report.skip_reason == "budget"
+    assert report.overall == "OK"
+
+
+def test_checks_within_budget_all_run():
+    calls.clear()
+    checks = [
+        _check("cheap", "cheap", budget_ms=5.0),
+        _check("moderate", "moderate", budget_ms=50.0),
+        _check("expensive", "expensive", budget_ms=100.0),
+    ]
+    report = run_diagnostics(None, checks, budget_ms=1000.0)
+
+    assert sorted(calls) == ["cheap", "expensive", "moderate"]
+    assert (report.skipped, report.skip_reason) == ([], None)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import pytest
+
+from app.memory.backends import MEMORY_BACKENDS, open_memory_store
+from app.memory.models import MemoryCategory
+
+PROJECTS = MemoryCategory.PROJECTS
+
+
+@pytest.mark.parametrize("backend", sorted(MEMORY_BACKENDS))
+def test_generation_moves_only_on_writes(repo, backend):
+    store = open_memory_store(repo, backend)
+    store.create(PROJECTS, {"n": 0}, source="test")
+    before = store.generation()
+
+    store.count(PROJECTS)
+    list(store.iter(PROJECTS))
+    assert store.generation() == before
+
+    record = store.create(PROJECTS, {"n": 1}, source="test")
+    after_create = store.generation()
+    assert after_create != before
+    store.update(PROJECTS, record.id, {"n": 2})
+    assert store.generation() != after_create
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import pytest
+
+from app.memory.models import MemoryCategory
+from app.memory.store import MemoryStore
+
+from conftest import history_records
+
+HISTORY = MemoryCategory.HISTORY
+
+
+def test_reseal_by_another_instance_is_picked_up(repo):
+    a = MemoryStore(repo)
+    b = MemoryStore(repo)
+    records = history_records("2020-01-01T05", 6)
+    b.import_many(records)
+    assert b.seal_history("2020-01-02") == ["2020-01-01/05"]
+
+    assert len(a.list(HISTORY)) == 6
+    first = records[0]
+    assert a.get(HISTORY, first.id).content == {"i": 0}
+
+    # B folds a late write into the same hour; the pack is rewritten.
+    b.import_many(history_records("2020-01-01T05", 1, start=6))
+    b.seal_history("2020-01-02")
+
+    assert sorted(r.content["i"] for r in a.list(HISTORY)) == list(range(7))
+    assert a.get(HISTORY, first.id).content == {"i": 0}
+    assert a.rebuild_manifest()["counts"]["history"] == 7
+
+
+def test_lookups_do_not_recreate_sealed_hours(repo):
+    store = MemoryStore(repo)
+    records = history_records("2020-01-01T05", 2)
+    store.import_many(records)
+    store.seal_history("2020-01-02")
+    hour_dir = repo / ".kimiko" / "memory" / "history" / "2020-01-01" / "05"
+    assert not hour_dir.exists()
+
+    assert store.get(HISTORY, records[0].id).content == {"i": 0}
+    missing = history_records("2020-01-01T05", 1)[0]
+    try:
+        store.get(HISTORY, missing.id)
+    except FileNotFoundError:
+        pass
+    assert not hour_dir.exists()
+
+
+def test_interrupted_seal_lists_and_counts_each_record_once(repo, monkeypatch):
+    store = MemoryStore(repo)
+    store.import_many(history_records("2020-01-01T05", 4))
+
+    def crash(path, *args, **kwargs):
+        raise OSError("crashed before removing the sealed files")
+
+    # The pack is written, then the seal dies before removing the hour.
+    monkeypatch.setattr("app.memory.store.shutil.rmtree", crash)
+    with pytest.raises(OSError):
+        store.seal_history("2020-01-02")
+    monkeypatch.undo()
+
+    assert len(store.list(HISTORY)) == 4
+    assert store.rebuild_manifest()["counts"]["history"] == 4
+    assert len(list(store.iter(HISTORY))) == 4
+
+    # Re-running finishes the seal.
+    assert store.seal_history("2020-01-02") == ["2020-01-01/05"]
+    assert len(store.list(HISTORY)) == 4
+    assert store.count(HISTORY) == 4
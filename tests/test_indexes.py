@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+import math
+
+import pytest
+
+from app.memory.backends import MEMORY_BACKENDS, open_memory_store
+from app.memory.field_index import FieldIndex, RecordFilter
+from app.memory.manager import MemoryManager
+from app.memory.models import MemoryCategory
+from app.memory.recall_index import RecallIndex
+from app.memory.search_index import B, K1, SearchIndex, content_terms
+from app.memory.store import MemoryStore
+
+PROJECTS = MemoryCategory.PROJECTS
+
+
+def _index_dir(repo):
+    return repo / ".kimiko" / "memory" / "index"
+
+
+def test_writes_by_another_instance_are_replayed(repo):
+    manager = MemoryManager(repo)
+    reader = SearchIndex(_index_dir(repo))
+    fields = FieldIndex(_index_dir(repo))
+    assert reader.search("kestrel") == []
+
+    record = manager.write_project({"bird": "kestrel"})
+    assert [h[2] for h in reader.search("kestrel")] == [record.id]
+    assert fields.lookup(PROJECTS, [RecordFilter("source", equals="kimiko")]) == [record.id]
+
+
+def test_snapshot_by_another_instance_is_reloaded(repo):
+    manager = MemoryManager(repo)
+    first = manager.write_project({"bird": "kestrel"})
+    reader = SearchIndex(_index_dir(repo))
+    assert reader.count(PROJECTS) == 1
+
+    manager.search_index.save_snapshot()
+    second = manager.write_project({"bird": "kestrel"})
+    assert sorted(h[2] for h in reader.search("kestrel")) == sorted([first.id, second.id])
+    assert manager.search_index.snapshot_path.exists()
+
+
+def test_partial_delta_line_is_left_for_later(repo):
+    index = SearchIndex(_index_dir(repo))
+    with index.delta_path.open("a", encoding="utf-8") as f:
+        f.write('{"k":"projects/a","c":"projects","t":{"owl":1}}\n{"k":"projects/b"')
+    assert index.count(PROJECTS) == 1
+    with index.delta_path.open("a", encoding="utf-8") as f:
+        f.write(',"c":"projects","t":{"owl":1}}\n')
+    assert index.count(PROJECTS) == 2
+
+
+def test_search_rebuilds_under_the_store_lock(repo, monkeypatch):
+    manager = MemoryManager(repo)
+    # Written without indexes attached, so the manager's index is behind.
+    record = MemoryStore(repo).create(PROJECTS, {"bird": "heron"}, source="test")
+
+    held = []
+    rebuild = manager.search_index.rebuild
+
+    def checked(records, generation):
+        held.append(manager.store.lock._depth > 0)
+        rebuild(records, generation)
+
+    monkeypatch.setattr(manager.search_index, "rebuild", checked)
+    assert [r.id for _, r in manager.search("heron")] == [record.id]
+    assert held == [True]
+    lines = manager.search_index.delta_path.read_text().splitlines()
+    assert [list(json.loads(line)) for line in lines] == [["gen"]]
+
+
+@pytest.mark.parametrize("backend", sorted(MEMORY_BACKENDS))
+def test_search_reindexes_an_update_made_without_the_manager(repo, backend):
+    manager = MemoryManager(repo, backend)
+    record = manager.write_project({"bird": "kestrel"})
+    other = manager.write_project({"bird": "owl"})
+    assert [r.id for _, r in manager.search("kestrel")] == [record.id]
+
+    # Same count as before: only the store generation shows the change.
+    open_memory_store(repo, backend).update(PROJECTS, record.id, {"bird": "heron"})
+    assert manager.search("kestrel") == []
+    assert [r.id for _, r in manager.search("heron")] == [record.id]
+    assert [r.id for _, r in manager.search("owl")] == [other.id]
+
+
+def test_writes_by_another_manager_need_no_rebuild(repo, monkeypatch):
+    manager = MemoryManager(repo)
+    manager.write_project({"bird": "kestrel"})
+    manager.search("kestrel")
+
+    record = MemoryManager(repo).write_project({"bird": "heron"})
+
+    def fail(*args):
+        raise AssertionError("rebuilt an index that was in sync")
+
+    monkeypatch.setattr(manager.search_index, "rebuild", fail)
+    assert [r.id for _, r in manager.search("heron")] == [record.id]
+
+
+def _bm25(index, query, limit):
+    # Every posting of every term, the way search() used to score.
+    n_docs = len(index._docs)
+    avg_len = index._total_len / n_docs
+    scores = {}
+    for term in set(content_terms(query)):
+        postings = index._postings.get(term, {})
+        idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+        for key, tf in postings.items():
+            doc_len = index._docs[key][1]
+            norm = tf * (K1 + 1) / (tf + K1 * (1 - B + B * doc_len / avg_len))
+            scores[key] = scores.get(key, 0.0) + idf * norm
+    hits = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0].split("/", 1)[1]))
+    return [(round(s, 9), k.split("/", 1)[1]) for k, s in hits[:limit]]
+
+
+class _CountedPostings(dict):
+    walked = 0
+
+    def items(self):
+        _CountedPostings.walked += 1
+        return super().items()
+
+
+def test_search_skips_walking_common_terms_once_the_top_is_settled(repo):
+    index = SearchIndex(_index_dir(repo))
+    store = MemoryStore(repo)
+    store.indexes.append(index)
+    words = ["kestrel", "heron", "owl", "wren"]
+    for i in range(200):
+        store.create(
+            PROJECTS, {"text": f"the bird {words[i % 4]} the {i % 7} " + "the " * (i % 3)},
+            source="test",
+        )
+    rare = store.create(PROJECTS, {"text": "rare kestrel the"}, source="test")
+
+    for query in ["rare the", "rare kestrel the", "kestrel heron", "the bird 3", "wren"]:
+        for limit in (1, 3, 10):
+            expected = _bm25(index, query, limit)
+            assert [(round(s, 9), i) for s, _, i in index.search(query, limit=limit)] == expected
+
+    index._postings["the"] = _CountedPostings(index._postings["the"])
+    hits = index.search("rare the", limit=1)
+    assert hits[0][2] == rare.id
+    assert _CountedPostings.walked == 0
+
+
+def test_query_rebuilds_field_index(repo):
+    manager = MemoryManager(repo)
+    record = MemoryStore(repo).create(PROJECTS, {"n": 1}, source="elsewhere")
+    hits = manager.query_memory(PROJECTS, [RecordFilter("source", equals="elsewhere")])
+    assert [r.id for r in hits] == [record.id]
+
+
+
+@pytest.mark.parametrize(
+    "backend", sorted(b for b, cls in MEMORY_BACKENDS.items() if not cls.native_field_queries)
+)
+def test_query_reindexes_an_update_made_without_the_index(repo, backend):
+    manager = MemoryManager(repo, backend)
+    first = manager.store.create(PROJECTS, {"n": 1}, source="test")
+    second = manager.store.create(PROJECTS, {"n": 2}, source="test")
+    recent = [RecordFilter("updated_at", since=second.updated_at)]
+    assert [r.id for r in manager.query_memory(PROJECTS, recent)] == [second.id]
+
+    # Same count as before: only the store generation shows the change.
+    open_memory_store(repo, backend).update(PROJECTS, first.id, {"n": 3})
+    assert [r.id for r in manager.query_memory(PROJECTS, recent)] == [first.id, second.id]
+
+
+@pytest.mark.skipif(not RecallIndex.available(), reason="needs numpy")
+def test_recall_rebuild_in_a_fresh_instance_keeps_the_rebuilt_index(repo):
+    manager = MemoryManager(repo)
+    old = manager.write_project({"bird": "kestrel"})
+    manager.recall_index.compact()
+    new = MemoryStore(repo).create(PROJECTS, {"bird": "kestrel hover"}, source="test")
+
+    fresh = RecallIndex(repo / ".kimiko" / "memory" / "recall")
+    fresh.rebuild(MemoryStore(repo).iter(PROJECTS))
+    assert fresh.count(PROJECTS) == 2
+    assert {h[2] for h in fresh.search("kestrel")} == {old.id, new.id}
+
+
+@pytest.mark.skipif(not RecallIndex.available(), reason="needs numpy")
+def test_recall_reindexes_an_update_made_without_the_manager(repo, monkeypatch):
+    manager = MemoryManager(repo)
+    record = manager.write_project({"bird": "kestrel hover"})
+    manager.write_project({"bird": "owl"})
+    assert manager.recall("kestrel hover", k=1)[0][1].id == record.id
+
+    MemoryStore(repo).update(PROJECTS, record.id, {"bird": "heron wade"})
+    assert manager.recall("heron wade", k=1)[0][1].id == record.id
+
+    # Compaction keeps the generation the index was at.
+    manager.recall_index.compact()
+
+    def fail(*args):
+        raise AssertionError("rebuilt an index that was in sync")
+
+    monkeypatch.setattr(manager.recall_index, "rebuild", fail)
+    assert manager.recall("heron wade", k=1)[0][1].id == record.id
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from app.memory.manager import MemoryManager
+from app.memory.models import MemoryCategory
+from app.memory.proposals import MemoryProposalStatus, ProposalSelector
+from app.storage.atomic import file_version
+
+
+def _propose(manager, n=1):
+    return [
+        manager.propose(MemoryCategory.FACTS, {"fact": i}, reason="test")
+        for i in range(n)
+    ]
+
+
+def test_approved_records_use_store_timestamps(repo):
+    manager = MemoryManager(repo)
+    before = manager.write_project({"p": 1})
+    (p,) = _propose(manager)
+    manager.approve(p.id, approved_by="tester")
+
+    (record,) = manager.list_memory(MemoryCategory.FACTS)
+    assert datetime.fromisoformat(record.created_at).tzinfo is not None
+    assert record.created_at == record.updated_at
+    # Same format as directly written records, so text order is time order.
+    assert len(record.created_at) == len(before.created_at)
+    assert record.created_at >= before.created_at
+    assert record.approval.approved_at.endswith("Z")
+
+
+def test_interrupted_approval_is_finished_by_the_next_manager(repo, monkeypatch):
+    manager = MemoryManager(repo)
+    proposals = _propose(manager, 3)
+    journaled = {}
+    real = manager._apply_approvals
+
+    def crash(data, props):
+        # Die after the first proposal's record and status are written.
+        journaled.update(data)
+        real(data, props[:1])
+        raise RuntimeError("crash")
+
+    monkeypatch.setattr(manager, "_apply_approvals", crash)
+    with pytest.raises(RuntimeError):
+        manager.approve_many(ProposalSelector(), approved_by="tester")
+    monkeypatch.setattr(manager, "_apply_approvals", real)
+
+    recovered = MemoryManager(repo)
+    records = {r.id: r for r in recovered.list_memory(MemoryCategory.FACTS)}
+    assert set(records) == set(journaled["items"].values())
+    for r in records.values():
+        assert r.created_at == journaled["written_at"]
+    for p in proposals:
+        assert recovered.proposals.load(p.id).status == MemoryProposalStatus.APPLIED
+    # Nothing left open: a third manager replays nothing.
+    assert MemoryManager(repo).journal.recover() == 0
+
+
+def test_recovery_with_nothing_to_replay_writes_nothing(repo):
+    manager = MemoryManager(repo)
+    (p,) = _propose(manager)
+    manager.approve(p.id, approved_by="tester")
+    checkpoint = manager.journal.checkpoint_path
+    MemoryManager(repo)  # settles the checkpoint past the approval
+    version = file_version(checkpoint)
+
+    assert MemoryManager(repo).journal.recover() == 0
+    assert file_version(checkpoint) == version
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.storage import locking
+from app.storage.locking import DirLock, dir_lock
+
+ROOT = Path(__file__).resolve().parents[1]
+
+pytestmark = pytest.mark.skipif(locking.fcntl is None, reason="needs flock")
+
+# argv: directory, rounds. Each round is a read-modify-write of a counter
+# with a pause in the middle, logging its start and end to a shared file.
+INCREMENTER = textwrap.dedent(
+    """
+    import os, sys, time
+    from pathlib import Path
+    from app.storage.locking import dir_lock
+
+    directory, rounds = Path(sys.argv[1]), int(sys.argv[2])
+    counter, log = directory / "counter", directory / "log"
+    for _ in range(rounds):
+        with dir_lock(directory):
+            with log.open("a") as f:
+                f.write(f"start {os.getpid()}\\n")
+            n = int(counter.read_text())
+            time.sleep(0.002)
+            counter.write_text(str(n + 1))
+            with log.open("a") as f:
+                f.write(f"end {os.getpid()}\\n")
+    """
+)
+
+# Exits 0 if it can take the lock without waiting, 1 if it is held.
+TRY_LOCK = textwrap.dedent(
+    """
+    import fcntl, os, sys
+    fd = os.open(sys.argv[1], os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        sys.exit(1)
+    sys.exit(0)
+    """
+)
+
+
+def _python(script: str, *args) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-c", script, *map(str, args)],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+    )
+
+
+def _held_elsewhere(lock: DirLock) -> bool:
+    return _python(TRY_LOCK, lock.path).wait() == 1
+
+
+def test_two_processes_serialize_their_writes(tmp_path):
+    (tmp_path / "counter").write_text("0")
+    writers = [_python(INCREMENTER, tmp_path, 40) for _ in range(2)]
+    assert [w.wait() for w in writers] == [0, 0]
+
+    assert (tmp_path / "counter").read_text() == "80"
+    # No hold overlaps another: every start is followed by its own end.
+    lines = (tmp_path / "log").read_text().splitlines()
+    holds = list(zip(lines[0::2], lines[1::2]))
+    assert len(holds) == 80
+    assert all(
+        start.split() == ["start", end.split()[1]] and end.startswith("end ")
+        for start, end in holds
+    )
+
+
+def test_reentry_keeps_the_flock_until_the_outermost_exit(tmp_path):
+    lock = DirLock(tmp_path)
+
+    with lock:
+        fd = lock._fd
+        with lock:
+            assert lock._depth == 2
+            assert lock._fd == fd  # no second descriptor to deadlock on
+        assert _held_elsewhere(lock)
+    assert lock._fd is None
+    assert not _held_elsewhere(lock)
+
+
+def test_threads_wait_for_the_holder(tmp_path):
+    lock = dir_lock(tmp_path)
+    assert dir_lock(tmp_path / ".") is lock
+    order = []
+
+    def worker():
+        with lock:
+            order.append("worker")
+
+    with lock:
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join(0.05)
+        assert thread.is_alive()
+        order.append("holder")
+    thread.join()
+    assert order == ["holder", "worker"]
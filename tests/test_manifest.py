@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+
+from app.memory.models import MemoryCategory
+from app.memory.reshard import reshard_memory
+from app.memory.store import MAX_STAMPED_DIRS, MemoryStore
+
+from conftest import history_records
+
+HISTORY = MemoryCategory.HISTORY
+PROJECTS = MemoryCategory.PROJECTS
+
+
+def _settle() -> None:
+    # Directory mtimes move in clock ticks; keep the hand edit in a
+    # later tick than the store's own write.
+    time.sleep(0.05)
+
+
+def test_file_dropped_into_a_shard_is_counted(repo):
+    store = MemoryStore(repo)
+    reshard_memory(repo)
+    record = store.create(PROJECTS, {"n": 0}, source="test")
+    assert store.count(PROJECTS) == 1
+    path = store._find(PROJECTS, record.id)
+    assert path.parent.parent.parent.name == PROJECTS.value  # in <cat>/ab/cd/
+
+    _settle()
+    data = record.to_dict()
+    data["id"] = "restored-by-hand"
+    (path.parent / "restored-by-hand.json").write_text(json.dumps(data), encoding="utf-8")
+
+    assert store.count(PROJECTS) == 2
+    assert len(store.list(PROJECTS)) == 2
+
+
+def test_file_dropped_into_an_hour_partition_is_counted(repo):
+    store = MemoryStore(repo)
+    records = history_records("2020-01-01T05", 2)
+    store.import_many(records)
+    assert store.count(HISTORY) == 2
+
+    _settle()
+    extra = history_records("2020-01-01T05", 1, start=2)[0]
+    path = store._find(HISTORY, records[0].id).parent / f"{extra.id}.json"
+    path.write_text(json.dumps(extra.to_dict()), encoding="utf-8")
+
+    assert store.count(HISTORY) == 3
+
+
+def test_seal_keeps_manifest_current(repo):
+    store = MemoryStore(repo)
+    store.import_many(history_records("2020-01-01T05", 3))
+    store.seal_history("2020-01-02")
+
+    manifest = json.loads(store.manifest_path.read_text(encoding="utf-8"))
+    assert store._stamps_current(manifest)
+    assert store.count(HISTORY) == 3
+    assert store.generation() == (manifest["seq"], manifest["rebuilt"])
+
+
+def _count_stats(monkeypatch):
+    calls = []
+    real_stat, real_scandir = os.stat, os.scandir
+
+    def stat(*args, **kwargs):
+        calls.append("stat")
+        return real_stat(*args, **kwargs)
+
+    def scandir(*args, **kwargs):
+        calls.append("scandir")
+        return real_scandir(*args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", stat)
+    monkeypatch.setattr(os, "scandir", scandir)
+    return calls
+
+
+def test_count_and_create_stay_bounded_on_a_sharded_tree(repo, monkeypatch):
+    store = MemoryStore(repo)
+    reshard_memory(repo)
+    store.create_many(PROJECTS, [{"n": i} for i in range(2000)], source="test")
+    assert store.count(PROJECTS) == 2000
+
+    calls = _count_stats(monkeypatch)
+    for _ in range(5):
+        assert store.count(PROJECTS) == 2000
+    counted = len(calls)
+    calls.clear()
+    store.create(PROJECTS, {"n": 2000}, source="test")
+    created = len(calls)
+    calls.clear()
+    store.generation()
+    monkeypatch.undo()
+
+    # A walk of the ~2000 shard directories would cost thousands.
+    limit = (MAX_STAMPED_DIRS + 1) * len(MemoryCategory)
+    assert counted <= 5 * limit
+    assert created <= limit + 50
+    assert len(calls) <= limit
+    assert store.count(PROJECTS) == 2001
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import pytest
+
+from app.memory.backends import MEMORY_BACKENDS, open_memory_store
+from app.memory.models import MemoryCategory, MemoryRecord
+from app.memory.order_index import make_cursor
+
+PROJECTS = MemoryCategory.PROJECTS
+
+
+def _records(n):
+    # Pairs share a created_at, so pages must break ties by id.
+    return [
+        MemoryRecord(
+            id=f"r{i:03d}",
+            category=PROJECTS,
+            content={"i": i},
+            source="test",
+            created_at=f"2026-10-17T09:00:{i // 2:02d}.000000+00:00",
+            updated_at=f"2026-10-17T09:00:{i // 2:02d}.000000+00:00",
+            approval=None,
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("backend", sorted(MEMORY_BACKENDS))
+def test_pages_cover_every_record_once(repo, backend):
+    store = open_memory_store(repo, backend)
+    written, refused = store.import_many(list(reversed(_records(11))))
+    assert len(written) == 11 and not refused
+
+    seen, after = [], None
+    while True:
+        page = list(store.iter(PROJECTS, after=after, limit=3))
+        if not page:
+            break
+        seen.extend(r.id for r in page)
+        after = make_cursor(page[-1].created_at, page[-1].id)
+    assert seen == [f"r{i:03d}" for i in range(11)]
+
+
+@pytest.mark.parametrize("backend", sorted(MEMORY_BACKENDS))
+def test_range_bounds_are_prefixes(repo, backend):
+    store = open_memory_store(repo, backend)
+    store.import_many(_records(11))
+    got = store.iter_range(PROJECTS, since="2026-10-17T09:00:02", until="2026-10-17T09:00:04")
+    assert [r.id for r in got] == ["r004", "r005", "r006", "r007"]
+
+
+def test_order_index_rebuild_does_not_fill_the_list_cache(repo):
+    store = open_memory_store(repo, "file")
+    store.import_many(_records(5))
+    store._order_index(PROJECTS).path.unlink()
+    store._list_cache.clear()
+
+    assert [r.id for r in store.iter(PROJECTS)] == [f"r{i:03d}" for i in range(5)]
+    assert PROJECTS not in store._list_cache
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+
+from app.core.update_manager import UpdateManager
+from app.storage.ids import new_id
+from app.update.models import ProposalStatus, UpdateProposal
+
+
+def _update(um, summary):
+    p = UpdateProposal(
+        id=new_id("update"), type="self-update", scope=[], summary=summary, reason="test"
+    )
+    um.propose(p)
+    return p
+
+
+def test_headers_follow_hand_edits_and_archive(repo):
+    um = UpdateManager(repo)
+    edited = _update(um, "before")
+    archived = _update(um, "archived")
+    removed = _update(um, "removed")
+    um.reject(archived.id)
+    um.archive()
+
+    path = um.store._path(edited.id)
+    data = json.loads(path.read_text())
+    data["summary"] = "after"
+    path.write_text(json.dumps(data))
+    um.store._path(removed.id).unlink()
+
+    headers = {h.id: h for h in UpdateManager(repo).list_headers()}
+    assert set(headers) == {edited.id, archived.id}
+    assert headers[edited.id].summary == "after"
+    assert headers[archived.id].status == ProposalStatus.REJECTED
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+
+from app.core.update_manager import UpdateManager
+from app.memory.manager import MemoryManager
+from app.memory.models import MemoryCategory
+from app.memory.proposals import MemoryProposalStatus
+from app.storage.ids import id_floor, id_sort_key, id_time, new_id
+from app.update.models import UpdateProposal
+
+
+def _propose(um, pid):
+    um.propose(UpdateProposal(id=pid, type="self-update", scope=[], summary=pid, reason="test"))
+
+
+def _mixed(um):
+    now = int(time.time())
+    ids = [
+        f"update-{now - 3600}",
+        new_id("update"),
+        new_id("update"),
+        f"update-{now + 3600}",
+    ]
+    for pid in reversed(ids):
+        _propose(um, pid)
+    return ids
+
+
+def test_legacy_ids_sort_by_their_time():
+    legacy = "update-1766499719"
+    assert id_time(legacy) == datetime.fromtimestamp(1766499719, timezone.utc)
+    before = id_floor("update", datetime.fromtimestamp(1766499719, timezone.utc))
+    assert id_sort_key(before) < id_sort_key(legacy) < id_sort_key(new_id("update"))
+
+
+def test_paging_over_mixed_ids(repo):
+    um = UpdateManager(repo)
+    ids = _mixed(um)
+    um.reject(ids[0])
+    um.archive()  # one legacy id only in the archive
+
+    assert um.store.list_ids() == ids
+    paged, after = [], None
+    while True:
+        page = um.list(after=after, limit=1)
+        if not page:
+            break
+        paged.append(page[0].id)
+        after = page[0].id
+    assert paged == ids
+
+    headers = [h.id for h in um.list_headers(after=ids[1])]
+    assert headers == ids[2:]
+
+
+def test_id_floor_bounds_mixed_ids(repo):
+    um = UpdateManager(repo)
+    ids = _mixed(um)
+    floor = id_floor("update", datetime.fromtimestamp(time.time() - 60, timezone.utc))
+    assert um.store.list_ids(after=floor) == ids[1:]
+
+
+def test_memory_proposals_page_in_creation_order(repo):
+    manager = MemoryManager(repo)
+    proposals = [
+        manager.propose(MemoryCategory.FACTS, {"fact": i}, reason="test") for i in range(5)
+    ]
+    ids = [p.id for p in proposals]
+    manager.reject(ids[1])
+    manager.archive_proposals()  # one id only in the archive
+
+    assert manager.proposals.list_ids() == ids
+    assert manager.proposals.list_ids(after=ids[0], limit=2) == ids[1:3]
+
+    pending = MemoryProposalStatus.PROPOSED
+    first = manager.list_proposals(pending, limit=2)
+    assert [p.id for p in first] == [ids[0], ids[2]]
+    rest = manager.list_proposals(pending, after=first[-1].id)
+    assert [p.id for p in rest] == ids[3:]
+    assert [p.id for p in manager.list_proposals(after=ids[2])] == ids[3:]
+    rejected = manager.list_proposals(MemoryProposalStatus.REJECTED, limit=1)
+    assert [p.id for p in rejected] == [ids[1]]
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from app.memory.models import MemoryCategory
+from app.memory.store import MemoryStore
+
+from conftest import history_records
+
+PROJECTS = MemoryCategory.PROJECTS
+
+
+def test_get_hits_evicts_and_revalidates(repo):
+    store = MemoryStore(repo, cache_size=2)
+    a, b, c = (store.create(PROJECTS, {"n": i}, source="test") for i in range(3))
+
+    store.get(PROJECTS, a.id)
+    store.get(PROJECTS, a.id)
+    assert store.cache_stats()["hits"] == 1
+
+    store.get(PROJECTS, b.id)
+    store.get(PROJECTS, c.id)  # evicts a, the least recently used
+    assert store.cache_stats()["size"] == 2
+    misses = store.cache_stats()["misses"]
+    store.get(PROJECTS, a.id)
+    assert store.cache_stats()["misses"] == misses + 1
+
+    # A write through another store instance invalidates the entry.
+    MemoryStore(repo).update(PROJECTS, a.id, {"n": 10})
+    assert store.get(PROJECTS, a.id).content == {"n": 10}
+
+
+def test_cached_records_are_not_shared_with_callers(repo):
+    store = MemoryStore(repo)
+    record = store.create(PROJECTS, {"n": 0}, source="test")
+
+    store.get(PROJECTS, record.id).source = "changed"
+    listed = store.list(PROJECTS)
+    listed[0].source = "changed"
+    assert store.list(PROJECTS)[0].source == "test"
+    assert store.get(PROJECTS, record.id).source == "test"
+    assert store.cache_stats()["list_hits"] == 1
+
+
+def test_list_cache_is_bounded_and_skips_history(repo):
+    store = MemoryStore(repo, cache_size=2)
+    for i in range(3):
+        store.create(PROJECTS, {"n": i}, source="test")
+    store.import_many(history_records("2020-01-01T05", 2))
+
+    assert len(store.list(PROJECTS)) == 3
+    assert len(store.list(MemoryCategory.HISTORY)) == 2
+    assert store._list_cache == {}
+
+    store.list(MemoryCategory.PREFERENCES)
+    assert MemoryCategory.PREFERENCES in store._list_cache
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+
+from app.memory.models import MemoryCategory
+from app.memory.reshard import reshard_memory
+from app.memory.store import MemoryStore
+
+PROJECTS = MemoryCategory.PROJECTS
+
+
+def test_lookup_of_missing_id_creates_no_shard(repo):
+    store = MemoryStore(repo)
+    store.create(PROJECTS, {"n": 0}, source="test")
+    reshard_memory(repo)
+    cat_dir = repo / ".kimiko" / "memory" / PROJECTS.value
+    before = sorted(p for p in cat_dir.rglob("*") if p.is_dir())
+
+    with pytest.raises(FileNotFoundError):
+        store.get(PROJECTS, "no-such-id")
+    assert sorted(p for p in cat_dir.rglob("*") if p.is_dir()) == before
+
+
+def test_records_stay_readable_across_a_reshard(repo):
+    store = MemoryStore(repo)
+    before = [store.create(PROJECTS, {"n": i}, source="test") for i in range(5)]
+
+    moved = reshard_memory(repo)
+    assert moved[PROJECTS.value] == 5
+    assert reshard_memory(repo)[PROJECTS.value] == 0  # nothing left to move
+
+    after = store.create(PROJECTS, {"n": 5}, source="test")
+    cat_dir = repo / ".kimiko" / "memory" / PROJECTS.value
+    assert not list(cat_dir.glob("*.json"))  # every file is in a shard
+    assert store.count(PROJECTS) == 6
+    assert {r.id for r in store.list(PROJECTS)} == {r.id for r in before + [after]}
+    for r in before:
+        assert store.get(PROJECTS, r.id).content == r.content
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from app.memory.models import MemoryCategory
+from app.memory.segment_store import SegmentMemoryStore, encode_frame
+
+PROJECTS = MemoryCategory.PROJECTS
+
+
+def test_get_sees_an_update_made_by_another_process(repo):
+    reader = SegmentMemoryStore(repo)
+    writer = SegmentMemoryStore(repo)
+    record = writer.create(PROJECTS, {"n": 0}, source="test")
+    assert reader.get(PROJECTS, record.id).content == {"n": 0}
+
+    writer.update(PROJECTS, record.id, {"n": 1})
+    assert reader.get(PROJECTS, record.id).content == {"n": 1}
+
+
+def test_torn_tail_is_cut_off_on_open(repo):
+    store = SegmentMemoryStore(repo)
+    kept = [store.create(PROJECTS, {"n": i}, source="test") for i in range(3)]
+    segment = store._segment_path(PROJECTS, store._active[PROJECTS])
+    size = segment.stat().st_size
+    with segment.open("ab") as f:
+        f.write(encode_frame(b'{"id": "torn"}')[:-6])  # a crash mid-append
+
+    reopened = SegmentMemoryStore(repo)
+    assert reopened.discarded_bytes > 0
+    assert segment.stat().st_size == size
+    assert [reopened.get(PROJECTS, r.id).content for r in kept] == [
+        {"n": 0}, {"n": 1}, {"n": 2}
+    ]
+
+    # The next append starts on a frame boundary and survives another open.
+    added = reopened.create(PROJECTS, {"n": 3}, source="test")
+    again = SegmentMemoryStore(repo)
+    assert again.discarded_bytes == 0
+    assert again.get(PROJECTS, added.id).content == {"n": 3}
+    assert again.count(PROJECTS) == 4
+
+
+def test_compaction_keeps_live_records(repo):
+    store = SegmentMemoryStore(repo)
+    other = SegmentMemoryStore(repo)
+    records = [store.create(PROJECTS, {"n": i}, source="test") for i in range(3)]
+    for round_ in range(1, 20):
+        for record in records:
+            store.update(PROJECTS, record.id, {"n": round_})
+    before = store._segment_path(PROJECTS, store._active[PROJECTS]).stat().st_size
+    assert other.get(PROJECTS, records[0].id).content == {"n": 19}
+
+    store.compact(PROJECTS)
+
+    segments = store._segments(PROJECTS)
+    assert len(segments) == 1
+    assert store._segment_path(PROJECTS, segments[0]).stat().st_size < before / 10
+    assert store._dead_bytes[PROJECTS] == 0
+    # The other instance's offsets point into the removed segment.
+    assert [other.get(PROJECTS, r.id).content for r in records] == [{"n": 19}] * 3
+    assert SegmentMemoryStore(repo).count(PROJECTS) == 3
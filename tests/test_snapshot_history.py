@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pytest
+
+from app.cli_main import RuntimeState, _cmd_snapshot_history
+from app.core.snapshot_history import FIELDS, SnapshotHistory
+from app.core.update_manager import UpdateManager
+from app.memory.manager import MemoryManager
+
+
+@pytest.fixture
+def state(repo):
+    history = SnapshotHistory(repo / ".kimiko", capacity=4)
+    for i in range(6):
+        history.ring.append([1_700_000_000 + i, float(i)] + [None] * (len(FIELDS) - 2))
+    return RuntimeState(
+        repo_root=repo,
+        update_manager=UpdateManager(repo),
+        memory_manager=MemoryManager(repo),
+        history=history,
+    )
+
+
+def test_ring_keeps_the_newest_points(state):
+    assert [p["collection_ms"] for p in state.history.points()] == [2.0, 3.0, 4.0, 5.0]
+    assert [p["collection_ms"] for p in state.history.points(last=2)] == [4.0, 5.0]
+    assert state.history.points()[0]["memory.pending_proposals"] is None
+
+
+@pytest.mark.parametrize("arg", ["foo", "0", "-3", "2.5"])
+def test_bad_count_prints_usage(state, capsys, arg):
+    _cmd_snapshot_history(state, ["snapshot", "--history", arg], False)
+    assert capsys.readouterr().out.startswith("Usage: snapshot --history")
+
+
+def test_count_limits_points(state, capsys):
+    _cmd_snapshot_history(state, ["snapshot", "--history", "2"], False)
+    out = capsys.readouterr().out
+    assert out.startswith("Snapshot History")
+    assert len(out.strip().splitlines()) == 4 + 2
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from app.memory.models import ApprovalInfo, MemoryCategory
+from app.memory.reshard import reshard_memory
+from app.memory.sqlite_store import SqliteMemoryStore
+from app.memory.store import MemoryStore
+
+from conftest import history_records
+
+HISTORY = MemoryCategory.HISTORY
+
+
+def test_import_of_resharded_and_sealed_tree(repo):
+    files = MemoryStore(repo)
+    files.create(MemoryCategory.PROJECTS, {"n": "flat"}, source="test")
+    reshard_memory(repo)
+    for n in range(3):
+        files.create(MemoryCategory.PROJECTS, {"n": n}, source="test")
+    files.create(
+        MemoryCategory.FACTS,
+        {"fact": "x"},
+        source="test",
+        approval=ApprovalInfo(required=True, approved_by="me", approved_at="2020-01-01T00:00:00Z"),
+    )
+    files.import_many(history_records("2020-01-01T05", 4))
+    files.import_many(history_records("2020-01-01T06", 2))
+    files.seal_history("2020-01-01T06")  # seals 05 only
+    files.import_many(history_records("2020-01-02T07", 3))
+
+    expected = {c: sorted(r.id for r in files.list(c)) for c in MemoryCategory}
+    assert len(expected[HISTORY]) == 9
+
+    db = SqliteMemoryStore(repo)
+    try:
+        assert db.import_json_tree() == sum(len(ids) for ids in expected.values())
+        for category, ids in expected.items():
+            assert sorted(r.id for r in db.list(category)) == ids
+        assert db.import_json_tree() == 0
+    finally:
+        db.close()
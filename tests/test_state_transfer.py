@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core import state_transfer
+from app.core.state_transfer import export_state, import_state
+from app.core.update_manager import UpdateManager
+from app.memory.manager import MemoryManager
+from app.memory.models import MemoryCategory
+from app.storage.ids import new_id
+from app.update.models import UpdateProposal
+
+PROJECTS = MemoryCategory.PROJECTS
+
+
+def _update(um, summary="change"):
+    p = UpdateProposal(
+        id=new_id("update"), type="self-update", scope=["app"], summary=summary, reason="test"
+    )
+    um.propose(p)
+    return p
+
+
+def test_iter_streams_loose_proposals_before_the_archive(repo, monkeypatch):
+    um = UpdateManager(repo)
+    archived = [_update(um) for _ in range(2)]
+    for p in archived:
+        um.reject(p.id)
+    um.archive()
+    loose = _update(um)
+
+    def unread():
+        raise AssertionError("archive read before loose proposals were yielded")
+        yield
+
+    it = um.store.iter()
+    monkeypatch.setattr(um.store.archive_store, "items", unread)
+    assert next(it).id == loose.id
+    monkeypatch.undo()
+    assert sorted(p.id for p in it) == sorted(p.id for p in archived)
+
+
+def test_loose_copy_shadows_archived_one(repo):
+    um = UpdateManager(repo)
+    p = _update(um, summary="old")
+    um.reject(p.id)
+    um.archive()
+    p = um.load(p.id)
+    p.summary = "new"
+    um.store.save(p)
+
+    assert [(q.id, q.summary) for q in um.store.iter()] == [(p.id, "new")]
+
+
+def test_interrupted_import_resumes(repo, tmp_path, monkeypatch):
+    src_mm, src_um = MemoryManager(repo / "src"), UpdateManager(repo / "src")
+    src_mm.create_many(PROJECTS, [{"n": i} for i in range(5)])
+    _update(src_um)
+    export = tmp_path / "state.jsonl.gz"
+    counts = export_state(src_mm, src_um, export)
+    assert counts == {"memory/projects": 5, "update_proposal": 1}
+
+    dst = repo / "dst"
+    mm, um = MemoryManager(dst), UpdateManager(dst)
+    monkeypatch.setattr(state_transfer, "IMPORT_BATCH", 2)
+    real = mm.import_records
+    calls = []
+
+    def fail_second(records):
+        calls.append(len(records))
+        if len(calls) == 2:
+            raise RuntimeError("interrupted")
+        return real(records)
+
+    monkeypatch.setattr(mm, "import_records", fail_second)
+    with pytest.raises(RuntimeError):
+        import_state(mm, um, export)
+    monkeypatch.setattr(mm, "import_records", real)
+
+    result = import_state(mm, um, export)
+    assert result.resumed_from == 2
+    assert result.imported == {"memory/projects": 4, "update_proposal": 1}
+    assert mm.count_memory(PROJECTS) == 5
+    # Finished: a re-run starts over and finds everything present.
+    again = import_state(mm, um, export)
+    assert again.resumed_from == 0 and again.imported == {} and again.skipped == 6
+
+
+def test_import_rewrites_proposal_indexes_once_per_batch(repo, tmp_path, monkeypatch):
+    src_mm, src_um = MemoryManager(repo / "src"), UpdateManager(repo / "src")
+    for i in range(10):
+        _update(src_um, summary=f"u{i}")
+        src_mm.propose(MemoryCategory.FACTS, {"fact": i}, reason="test")
+    export = tmp_path / "state.jsonl.gz"
+    export_state(src_mm, src_um, export)
+
+    mm, um = MemoryManager(repo / "dst"), UpdateManager(repo / "dst")
+    writes = []
+    for store, name in ((um.store, "_write_headers"), (mm.proposals, "_write_statuses")):
+        real = getattr(store, name)
+        monkeypatch.setattr(
+            store, name, lambda *a, real=real, name=name: (writes.append(name), real(*a))
+        )
+
+    result = import_state(mm, um, export)
+    assert result.imported == {"update_proposal": 10, "memory_proposal": 10}
+    assert writes.count("_write_headers") == 1
+    assert writes.count("_write_statuses") <= 2
+    assert len(um.list_headers()) == 10
+    assert len(mm.proposals.open_statuses()) == 10
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+
+from app.memory.manager import MemoryManager
+from app.memory.models import MemoryCategory
+from app.memory.proposal_store import MemoryProposalStore
+from app.memory.proposals import MemoryProposalStatus
+
+PROPOSED = MemoryProposalStatus.PROPOSED
+
+
+def _memory_proposals(repo, n):
+    manager = MemoryManager(repo)
+    return manager, [
+        manager.propose(MemoryCategory.FACTS, {"fact": i}, reason="test") for i in range(n)
+    ]
+
+
+def test_status_index_tracks_open_proposals(repo):
+    manager, (kept, approved, rejected) = _memory_proposals(repo, 3)
+    manager.approve(approved.id, approved_by="tester")
+    manager.reject(rejected.id)
+
+    other = MemoryProposalStore(repo)
+    assert other.open_statuses() == {kept.id: PROPOSED.value}
+    assert [p.id for p in other.list_by_status(PROPOSED)] == [kept.id]
+
+
+def test_status_index_is_rebuilt_when_missing(repo):
+    manager, proposals = _memory_proposals(repo, 2)
+    manager.proposals.status_path.unlink()
+    store = MemoryProposalStore(repo)
+    assert sorted(store.open_statuses()) == sorted(p.id for p in proposals)
+
+
+def test_stale_status_entry_is_filtered(repo):
+    manager, (p,) = _memory_proposals(repo, 1)
+    # A crash between the file write and the index update.
+    path = manager.proposals._find(p.id)
+    data = json.loads(path.read_text())
+    data["status"] = MemoryProposalStatus.APPLIED.value
+    path.write_text(json.dumps(data))
+    assert manager.proposals.list_by_status(PROPOSED) == []
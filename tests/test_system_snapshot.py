@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.core import system_snapshot
+from app.core.system_snapshot import SnapshotEngine, get_system_snapshot
+from app.core.update_manager import UpdateManager
+from app.memory.manager import MemoryManager
+
+DEADLINES = {"memory": 0.05, "governance": 0}
+
+
+@pytest.fixture
+def managers(repo):
+    return UpdateManager(repo), MemoryManager(repo)
+
+
+@pytest.fixture
+def slow_memory(monkeypatch):
+    """Makes the memory collector block until the returned event is set."""
+    release = threading.Event()
+    collect = system_snapshot._memory_section
+
+    def slow(memory_manager):
+        release.wait(5)
+        return collect(memory_manager)
+
+    monkeypatch.setattr(system_snapshot, "_memory_section", slow)
+    yield release
+    release.set()
+
+
+def test_section_past_its_deadline_is_a_placeholder(managers, slow_memory):
+    um, mm = managers
+    started = time.monotonic()
+    snapshot = get_system_snapshot(
+        start_time=started, update_manager=um, memory_manager=mm, deadlines=DEADLINES
+    )
+    assert time.monotonic() - started < 2
+
+    assert snapshot.memory == {
+        "backend": "MemoryStore",
+        "counts": {},
+        "pending_proposals": None,
+        "last_approved_at": None,
+        "collection": {"state": "timeout", "deadline_seconds": 0.05},
+    }
+    # The governance collector had no deadline and finished normally.
+    assert "collection" not in snapshot.governance
+
+
+def test_engine_keeps_the_last_section_while_a_collector_overruns(managers, slow_memory):
+    um, mm = managers
+    engine = SnapshotEngine(
+        start_time=time.monotonic(), update_manager=um, memory_manager=mm, deadlines=DEADLINES
+    )
+    slow_memory.set()
+    first = engine.snapshot().memory
+    assert "collection" not in first
+
+    slow_memory.clear()
+    mm.write_project({"n": 1})
+    stale = engine.snapshot().memory
+    assert stale["collection"] == {"state": "stale", "deadline_seconds": 0.05}
+    assert stale["counts"] == first["counts"]
+
+    slow_memory.set()
+    fresh = engine.snapshot().memory
+    assert "collection" not in fresh
+    assert fresh["counts"]["projects"] == first["counts"]["projects"] + 1
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.update_manager import UpdateManager
+from app.storage.ids import new_id
+from app.update import engine
+from app.update.models import FileChange, ProposalStatus, UpdateProposal
+
+
+def _approved(repo):
+    (repo / "app").mkdir()
+    (repo / "app" / "version.py").write_text('__version__ = "1.0.0"\n')
+    um = UpdateManager(repo)
+    p = UpdateProposal(
+        id=new_id("update"),
+        type="self-update",
+        scope=["app/version.py"],
+        summary="bump",
+        reason="test",
+        changes=[
+            FileChange(
+                file="app/version.py",
+                action="modify",
+                description="bump",
+                new_content='__version__ = "1.0.1"\n',
+            )
+        ],
+    )
+    um.propose(p)
+    um.approve(p.id)
+    return um, p
+
+
+def test_apply_interrupted_before_the_health_check_is_rolled_back(repo, monkeypatch):
+    um, p = _approved(repo)
+
+    def crash():
+        raise KeyboardInterrupt  # the process dies with the file written
+
+    monkeypatch.setattr(engine, "_run_healthcheck", crash)
+    with pytest.raises(KeyboardInterrupt):
+        um.apply(p.id)
+    assert (repo / "app" / "version.py").read_text() == '__version__ = "1.0.1"\n'
+    monkeypatch.undo()
+
+    recovered = UpdateManager(repo)
+    assert (repo / "app" / "version.py").read_text() == '__version__ = "1.0.0"\n'
+    proposal = recovered.load(p.id)
+    assert proposal.status == ProposalStatus.FAILED
+    assert "rolled back" in proposal.notes
+    assert UpdateManager(repo).journal.recover() == 0
+
+
+def test_apply_interrupted_after_the_health_check_is_completed(repo, monkeypatch):
+    um, p = _approved(repo)
+    monkeypatch.setattr(engine, "_run_healthcheck", lambda: (True, "ok"))
+
+    def crash(proposal):
+        raise KeyboardInterrupt  # dies before the APPLIED status is saved
+
+    monkeypatch.setattr(um.store, "save", crash)
+    with pytest.raises(KeyboardInterrupt):
+        um.apply(p.id)
+    monkeypatch.undo()
+
+    recovered = UpdateManager(repo)
+    assert recovered.load(p.id).status == ProposalStatus.APPLIED
+    assert (repo / "app" / "version.py").read_text() == '__version__ = "1.0.1"\n'